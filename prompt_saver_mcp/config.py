@@ -1,7 +1,7 @@
 """Configuration management for the MCP server."""
 
 import os
-from typing import Optional
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 
@@ -9,6 +9,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     """Configuration class for environment variables."""
 
@@ -16,24 +24,174 @@ class Config:
     MONGODB_URI: str = os.getenv("MONGODB_URI", "")
     MONGODB_DATABASE: str = os.getenv("MONGODB_DATABASE", "prompt_saver")
     MONGODB_COLLECTION: str = os.getenv("MONGODB_COLLECTION", "prompts")
+    MONGODB_VERSIONS_COLLECTION: str = os.getenv("MONGODB_VERSIONS_COLLECTION", "prompt_versions")
+    MONGODB_DICTIONARIES_COLLECTION: str = os.getenv(
+        "MONGODB_DICTIONARIES_COLLECTION", "compression_dictionaries"
+    )
+    MONGODB_JOBS_COLLECTION: str = os.getenv("MONGODB_JOBS_COLLECTION", "save_jobs")
+    MONGODB_WATCHER_COLLECTION: str = os.getenv("MONGODB_WATCHER_COLLECTION", "change_watchers")
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    MONGODB_VECTOR_INDEX: str = os.getenv("MONGODB_VECTOR_INDEX", "vector_index")
+    EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "2048"))
+    ENSURE_INDEXES_ON_STARTUP: bool = _env_bool("ENSURE_INDEXES_ON_STARTUP", True)
+    # Serve vector search from an exact in-process index instead of $vectorSearch
+    LOCAL_VECTOR_INDEX_ENABLED: bool = _env_bool("LOCAL_VECTOR_INDEX_ENABLED", False)
+
+    # Apply other instances' writes to the local index: "auto" uses a change stream when the
+    # deployment supports one and polls last_updated otherwise
+    CHANGE_WATCHER_ENABLED: bool = _env_bool("CHANGE_WATCHER_ENABLED", False)
+    CHANGE_WATCHER_MODE: str = os.getenv("CHANGE_WATCHER_MODE", "auto")
+    CHANGE_WATCHER_ID: Optional[str] = os.getenv("CHANGE_WATCHER_ID")
+    CHANGE_POLL_INTERVAL: float = float(os.getenv("CHANGE_POLL_INTERVAL", "5.0"))
+    CHANGE_POLL_OVERLAP: float = float(os.getenv("CHANGE_POLL_OVERLAP", "5.0"))
+    CHANGE_RECONCILE_INTERVAL: float = float(os.getenv("CHANGE_RECONCILE_INTERVAL", "300"))
+    CHANGE_CHECKPOINT_INTERVAL: float = float(os.getenv("CHANGE_CHECKPOINT_INTERVAL", "10"))
+
+    # Storage compression of large text fields
+    COMPRESSION_ENABLED: bool = _env_bool("COMPRESSION_ENABLED", False)
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "2048"))
+    COMPRESSION_LEVEL: int = int(os.getenv("COMPRESSION_LEVEL", "3"))
+
+    # Vector search tuning
+    VECTOR_SEARCH_RECALL: float = float(os.getenv("VECTOR_SEARCH_RECALL", "0.95"))
+    VECTOR_SEARCH_CANDIDATE_MULTIPLIER: int = int(
+        os.getenv("VECTOR_SEARCH_CANDIDATE_MULTIPLIER", "0")
+    )
+    VECTOR_SEARCH_OVERFETCH: int = int(os.getenv("VECTOR_SEARCH_OVERFETCH", "2"))
+    VECTOR_SEARCH_MAX_REFILLS: int = int(os.getenv("VECTOR_SEARCH_MAX_REFILLS", "2"))
+
+    # Transport: stdio (one process per client) or http (one shared server for a team)
+    MCP_TRANSPORT: str = os.getenv("MCP_TRANSPORT", "stdio").strip().lower()
+    MCP_HOST: str = os.getenv("MCP_HOST", "127.0.0.1")
+    MCP_PORT: int = int(os.getenv("MCP_PORT", "8000"))
+    # Threads running blocking database and API calls, shared by all sessions
+    MCP_WORKER_THREADS: int = int(os.getenv("MCP_WORKER_THREADS", "32"))
+
+    # Admission control: interactive calls are admitted before LLM-bound calls
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "16"))
+    ADMISSION_INTERACTIVE_LIMIT: int = int(os.getenv("ADMISSION_INTERACTIVE_LIMIT", "16"))
+    ADMISSION_LLM_LIMIT: int = int(os.getenv("ADMISSION_LLM_LIMIT", "4"))
+    ADMISSION_INTERACTIVE_QUEUE: int = int(os.getenv("ADMISSION_INTERACTIVE_QUEUE", "64"))
+    ADMISSION_LLM_QUEUE: int = int(os.getenv("ADMISSION_LLM_QUEUE", "8"))
+    ADMISSION_INTERACTIVE_MAX_WAIT: float = float(
+        os.getenv("ADMISSION_INTERACTIVE_MAX_WAIT", "2.0")
+    )
+    ADMISSION_LLM_MAX_WAIT: float = float(os.getenv("ADMISSION_LLM_MAX_WAIT", "5.0"))
+
+    # Deadlines: every tool call gets a budget shared by all of its stages.
+    # Override per tool with TOOL_DEADLINE_<TOOL_NAME>, e.g. TOOL_DEADLINE_SAVE_PROMPT=180.
+    DEFAULT_TOOL_DEADLINE: float = float(os.getenv("DEFAULT_TOOL_DEADLINE", "30"))
+    TOOL_DEADLINES: Dict[str, float] = {
+        "save_prompt": 120.0,
+        "preview_prompt": 120.0,
+        "improve_prompt_from_feedback": 120.0,
+        "search_prompts": 15.0,
+        "search_prompts_batch": 20.0,
+    }
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "120"))
+    VOYAGE_TIMEOUT: float = float(os.getenv("VOYAGE_TIMEOUT", "15"))
+
+    # Circuit breakers per dependency (voyage, openai, mongodb)
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256"))
+
+    # Conversation compaction before analysis: duplicate blocks become references and
+    # oversized messages keep their head and tail
+    CONVERSATION_COMPACTION_ENABLED: bool = _env_bool("CONVERSATION_COMPACTION_ENABLED", True)
+    COMPACTION_MAX_TOOL_TOKENS: int = int(os.getenv("COMPACTION_MAX_TOOL_TOKENS", "2000"))
+    COMPACTION_MAX_MESSAGE_TOKENS: int = int(os.getenv("COMPACTION_MAX_MESSAGE_TOKENS", "8000"))
+    COMPACTION_MIN_BLOCK_CHARS: int = int(os.getenv("COMPACTION_MIN_BLOCK_CHARS", "200"))
+
+    # Background save jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    # Workers start on the first queued save and stop after JOB_WORKER_IDLE_TIMEOUT seconds
+    # without jobs, so idle (e.g. per-editor stdio) servers do not poll the queue. Set
+    # JOB_WORKERS_ON_STARTUP on long-running servers to also resume jobs left by others.
+    JOB_WORKERS_ON_STARTUP: bool = _env_bool("JOB_WORKERS_ON_STARTUP", False)
+    JOB_WORKER_IDLE_TIMEOUT: float = float(os.getenv("JOB_WORKER_IDLE_TIMEOUT", "300"))
+    # Seconds between sweeps failing jobs whose lease expired on their final attempt
+    JOB_SWEEP_INTERVAL: float = float(os.getenv("JOB_SWEEP_INTERVAL", "60"))
+
+    # Embedding provider: "voyage" (API), "local" (hashed n-grams) or "onnx" (local model)
+    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "voyage")
+    ONNX_EMBEDDING_MODEL_PATH: Optional[str] = os.getenv("ONNX_EMBEDDING_MODEL_PATH")
+    ONNX_EMBEDDING_THREADS: int = int(os.getenv("ONNX_EMBEDDING_THREADS", "0"))
+
+    # Label use cases with a classifier trained on stored embeddings instead of the LLM
+    USE_CASE_CLASSIFIER_ENABLED: bool = _env_bool("USE_CASE_CLASSIFIER_ENABLED", False)
+    USE_CASE_CLASSIFIER_MIN_EXAMPLES: int = int(
+        os.getenv("USE_CASE_CLASSIFIER_MIN_EXAMPLES", "5")
+    )
 
     # Voyage AI Configuration
     VOYAGE_AI_API_KEY: Optional[str] = os.getenv("VOYAGE_AI_API_KEY")
     VOYAGE_AI_EMBEDDING_MODEL: str = os.getenv("VOYAGE_AI_EMBEDDING_MODEL", "voyage-3-large")
+    VOYAGE_HEDGING_ENABLED: bool = _env_bool("VOYAGE_HEDGING_ENABLED", False)
+    VOYAGE_HEDGE_PERCENTILE: float = float(os.getenv("VOYAGE_HEDGE_PERCENTILE", "0.95"))
+    VOYAGE_HEDGE_MAX_RATE: float = float(os.getenv("VOYAGE_HEDGE_MAX_RATE", "0.1"))
+    VOYAGE_HEDGE_MIN_DELAY: float = float(os.getenv("VOYAGE_HEDGE_MIN_DELAY", "0.05"))
+    VOYAGE_HEDGE_INITIAL_DELAY: float = float(os.getenv("VOYAGE_HEDGE_INITIAL_DELAY", "1.0"))
+
+    # LLM provider: "openai" (OPENAI_*) or "local" (any OpenAI-compatible server, LOCAL_LLM_*)
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "openai")
+
+    # Split analysis: a short summary call on a fast model runs concurrently with template
+    # generation on a stronger one. Providers and models default to LLM_PROVIDER's.
+    ANALYSIS_SPLIT_ENABLED: bool = _env_bool("ANALYSIS_SPLIT_ENABLED", False)
+    ANALYSIS_FAST_PROVIDER: Optional[str] = os.getenv("ANALYSIS_FAST_PROVIDER")
+    ANALYSIS_FAST_MODEL: Optional[str] = os.getenv("ANALYSIS_FAST_MODEL")
+    ANALYSIS_TEMPLATE_PROVIDER: Optional[str] = os.getenv("ANALYSIS_TEMPLATE_PROVIDER")
+    ANALYSIS_TEMPLATE_MODEL: Optional[str] = os.getenv("ANALYSIS_TEMPLATE_MODEL")
 
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL")
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+    # OpenAI-compatible local server (vLLM, llama.cpp, Ollama, ...)
+    LOCAL_LLM_BASE_URL: str = os.getenv("LOCAL_LLM_BASE_URL", "http://127.0.0.1:8080/v1")
+    LOCAL_LLM_MODEL: str = os.getenv("LOCAL_LLM_MODEL", "local-model")
+    LOCAL_LLM_API_KEY: str = os.getenv("LOCAL_LLM_API_KEY", "not-needed")
+    LOCAL_LLM_TIMEOUT: float = float(os.getenv("LOCAL_LLM_TIMEOUT", "300"))
+    LOCAL_LLM_MAX_CONCURRENCY: int = int(os.getenv("LOCAL_LLM_MAX_CONCURRENCY", "2"))
+    LOCAL_LLM_JSON_MODE: bool = _env_bool("LOCAL_LLM_JSON_MODE", True)
+
+    @classmethod
+    def tool_deadline(cls, tool_name: str) -> float:
+        """Return the deadline budget in seconds for a tool call."""
+        override = os.getenv(f"TOOL_DEADLINE_{tool_name.upper()}")
+        if override:
+            return float(override)
+        return cls.TOOL_DEADLINES.get(tool_name, cls.DEFAULT_TOOL_DEADLINE)
 
     @classmethod
     def validate(cls) -> None:
         """Validate that required configuration is present."""
         if not cls.MONGODB_URI:
             raise ValueError("MONGODB_URI environment variable is required")
-        if not cls.VOYAGE_AI_API_KEY:
+        if cls.EMBEDDING_PROVIDER not in ("voyage", "local", "onnx"):
+            raise ValueError("EMBEDDING_PROVIDER must be 'voyage', 'local' or 'onnx'")
+        if cls.EMBEDDING_PROVIDER == "voyage" and not cls.VOYAGE_AI_API_KEY:
             raise ValueError("VOYAGE_AI_API_KEY environment variable is required")
-        if not cls.OPENAI_API_KEY:
+        if cls.EMBEDDING_PROVIDER == "onnx" and not cls.ONNX_EMBEDDING_MODEL_PATH:
+            raise ValueError("ONNX_EMBEDDING_MODEL_PATH is required for the onnx provider")
+        if cls.LLM_PROVIDER not in ("openai", "local"):
+            raise ValueError("LLM_PROVIDER must be 'openai' or 'local'")
+        for name in ("ANALYSIS_FAST_PROVIDER", "ANALYSIS_TEMPLATE_PROVIDER"):
+            if getattr(cls, name) not in (None, "openai", "local"):
+                raise ValueError(f"{name} must be 'openai' or 'local'")
+        providers = {cls.LLM_PROVIDER, cls.ANALYSIS_FAST_PROVIDER, cls.ANALYSIS_TEMPLATE_PROVIDER}
+        if "openai" in providers and not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        if cls.MCP_TRANSPORT not in ("stdio", "http"):
+            raise ValueError("MCP_TRANSPORT must be 'stdio' or 'http'")
+        if cls.CHANGE_WATCHER_MODE not in ("auto", "stream", "poll"):
+            raise ValueError("CHANGE_WATCHER_MODE must be 'auto', 'stream' or 'poll'")
 
 
 # Global config instance
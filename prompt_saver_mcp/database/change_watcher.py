@@ -0,0 +1,422 @@
+"""Keep in-process caches in step with writes made by other server instances."""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set
+
+from pymongo.change_stream import CollectionChangeStream
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure, PyMongoError
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database.local_index import INDEX_PROJECTION
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODES = ("auto", "stream", "poll")
+
+# $changeStream is only supported on replica sets and sharded clusters
+_CHANGE_STREAMS_UNSUPPORTED = {40573}
+
+# The resume token is no longer in the oplog (or was never valid): resuming would skip changes
+_HISTORY_LOST = {260, 280, 286}
+
+# Timestamps polled for changes: edits stamp last_updated, bulk maintenance writes
+# stamp modified_at (see mongodb_client.MODIFIED_AT)
+_POLLED_FIELDS = ("last_updated", "modified_at")
+
+# How long a change stream getMore waits for new changes before returning empty
+_MAX_AWAIT_MS = 1000
+
+
+class ChangeListener:
+    """
+    Something kept in step with the prompts collection.
+
+    Methods are called from worker threads, one at a time per watcher, and must be
+    idempotent: a change can be delivered again after a resume or a poll overlap.
+    """
+
+    def load(self) -> None:
+        """Build the initial state; called once the watcher is following changes."""
+
+    def upsert(self, document: Mapping[str, Any]) -> None:
+        """A prompt was inserted or changed; document is its current stored state."""
+
+    def delete(self, prompt_id: str) -> None:
+        """A prompt was deleted."""
+
+    def known_ids(self) -> Set[str]:
+        """Prompt IDs held, used to find deletions when polling."""
+        return set()
+
+    def reset(self) -> None:
+        """Changes may have been missed: rebuild from the collection."""
+
+
+class LocalIndexListener(ChangeListener):
+    """Applies changes to the client's in-process vector index."""
+
+    def __init__(self, client: Any):
+        """
+        Initialize the listener.
+
+        Args:
+            client: The MongoDBClient whose local_index is maintained
+        """
+        self.client = client
+
+    def load(self) -> None:
+        self.client.get_local_index()
+
+    def upsert(self, document: Mapping[str, Any]) -> None:
+        index = self.client.local_index
+        if index is not None:
+            index.upsert({k: v for k, v in document.items() if k in INDEX_PROJECTION})
+
+    def delete(self, prompt_id: str) -> None:
+        index = self.client.local_index
+        if index is not None:
+            index.remove(prompt_id)
+
+    def known_ids(self) -> Set[str]:
+        index = self.client.local_index
+        return index.prompt_ids() if index is not None else set()
+
+    def reset(self) -> None:
+        self.client.reload_local_index()
+
+
+class ChangeWatcher:
+    """
+    Follows inserts, updates and deletes of the prompts collection and applies them to
+    listeners.
+
+    A change stream is used when the deployment supports one (replica sets, Atlas); its
+    resume token is checkpointed in a state collection so a reconnect or restart resumes
+    where it stopped. Standalone servers fall back to polling last_updated and modified_at,
+    with a periodic comparison of IDs to find deleted prompts.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        state_collection: Collection,
+        listeners: Sequence[ChangeListener],
+        watcher_id: Optional[str] = None,
+        mode: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        poll_overlap: Optional[float] = None,
+        reconcile_interval: Optional[float] = None,
+        checkpoint_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            collection: The prompts collection
+            state_collection: Collection holding resume tokens and poll watermarks
+            listeners: Caches to keep in step
+            watcher_id: Name of this watcher's state (default: CHANGE_WATCHER_ID)
+            mode: "auto", "stream" or "poll" (default: CHANGE_WATCHER_MODE)
+            poll_interval: Seconds between polls (default: CHANGE_POLL_INTERVAL)
+            poll_overlap: Seconds each poll re-reads, covering clock skew between writers
+                (default: CHANGE_POLL_OVERLAP)
+            reconcile_interval: Seconds between deletion checks when polling
+                (default: CHANGE_RECONCILE_INTERVAL)
+            checkpoint_interval: Seconds between state writes (default: CHANGE_CHECKPOINT_INTERVAL)
+        """
+        self.collection = collection
+        self.state_collection = state_collection
+        self.listeners = list(listeners)
+        self.watcher_id = watcher_id or config.CHANGE_WATCHER_ID or socket.gethostname()
+        self.requested_mode = mode or config.CHANGE_WATCHER_MODE
+        if self.requested_mode not in WATCH_MODES:
+            raise ValueError(f"Unknown change watcher mode: {self.requested_mode}")
+        self.poll_interval = poll_interval or config.CHANGE_POLL_INTERVAL
+        self.poll_overlap = timedelta(
+            seconds=config.CHANGE_POLL_OVERLAP if poll_overlap is None else poll_overlap
+        )
+        self.reconcile_interval = reconcile_interval or config.CHANGE_RECONCILE_INTERVAL
+        self.checkpoint_interval = checkpoint_interval or config.CHANGE_CHECKPOINT_INTERVAL
+        # Listeners need only the fields the local index holds
+        self.fields = list(INDEX_PROJECTION)
+        self.mode: Optional[str] = None if self.requested_mode == "auto" else self.requested_mode
+        self.state_id = f"{self.watcher_id}:{collection.full_name}"
+        self._resume_token: Optional[Mapping[str, Any]] = None
+        self._watermark: Optional[datetime] = None
+        self._saved: Dict[str, Any] = {}
+        self._checkpointed = 0.0
+        self._reconciled = 0.0
+        self._loaded = False
+        self._stopping = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._counts = {"upserts": 0, "deletes": 0, "resets": 0, "errors": 0}
+
+    def start(self) -> None:
+        """Start following changes on the running event loop."""
+        if self._task is not None:
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Started change watcher {self.state_id} ({self.requested_mode})")
+
+    async def stop(self) -> None:
+        """Stop following changes and checkpoint the position reached."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        # A change stream read returns within _MAX_AWAIT_MS; a poll sleep is just cancelled
+        done, _ = await asyncio.wait({self._task}, timeout=_MAX_AWAIT_MS / 1000 + 1)
+        if not done:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            await asyncio.to_thread(self._checkpoint, True)
+        self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Mode, position and change counts, for metrics."""
+        return {
+            "mode": self.mode,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "resumable": self._resume_token is not None,
+            **self._counts,
+        }
+
+    async def _run(self) -> None:
+        """Follow changes until stopped, reopening the stream or poll after failures."""
+        await asyncio.to_thread(self._load_state)
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                if self.mode == "poll":
+                    await self._poll()
+                else:
+                    await self._watch()
+                failures = 0
+            except OperationFailure as e:
+                if e.code in _CHANGE_STREAMS_UNSUPPORTED and self.requested_mode == "auto":
+                    logger.info(
+                        f"Change streams are not supported by this deployment; polling "
+                        f"last_updated every {self.poll_interval}s"
+                    )
+                    self.mode = "poll"
+                    continue
+                if e.code in _HISTORY_LOST:
+                    logger.warning(f"Change stream cannot resume ({e}); reloading caches")
+                    self._resume_token = None
+                    await asyncio.to_thread(self._reset)
+                    continue
+                failures += 1
+                self._counts["errors"] += 1
+                logger.warning(f"Change watcher failed: {e}")
+            except PyMongoError as e:
+                failures += 1
+                self._counts["errors"] += 1
+                logger.warning(f"Change watcher lost its connection: {e}")
+            except Exception as e:
+                failures += 1
+                self._counts["errors"] += 1
+                logger.error(f"Change watcher failed: {e}", exc_info=True)
+            if failures and not self._stopping.is_set():
+                await asyncio.sleep(min(60.0, 2.0 ** failures))
+
+    async def _ready(self) -> None:
+        """Load the listeners once changes are being captured, so none are missed."""
+        if self._loaded:
+            return
+        loaded_at = datetime.utcnow()
+        for listener in self.listeners:
+            await asyncio.to_thread(listener.load)
+        if self._watermark is None:
+            self._watermark = loaded_at
+        self._loaded = True
+
+    async def _watch(self) -> None:
+        """Follow the change stream until it is invalidated or the watcher stops."""
+        stream = await asyncio.to_thread(self._open_stream)
+        self.mode = "stream"
+        try:
+            await self._ready()
+            while not self._stopping.is_set():
+                if not await asyncio.to_thread(self._drain, stream):
+                    break
+        finally:
+            await asyncio.to_thread(stream.close)
+            await asyncio.to_thread(self._checkpoint, True)
+
+    def _open_stream(self) -> CollectionChangeStream:
+        projection = {"operationType": 1, "documentKey": 1}
+        projection.update({f"fullDocument.{field}": 1 for field in self.fields})
+        return self.collection.watch(
+            [{"$project": projection}],
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+            max_await_time_ms=_MAX_AWAIT_MS,
+        )
+
+    def _drain(self, stream: CollectionChangeStream) -> bool:
+        """
+        Apply the changes available on the stream.
+
+        Returns:
+            False once the stream was invalidated and has to be reopened
+        """
+        while not self._stopping.is_set():
+            change = stream.try_next()
+            if change is None:
+                break
+            if not self._apply_change(change):
+                return False
+            self._resume_token = stream.resume_token
+            self._checkpoint()
+        # An idle stream still advances its resume token
+        if stream.resume_token is not None:
+            self._resume_token = stream.resume_token
+        self._checkpoint()
+        return stream.alive
+
+    def _apply_change(self, change: Mapping[str, Any]) -> bool:
+        """Apply one change event; returns False if it invalidated the stream."""
+        operation = change["operationType"]
+        if operation in ("insert", "update", "replace"):
+            document = change.get("fullDocument")
+            if document:
+                self._upsert(document)
+            else:
+                # Deleted before the update was looked up; its delete event follows
+                self._delete(str(change["documentKey"]["_id"]))
+        elif operation == "delete":
+            self._delete(str(change["documentKey"]["_id"]))
+        elif operation in ("drop", "rename", "dropDatabase", "invalidate"):
+            logger.warning(f"Prompts collection {operation}; reloading caches")
+            self._resume_token = None
+            self._reset()
+            return False
+        return True
+
+    async def _poll(self) -> None:
+        """Poll last_updated until the watcher stops."""
+        await self._ready()
+        while not self._stopping.is_set():
+            await asyncio.to_thread(self._poll_once)
+            await asyncio.sleep(self.poll_interval)
+
+    def _poll_once(self) -> int:
+        """
+        Apply prompts written since the watermark, and deletions when a check is due.
+
+        Edits stamp last_updated and bulk maintenance writes (re-embedding, relabeling,
+        compression) stamp modified_at, so both are polled. Writers stamp them with their
+        own clocks, so each poll re-reads the last poll_overlap seconds; re-applying a
+        prompt is harmless.
+
+        Returns:
+            Number of prompts applied
+        """
+        since = self._watermark - self.poll_overlap
+        applied = 0
+        projection = {field: 1 for field in self.fields}
+        projection.update({field: 1 for field in _POLLED_FIELDS})
+        cursor = self.collection.find(
+            {"$or": [{field: {"$gte": since}} for field in _POLLED_FIELDS]}, projection
+        )
+        for document in cursor:
+            self._upsert(document)
+            applied += 1
+            for field in _POLLED_FIELDS:
+                stamp = document.get(field)
+                if stamp and stamp > self._watermark:
+                    self._watermark = stamp
+        if time.monotonic() - self._reconciled >= self.reconcile_interval:
+            self._reconcile()
+        self._checkpoint()
+        return applied
+
+    def _reconcile(self) -> int:
+        """Delete prompts the listeners hold that are no longer stored."""
+        # Read the held IDs first: prompts added while the stored IDs are read are kept
+        held = set()
+        for listener in self.listeners:
+            held |= listener.known_ids()
+        self._reconciled = time.monotonic()
+        if not held:
+            return 0
+        stored = {str(document["_id"]) for document in self.collection.find({}, {"_id": 1})}
+        deleted = held - stored
+        for prompt_id in deleted:
+            self._delete(prompt_id)
+        if deleted:
+            logger.info(f"Removed {len(deleted)} deleted prompts from local caches")
+        return len(deleted)
+
+    def _upsert(self, document: Mapping[str, Any]) -> None:
+        for listener in self.listeners:
+            listener.upsert(document)
+        self._counts["upserts"] += 1
+
+    def _delete(self, prompt_id: str) -> None:
+        for listener in self.listeners:
+            listener.delete(prompt_id)
+        self._counts["deletes"] += 1
+
+    def _reset(self) -> None:
+        for listener in self.listeners:
+            listener.reset()
+        self._counts["resets"] += 1
+
+    def _load_state(self) -> None:
+        """Read the persisted resume token and watermark."""
+        try:
+            state = self.state_collection.find_one({"_id": self.state_id}) or {}
+        except PyMongoError as e:
+            logger.warning(f"Could not read change watcher state: {e}")
+            state = {}
+        self._resume_token = state.get("resume_token")
+        self._watermark = state.get("poll_watermark")
+        self._saved = {"resume_token": self._resume_token, "poll_watermark": self._watermark}
+
+    def _checkpoint(self, force: bool = False) -> None:
+        """Persist the resume token and watermark if they moved and a checkpoint is due."""
+        state = {"resume_token": self._resume_token, "poll_watermark": self._watermark}
+        if state == self._saved:
+            return
+        if not force and time.monotonic() - self._checkpointed < self.checkpoint_interval:
+            return
+        try:
+            self.state_collection.update_one(
+                {"_id": self.state_id},
+                {"$set": {**state, "updated_at": datetime.utcnow()}},
+                upsert=True,
+            )
+            self._saved = state
+            self._checkpointed = time.monotonic()
+        except PyMongoError as e:
+            logger.warning(f"Could not checkpoint change watcher state: {e}")
+
+
+def create_change_watcher(client: Any) -> Optional[ChangeWatcher]:
+    """
+    Build the watcher for a MongoDBClient when CHANGE_WATCHER_ENABLED.
+
+    Args:
+        client: The MongoDBClient whose caches are kept in step
+
+    Returns:
+        The watcher, or None when it is disabled or there is nothing to keep in step
+    """
+    if not config.CHANGE_WATCHER_ENABLED:
+        return None
+    listeners: List[ChangeListener] = []
+    if config.LOCAL_VECTOR_INDEX_ENABLED:
+        listeners.append(LocalIndexListener(client))
+    if not listeners:
+        logger.info("Change watcher enabled but no local caches are in use; not started")
+        return None
+    return ChangeWatcher(
+        client.collection, client.db[config.MONGODB_WATCHER_COLLECTION], listeners
+    )
@@ -0,0 +1,217 @@
+"""Transparent compression of large text fields."""
+
+import logging
+import struct
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from bson.binary import USER_DEFINED_SUBTYPE, Binary
+from pymongo import DESCENDING
+from pymongo.collection import Collection
+
+from prompt_saver_mcp.config import config
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is used when it is missing
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Text fields of prompt documents that may be stored compressed
+COMPRESSED_FIELDS = ("prompt_template", "history")
+
+# Format marker: compressed values are BSON binaries of the user-defined subtype whose
+# first byte names the codec. Plain strings are always read as-is, so documents written
+# before compression was enabled keep working.
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_ZSTD_DICT = 3  # followed by a 4-byte big-endian dictionary ID
+
+
+def is_compressed(value: Any) -> bool:
+    """Return True if a stored value carries the compression marker."""
+    return isinstance(value, Binary) and value.subtype == USER_DEFINED_SUBTYPE
+
+
+class TextCompressor:
+    """Compresses and decompresses text fields, optionally with a trained zstd dictionary."""
+
+    def __init__(self, dictionaries: Optional[Collection] = None):
+        """
+        Initialize the compressor.
+
+        Args:
+            dictionaries: Optional collection holding trained zstd dictionaries
+        """
+        self.dictionaries = dictionaries
+        self._dicts: Dict[int, Any] = {}
+        self._active_dict_id: Optional[int] = None
+        self._active_loaded = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether new writes are compressed."""
+        return config.COMPRESSION_ENABLED
+
+    def _get_dict(self, dict_id: int) -> Any:
+        """Load a dictionary by ID, caching it in process."""
+        if dict_id not in self._dicts:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read dictionary-compressed fields")
+            document = None
+            if self.dictionaries is not None:
+                document = self.dictionaries.find_one({"_id": dict_id})
+            if not document:
+                raise ValueError(f"Compression dictionary {dict_id} not found")
+            self._dicts[dict_id] = zstandard.ZstdCompressionDict(bytes(document["data"]))
+        return self._dicts[dict_id]
+
+    def _active_dict(self) -> Optional[int]:
+        """Return the ID of the newest trained dictionary, if any."""
+        if not self._active_loaded:
+            self._active_loaded = True
+            if zstandard is not None and self.dictionaries is not None:
+                latest = self.dictionaries.find_one({}, {"_id": 1}, sort=[("_id", DESCENDING)])
+                if latest:
+                    self._active_dict_id = latest["_id"]
+        return self._active_dict_id
+
+    def compress_bytes(self, data: bytes, codec: Optional[int] = None) -> bytes:
+        """
+        Compress raw bytes into a marked payload.
+
+        Args:
+            data: UTF-8 encoded text
+            codec: Force a codec; by default the best available one is used
+
+        Returns:
+            Payload starting with the codec header
+        """
+        if codec is None:
+            if zstandard is None:
+                codec = CODEC_ZLIB
+            elif self._active_dict() is not None:
+                codec = CODEC_ZSTD_DICT
+            else:
+                codec = CODEC_ZSTD
+
+        level = config.COMPRESSION_LEVEL
+        if codec == CODEC_ZSTD_DICT:
+            dict_id = self._active_dict()
+            compressor = zstandard.ZstdCompressor(level=level, dict_data=self._get_dict(dict_id))
+            return bytes([codec]) + struct.pack(">I", dict_id) + compressor.compress(data)
+        if codec == CODEC_ZSTD:
+            return bytes([codec]) + zstandard.ZstdCompressor(level=level).compress(data)
+        return bytes([CODEC_ZLIB]) + zlib.compress(data, min(level, 9))
+
+    def decompress_bytes(self, payload: bytes) -> bytes:
+        """
+        Decompress a marked payload.
+
+        Args:
+            payload: Payload produced by compress_bytes
+
+        Returns:
+            The original bytes
+        """
+        codec = payload[0]
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload[1:])
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed fields")
+        if codec == CODEC_ZSTD:
+            return zstandard.ZstdDecompressor().decompress(payload[1:])
+        if codec == CODEC_ZSTD_DICT:
+            (dict_id,) = struct.unpack(">I", payload[1:5])
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._get_dict(dict_id))
+            return decompressor.decompress(payload[5:])
+        raise ValueError(f"Unknown compression codec: {codec}")
+
+    def compress(self, text: Optional[str]) -> Union[str, Binary, None]:
+        """
+        Compress a text value for storage if it is large enough to benefit.
+
+        Args:
+            text: The text value
+
+        Returns:
+            A marked binary, or the text unchanged
+        """
+        if text is None or not self.enabled:
+            return text
+        data = text.encode("utf-8")
+        if len(data) < config.COMPRESSION_MIN_BYTES:
+            return text
+        payload = self.compress_bytes(data)
+        if len(payload) >= len(data):
+            return text
+        return Binary(payload, USER_DEFINED_SUBTYPE)
+
+    def decompress(self, value: Any) -> Any:
+        """
+        Decode a stored value, compressed or not.
+
+        Args:
+            value: The stored value
+
+        Returns:
+            The text, or the value unchanged if it is not compressed
+        """
+        if is_compressed(value):
+            return self.decompress_bytes(bytes(value)).decode("utf-8")
+        return value
+
+    def encode_document(
+        self, document: Dict[str, Any], fields: Iterable[str] = COMPRESSED_FIELDS
+    ) -> Dict[str, Any]:
+        """Compress the given fields of a document in place."""
+        for field in fields:
+            if isinstance(document.get(field), str):
+                document[field] = self.compress(document[field])
+        return document
+
+    def decode_document(
+        self, document: Optional[Dict[str, Any]], fields: Iterable[str] = COMPRESSED_FIELDS
+    ) -> Optional[Dict[str, Any]]:
+        """Decompress the given fields of a document in place."""
+        if document is not None:
+            for field in fields:
+                if field in document:
+                    document[field] = self.decompress(document[field])
+        return document
+
+    def train_dictionary(self, samples: List[str], size: int = 112640) -> int:
+        """
+        Train a zstd dictionary on sample texts and make it the active one.
+
+        Args:
+            samples: Representative texts (e.g. existing templates)
+            size: Target dictionary size in bytes
+
+        Returns:
+            The new dictionary ID
+        """
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to train a dictionary")
+        trained = zstandard.train_dictionary(size, [s.encode("utf-8") for s in samples])
+        if self.dictionaries is None:
+            # In-memory only (benchmarks); values compressed with it cannot be read elsewhere
+            dict_id = max(self._dicts, default=0) + 1
+        else:
+            latest = self.dictionaries.find_one({}, {"_id": 1}, sort=[("_id", DESCENDING)])
+            dict_id = (latest["_id"] + 1) if latest else 1
+            self.dictionaries.insert_one(
+                {
+                    "_id": dict_id,
+                    "data": Binary(trained.as_bytes()),
+                    "num_samples": len(samples),
+                    "created_at": datetime.utcnow(),
+                }
+            )
+        self._dicts[dict_id] = trained
+        self._active_dict_id = dict_id
+        self._active_loaded = True
+        logger.info(f"Trained compression dictionary {dict_id} on {len(samples)} samples")
+        return dict_id
@@ -0,0 +1,260 @@
+"""Index management and query plan diagnostics for the prompts collection."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+from pymongo.operations import SearchIndexModel
+
+from prompt_saver_mcp.config import config
+
+logger = logging.getLogger(__name__)
+
+# Compound indexes backing the listing queries (equality field first, then the
+# keyset-pagination sort key). The last two serve unfiltered listings and the change
+# watcher's last_updated/modified_at polling.
+COMPOUND_INDEXES = [
+    [("use_case", ASCENDING), ("last_updated", DESCENDING), ("_id", DESCENDING)],
+    [("created_by", ASCENDING), ("last_updated", DESCENDING), ("_id", DESCENDING)],
+    [("last_updated", DESCENDING), ("_id", DESCENDING)],
+    [("modified_at", DESCENDING)],
+]
+
+# Indexes replaced by COMPOUND_INDEXES (before _id became the keyset tie-breaker); each is
+# a prefix of its replacement, so it only adds write cost and is dropped
+SUPERSEDED_INDEXES = ["use_case_1_last_updated_-1", "created_by_1_last_updated_-1"]
+
+# One revision per (prompt, version); uniqueness rejects concurrent writers of a revision
+VERSION_INDEX = [("prompt_id", ASCENDING), ("version", DESCENDING)]
+
+# Text index used by lexical search while the embedding provider is unavailable.
+# Compressed fields are stored as binaries and are not indexed.
+TEXT_INDEX = [("summary", TEXT), ("prompt_template", TEXT), ("history", TEXT)]
+TEXT_INDEX_WEIGHTS = {"summary": 10, "prompt_template": 3, "history": 1}
+TEXT_INDEX_NAME = "prompt_text"
+
+# Fields that $vectorSearch may pre-filter on
+VECTOR_FILTER_FIELDS = ["use_case", "created_by", "last_updated"]
+
+
+def vector_index_definition() -> Dict[str, Any]:
+    """Build the Atlas vector search index definition."""
+    fields: List[Dict[str, Any]] = [
+        {
+            "type": "vector",
+            "path": "embedding",
+            "numDimensions": config.EMBEDDING_DIMENSIONS,
+            "similarity": "dotProduct",
+        }
+    ]
+    fields.extend({"type": "filter", "path": path} for path in VECTOR_FILTER_FIELDS)
+    return {"fields": fields}
+
+
+def ensure_compound_indexes(collection: Collection) -> List[str]:
+    """
+    Create the compound indexes used by listing queries.
+
+    Args:
+        collection: The prompts collection
+
+    Returns:
+        Names of the ensured indexes
+    """
+    names = []
+    for keys in COMPOUND_INDEXES:
+        # create_index is a no-op when an identical index already exists
+        names.append(collection.create_index(keys))
+    logger.info(f"Ensured compound indexes: {', '.join(names)}")
+    return names
+
+
+def drop_superseded_indexes(collection: Collection) -> List[str]:
+    """
+    Drop indexes replaced by COMPOUND_INDEXES; call after those are ensured.
+
+    Args:
+        collection: The prompts collection
+
+    Returns:
+        Names of the dropped indexes
+    """
+    existing = collection.index_information()
+    dropped = []
+    for name in SUPERSEDED_INDEXES:
+        if name not in existing:
+            continue
+        try:
+            collection.drop_index(name)
+        except OperationFailure as e:
+            # Dropped concurrently by another instance
+            logger.warning(f"Could not drop superseded index '{name}': {e}")
+            continue
+        dropped.append(name)
+    if dropped:
+        logger.info(f"Dropped superseded indexes: {', '.join(dropped)}")
+    return dropped
+
+
+def ensure_text_index(collection: Collection) -> str:
+    """
+    Create the text index used by lexical fallback search.
+
+    Args:
+        collection: The prompts collection
+
+    Returns:
+        Name of the ensured index
+    """
+    name = collection.create_index(
+        TEXT_INDEX, name=TEXT_INDEX_NAME, weights=TEXT_INDEX_WEIGHTS, default_language="english"
+    )
+    logger.info(f"Ensured text index: {name}")
+    return name
+
+
+def ensure_version_index(versions: Collection) -> str:
+    """
+    Create the unique revision index on the prompt_versions collection.
+
+    Args:
+        versions: The prompt_versions collection
+
+    Returns:
+        Name of the ensured index
+    """
+    name = versions.create_index(VERSION_INDEX, unique=True)
+    logger.info(f"Ensured version index: {name}")
+    return name
+
+
+def ensure_vector_index(collection: Collection) -> str:
+    """
+    Create the Atlas vector search index, or update it if it no longer matches.
+
+    The index is updated when filter fields are missing or when its vector field's
+    numDimensions or similarity differ from the configured ones (e.g. after
+    EMBEDDING_DIMENSIONS changed with the embedding provider).
+
+    Args:
+        collection: The prompts collection
+
+    Returns:
+        Status string: "created", "updated", "ok" or "unavailable"
+    """
+    name = config.MONGODB_VECTOR_INDEX
+    definition = vector_index_definition()
+    try:
+        existing = list(collection.list_search_indexes(name))
+    except OperationFailure as e:
+        # Search indexes are only supported on Atlas (or a local Atlas deployment)
+        logger.warning(f"Search indexes are not available on this deployment: {e}")
+        return "unavailable"
+
+    if not existing:
+        collection.create_search_index(
+            SearchIndexModel(definition=definition, name=name, type="vectorSearch")
+        )
+        logger.info(f"Created vector search index '{name}'")
+        return "created"
+
+    current_fields = existing[0].get("latestDefinition", {}).get("fields", [])
+    current_filters = {f.get("path") for f in current_fields if f.get("type") == "filter"}
+    current_vector = next((f for f in current_fields if f.get("type") == "vector"), {})
+    wanted_vector = definition["fields"][0]
+    changes = []
+    if not set(VECTOR_FILTER_FIELDS).issubset(current_filters):
+        changes.append("filter fields")
+    for key in ("path", "numDimensions", "similarity"):
+        if current_vector.get(key) != wanted_vector[key]:
+            changes.append(f"{key} {current_vector.get(key)} -> {wanted_vector[key]}")
+    if changes:
+        collection.update_search_index(name, definition)
+        logger.info(f"Updated vector search index '{name}': {', '.join(changes)}")
+        return "updated"
+
+    return "ok"
+
+
+def ensure_indexes(
+    collection: Collection, versions: Optional[Collection] = None
+) -> Dict[str, Any]:
+    """
+    Ensure all indexes required by the server exist.
+
+    Args:
+        collection: The prompts collection
+        versions: Optional prompt_versions collection
+
+    Returns:
+        Dictionary describing the ensured indexes
+    """
+    ensured = {
+        "compound_indexes": ensure_compound_indexes(collection),
+        "dropped_indexes": drop_superseded_indexes(collection),
+        "text_index": ensure_text_index(collection),
+        "vector_index": ensure_vector_index(collection),
+    }
+    if versions is not None:
+        ensured["version_index"] = ensure_version_index(versions)
+    return ensured
+
+
+def _summarize_plan(plan: Dict[str, Any]) -> str:
+    """Flatten a winning plan tree into a readable stage chain."""
+    stages = []
+    node: Optional[Dict[str, Any]] = plan
+    while node:
+        stage = node.get("stage", "?")
+        if node.get("indexName"):
+            stage += f"({node['indexName']})"
+        stages.append(stage)
+        node = node.get("inputStage")
+    return " <- ".join(stages)
+
+
+def explain_query_plans(
+    collection: Collection, sample_value: str = "general"
+) -> List[Dict[str, Any]]:
+    """
+    Explain the listing queries the server issues.
+
+    Args:
+        collection: The prompts collection
+        sample_value: Value used for the equality predicates
+
+    Returns:
+        One summary dictionary per explained query
+    """
+    queries = [
+        ("by_use_case", {"use_case": sample_value}),
+        ("by_created_by", {"created_by": sample_value}),
+    ]
+    reports = []
+    for label, query in queries:
+        try:
+            explain = (
+                collection.find(query)
+                .sort([("last_updated", DESCENDING), ("_id", DESCENDING)])
+                .limit(10)
+                .explain()
+            )
+            winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+            # Newer servers wrap the classic plan under "queryPlan"
+            winning_plan = winning_plan.get("queryPlan", winning_plan)
+            stats = explain.get("executionStats", {})
+            reports.append(
+                {
+                    "query": label,
+                    "filter": query,
+                    "plan": _summarize_plan(winning_plan),
+                    "keys_examined": stats.get("totalKeysExamined"),
+                    "docs_examined": stats.get("totalDocsExamined"),
+                    "returned": stats.get("nReturned"),
+                }
+            )
+        except OperationFailure as e:
+            reports.append({"query": label, "filter": query, "error": str(e)})
+    return reports
@@ -0,0 +1,212 @@
+"""Exact in-process vector index over compact prompt records."""
+
+import heapq
+import logging
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from pymongo.collection import Collection
+
+from prompt_saver_mcp.database.compression import TextCompressor
+from prompt_saver_mcp.database.models import SearchFilters
+from prompt_saver_mcp.database.records import EmbeddingStore, PromptRecord
+
+logger = logging.getLogger(__name__)
+
+# Fields loaded into the index: everything search results return, plus filter fields
+INDEX_PROJECTION = {
+    "_id": 1,
+    "use_case": 1,
+    "summary": 1,
+    "prompt_template": 1,
+    "history": 1,
+    "last_updated": 1,
+    "created_by": 1,
+    "embedding": 1,
+    "embedding_model": 1,
+}
+
+
+def _matches(record: PromptRecord, filters: Optional[SearchFilters]) -> bool:
+    """Apply search pre-filters to a record."""
+    if filters is None:
+        return True
+    if filters.use_case is not None and record.use_case != filters.use_case:
+        return False
+    if filters.created_by is not None and record.created_by != filters.created_by:
+        return False
+    if filters.updated_after is not None and (
+        record.last_updated is None or record.last_updated <= filters.updated_after
+    ):
+        return False
+    return True
+
+
+class LocalVectorIndex:
+    """
+    Brute-force dot-product search over prompts held in memory.
+
+    Records keep their text as raw BSON and their embeddings in a shared float32
+    EmbeddingStore, so a few thousand prompts take tens of MB rather than hundreds.
+    Useful on deployments without Atlas Vector Search and as an exact baseline.
+
+    Only embeddings of the index's model are searchable: after switching embedding
+    providers, prompts not yet re-embedded stay indexed without an embedding instead of
+    being scored against vectors from another model.
+    """
+
+    def __init__(
+        self, dimensions: int, compressor: TextCompressor, model_id: Optional[str] = None
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Embedding dimensions
+            compressor: Compressor used to decode compressed text fields of results
+            model_id: Embedding model whose vectors are searchable; prompts stored without
+                an embedding_model (saved before it was recorded) are accepted when their
+                dimensions match. None accepts any model.
+        """
+        self.store = EmbeddingStore(dimensions)
+        self.compressor = compressor
+        self.model_id = model_id
+        self._records: Dict[str, PromptRecord] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def prompt_ids(self) -> Set[str]:
+        """IDs of the indexed prompts."""
+        with self._lock:
+            return set(self._records)
+
+    def load(self, collection: Collection) -> int:
+        """
+        Load every prompt of a collection.
+
+        Args:
+            collection: The prompts collection
+
+        Returns:
+            Number of prompts loaded
+        """
+        unsearchable = 0
+        for document in collection.find({}, INDEX_PROJECTION):
+            if not self.upsert(document) and document.get("embedding"):
+                unsearchable += 1
+        logger.info(f"Loaded {len(self)} prompts into the local vector index")
+        if unsearchable:
+            logger.warning(
+                f"{unsearchable} prompts were embedded by another model and are not "
+                f"searchable until re-embedded with {self.model_id}"
+            )
+        return len(self)
+
+    def compatible(self, document: Mapping[str, Any]) -> bool:
+        """Whether a document's embedding can be scored against this index's queries."""
+        embedding = document.get("embedding")
+        if not embedding or len(embedding) != self.store.dimensions:
+            return False
+        model = document.get("embedding_model")
+        return self.model_id is None or model is None or model == self.model_id
+
+    def upsert(self, document: Mapping[str, Any]) -> bool:
+        """
+        Add a stored document to the index, replacing any previous record of it.
+
+        Returns:
+            Whether the prompt is searchable (has an embedding of the index's model)
+        """
+        embedding = document.get("embedding") if self.compatible(document) else None
+        with self._lock:
+            previous = self._records.get(str(document["_id"]))
+            row = previous.row if previous is not None else None
+            if embedding:
+                if row is None:
+                    row = self.store.add(embedding)
+                else:
+                    self.store.set(row, embedding)
+            elif row is not None:
+                self.store.remove(row)
+                row = None
+            record = PromptRecord.from_document(document, row=row)
+            self._records[record.prompt_id] = record
+        return row is not None
+
+    def apply_update(self, prompt_id: str, set_doc: Mapping[str, Any]) -> None:
+        """
+        Apply the $set of an update to an indexed prompt.
+
+        Args:
+            prompt_id: The prompt ID
+            set_doc: Fields written, in stored (possibly compressed) form
+        """
+        with self._lock:
+            record = self._records.get(prompt_id)
+        if record is None:
+            return
+        document = {"_id": prompt_id, **record.fields(), **set_doc}
+        document = {k: v for k, v in document.items() if k == "_id" or k in INDEX_PROJECTION}
+        if "embedding" not in set_doc and record.row is not None:
+            document["embedding"] = self.store.get(record.row)
+        self.upsert(document)
+
+    def remove(self, prompt_id: str) -> bool:
+        """Remove a prompt; returns False if it was not indexed."""
+        with self._lock:
+            record = self._records.pop(prompt_id, None)
+            if record is None:
+                return False
+            if record.row is not None:
+                self.store.remove(record.row)
+            return True
+
+    def search(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        score_threshold: float = 0.0,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[dict]:
+        """
+        Exact top-k search.
+
+        Scores use the same scale as Atlas dotProduct similarity, (1 + dot) / 2.
+
+        Args:
+            query_embedding: Query embedding vector
+            limit: Maximum number of results
+            score_threshold: Minimum similarity score
+            filters: Optional pre-filters
+
+        Returns:
+            Matching prompts with scores, best first, shaped like vector_search results
+        """
+        with self._lock:
+            candidates = [
+                record
+                for record in self._records.values()
+                if record.row is not None and _matches(record, filters)
+            ]
+            dots = self.store.dot(query_embedding, [record.row for record in candidates])
+
+        scored = [
+            ((1.0 + dot) / 2.0, record)
+            for dot, record in zip(dots, candidates)
+            if (1.0 + dot) / 2.0 >= score_threshold
+        ]
+        results = []
+        for score, record in heapq.nlargest(limit, scored, key=lambda pair: pair[0]):
+            result = {"_id": record.prompt_id, **record.fields(), "score": score}
+            result.pop("created_by", None)
+            result.pop("embedding_model", None)
+            results.append(self.compressor.decode_document(result))
+        return results
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the records and the embedding store."""
+        with self._lock:
+            records = sum(record.nbytes() for record in self._records.values())
+        return records + self.store.nbytes
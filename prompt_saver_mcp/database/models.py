@@ -1,9 +1,9 @@
 """Data models for prompt storage."""
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class Prompt(BaseModel):
@@ -15,13 +15,23 @@ class Prompt(BaseModel):
     )
     summary: str = Field(..., description="Summary of the prompt and its use case")
     prompt_template: str = Field(..., description="Universal problem-solving prompt template")
+    template_outline: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Cached markdown heading outline of the template"
+    )
     history: str = Field(..., description="Summary of steps taken and end result")
     embedding: Optional[List[float]] = Field(
         None, description="Vector embeddings of the summary (2048 dimensions)"
     )
+    embedding_model: Optional[str] = Field(
+        None, description="Provider model that produced the embedding, e.g. voyage/voyage-3-large"
+    )
     last_updated: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
     num_updates: int = Field(default=0, description="Number of times this prompt has been updated")
-    changelog: List[str] = Field(default_factory=list, description="List of changes made to this prompt")
+    version: int = Field(default=1, description="Current template revision")
+    changelog: List[str] = Field(
+        default_factory=list,
+        description="Legacy inline changelog; new entries are stored in prompt_versions",
+    )
     created_by: Optional[str] = Field(None, description="Creator identifier for team sharing")
 
     class Config:
@@ -36,7 +46,7 @@ class Prompt(BaseModel):
                 "embedding": [0.1, 0.2, ...],
                 "last_updated": "2025-01-01T00:00:00Z",
                 "num_updates": 0,
-                "changelog": [],
+                "version": 1,
                 "created_by": "user123",
             }
         }
@@ -50,6 +60,7 @@ class PromptCreate(BaseModel):
     prompt_template: str
     history: str
     embedding: Optional[List[float]] = None
+    embedding_model: Optional[str] = None
     created_by: Optional[str] = None
 
 
@@ -61,5 +72,45 @@ class PromptUpdate(BaseModel):
     prompt_template: Optional[str] = None
     history: Optional[str] = None
     embedding: Optional[List[float]] = None
+    embedding_model: Optional[str] = None
     changelog_entry: Optional[str] = None
 
+
+class SearchFilters(BaseModel):
+    """Pre-filters applied to prompt searches."""
+
+    use_case: Optional[str] = None
+    created_by: Optional[str] = None
+    updated_after: Optional[datetime] = None
+
+    @field_validator("updated_after")
+    @classmethod
+    def _naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Stored timestamps are naive UTC; convert aware timestamps so they compare."""
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def is_empty(self) -> bool:
+        """Return True if no filter is set."""
+        return self.use_case is None and self.created_by is None and self.updated_after is None
+
+    def to_query(self) -> Dict[str, Any]:
+        """
+        Build a filter document usable both as a MongoDB query and as a $vectorSearch filter.
+
+        Returns:
+            Filter document, empty if no filter is set
+        """
+        clauses: List[Dict[str, Any]] = []
+        if self.use_case is not None:
+            clauses.append({"use_case": {"$eq": self.use_case}})
+        if self.created_by is not None:
+            clauses.append({"created_by": {"$eq": self.created_by}})
+        if self.updated_after is not None:
+            clauses.append({"last_updated": {"$gt": self.updated_after}})
+        if not clauses:
+            return {}
+        if len(clauses) == 1:
+            return clauses[0]
+        return {"$and": clauses}
@@ -1,19 +1,57 @@
 """MongoDB client for prompt storage and retrieval."""
 
 import logging
-from datetime import datetime
-from typing import List, Optional
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from pymongo import MongoClient
+from bson import ObjectId
+from pymongo import DESCENDING, MongoClient, ReturnDocument, UpdateOne
 from pymongo.collection import Collection
 from pymongo.database import Database
-from pymongo.errors import ConnectionFailure, OperationFailure
+from pymongo.errors import ConnectionFailure, DuplicateKeyError, OperationFailure
 
 from prompt_saver_mcp.config import config
-from prompt_saver_mcp.database.models import Prompt, PromptCreate, PromptUpdate
+from prompt_saver_mcp.database import indexes, pagination, search_tuning, versioning
+from prompt_saver_mcp.database.compression import COMPRESSED_FIELDS, TextCompressor
+from prompt_saver_mcp.database.local_index import LocalVectorIndex
+from prompt_saver_mcp.database.models import Prompt, PromptCreate, PromptUpdate, SearchFilters
+from prompt_saver_mcp.utils.template_outline import build_outline
 
 logger = logging.getLogger(__name__)
 
+# Stamped by bulk maintenance writes (re-embedding, relabeling, compression) that must not
+# move prompts in listings ordered by last_updated, so polling change watchers still see them
+MODIFIED_AT = "modified_at"
+
+# A revision this old whose head document never reached its version was left by a writer
+# that died between the two writes, not by a concurrent update still in progress
+STALE_REVISION_AGE = timedelta(minutes=10)
+
+# Fields returned by listing queries
+LISTING_PROJECTION = {"_id": 1, "summary": 1, "use_case": 1, "last_updated": 1}
+
+# Fields returned by vector and text search
+SEARCH_PROJECTION = {
+    "_id": 1,
+    "use_case": 1,
+    "summary": 1,
+    "prompt_template": 1,
+    "history": 1,
+    "last_updated": 1,
+}
+
+
+class VersionConflict(Exception):
+    """Raised when a prompt changed between reading it and writing an update."""
+
+    def __init__(self, prompt_id: str, version: Optional[int]):
+        super().__init__(
+            f"Prompt {prompt_id} was modified concurrently (expected version {version})"
+        )
+        self.prompt_id = prompt_id
+        self.version = version
+
 
 class MongoDBClient:
     """MongoDB client for prompt operations."""
@@ -23,6 +61,11 @@ class MongoDBClient:
         self.client: Optional[MongoClient] = None
         self.db: Optional[Database] = None
         self.collection: Optional[Collection] = None
+        self.versions: Optional[Collection] = None
+        self.compressor = TextCompressor()
+        # In-process vector index, loaded on first search when LOCAL_VECTOR_INDEX_ENABLED
+        self.local_index: Optional[LocalVectorIndex] = None
+        self._local_index_lock = threading.Lock()
         self._connect()
 
     def _connect(self) -> None:
@@ -31,24 +74,28 @@ class MongoDBClient:
             self.client = MongoClient(
                 config.MONGODB_URI,
                 serverSelectionTimeoutMS=5000,
-                maxPoolSize=50,
-                minPoolSize=10,
+                maxPoolSize=config.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=min(10, config.MONGODB_MAX_POOL_SIZE),
             )
             # Test connection
             self.client.admin.command("ping")
             self.db = self.client[config.MONGODB_DATABASE]
             self.collection = self.db[config.MONGODB_COLLECTION]
+            self.versions = self.db[config.MONGODB_VERSIONS_COLLECTION]
+            self.compressor = TextCompressor(self.db[config.MONGODB_DICTIONARIES_COLLECTION])
             logger.info(f"Connected to MongoDB database: {config.MONGODB_DATABASE}")
         except ConnectionFailure as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
-    def create_prompt(self, prompt_data: PromptCreate) -> str:
+    def create_prompt(self, prompt_data: PromptCreate, prompt_id: Optional[str] = None) -> str:
         """
         Create a new prompt in the database.
 
         Args:
             prompt_data: Prompt data to create
+            prompt_id: Optional preassigned ID; makes the insert idempotent, so a retried
+                save job does not create a duplicate prompt
 
         Returns:
             The created prompt's ID as a string
@@ -58,16 +105,42 @@ class MongoDBClient:
                 "use_case": prompt_data.use_case,
                 "summary": prompt_data.summary,
                 "prompt_template": prompt_data.prompt_template,
+                "template_outline": build_outline(prompt_data.prompt_template),
                 "history": prompt_data.history,
                 "embedding": prompt_data.embedding,
+                "embedding_model": prompt_data.embedding_model,
                 "last_updated": datetime.utcnow(),
                 "num_updates": 0,
-                "changelog": [],
+                "version": 1,
                 "created_by": prompt_data.created_by,
             }
-            result = self.collection.insert_one(document)
-            logger.info(f"Created prompt with ID: {result.inserted_id}")
-            return str(result.inserted_id)
+            if prompt_id is None:
+                object_id = self.collection.insert_one(
+                    self.compressor.encode_document(document)
+                ).inserted_id
+            else:
+                object_id = ObjectId(prompt_id)
+                document["_id"] = object_id
+                try:
+                    self.collection.insert_one(self.compressor.encode_document(document))
+                except DuplicateKeyError:
+                    logger.info(f"Prompt {prompt_id} already exists; skipping insert")
+            try:
+                self.versions.insert_one(
+                    self.compressor.encode_document(
+                        versioning.build_version_document(
+                            object_id, 1, None, prompt_data.prompt_template, "Created prompt"
+                        ),
+                        ["template"],
+                    )
+                )
+            except DuplicateKeyError:
+                if prompt_id is None:
+                    raise
+            if self.local_index is not None:
+                self.local_index.upsert(document)
+            logger.info(f"Created prompt with ID: {object_id}")
+            return str(object_id)
         except OperationFailure as e:
             logger.error(f"Failed to create prompt: {e}")
             raise
@@ -76,6 +149,8 @@ class MongoDBClient:
         """
         Retrieve a prompt by ID.
 
+        The changelog and embedding are not loaded; use get_changelog for history.
+
         Args:
             prompt_id: The prompt ID
 
@@ -83,143 +158,802 @@ class MongoDBClient:
             Prompt object or None if not found
         """
         try:
-            from bson import ObjectId
+            document = self.collection.find_one(
+                {"_id": ObjectId(prompt_id)}, {"changelog": 0, "embedding": 0}
+            )
+            if document:
+                document["_id"] = str(document["_id"])
+                return Prompt(**self.compressor.decode_document(document))
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get prompt {prompt_id}: {e}")
+            raise
+
+    def get_prompt_fields(self, prompt_id: str, fields: List[str]) -> Optional[dict]:
+        """
+        Retrieve selected fields of a prompt in one projected read.
 
-            document = self.collection.find_one({"_id": ObjectId(prompt_id)})
+        Args:
+            prompt_id: The prompt ID
+            fields: Fields to return
+
+        Returns:
+            Dictionary with _id and the requested fields, or None if not found
+        """
+        try:
+            document = self.collection.find_one(
+                {"_id": ObjectId(prompt_id)}, {field: 1 for field in fields}
+            )
             if document:
                 document["_id"] = str(document["_id"])
-                return Prompt(**document)
+                return self.compressor.decode_document(document)
             return None
         except Exception as e:
             logger.error(f"Failed to get prompt {prompt_id}: {e}")
             raise
 
-    def update_prompt(self, prompt_id: str, update_data: PromptUpdate) -> bool:
+    def get_prompts(
+        self, prompt_ids: List[str], fields: Optional[List[str]] = None
+    ) -> Tuple[List[dict], List[str]]:
         """
-        Update an existing prompt.
+        Retrieve several prompts in one query.
+
+        Args:
+            prompt_ids: The prompt IDs
+            fields: Fields to return (default: all except embedding and changelog)
+
+        Returns:
+            Tuple of (documents in input order, IDs that were invalid or not found)
+        """
+        try:
+            object_ids = {}
+            for prompt_id in prompt_ids:
+                if ObjectId.is_valid(prompt_id):
+                    object_ids[prompt_id] = ObjectId(prompt_id)
+
+            if fields:
+                projection: Dict[str, Any] = {field: 1 for field in fields}
+            else:
+                projection = {"changelog": 0, "embedding": 0}
+
+            found = {}
+            if object_ids:
+                query = {"_id": {"$in": list(set(object_ids.values()))}}
+                for document in self.collection.find(query, projection):
+                    document["_id"] = str(document["_id"])
+                    found[document["_id"]] = self.compressor.decode_document(document)
+
+            documents, missing = [], []
+            for prompt_id in prompt_ids:
+                object_id = object_ids.get(prompt_id)
+                if object_id is not None and str(object_id) in found:
+                    documents.append(found[str(object_id)])
+                else:
+                    missing.append(prompt_id)
+            return documents, missing
+        except Exception as e:
+            logger.error(f"Failed to get prompts {prompt_ids}: {e}")
+            raise
+
+    def update_prompt(
+        self,
+        prompt_id: str,
+        update_data: PromptUpdate,
+        current: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """
+        Update an existing prompt with a compare-and-set on its version.
+
+        The main document keeps only the head template and a version counter; every
+        update appends a delta-compressed revision to the prompt_versions collection.
+        The head document is written with a single find_one_and_update that only
+        matches the version the update was based on, so a concurrent update is
+        detected instead of silently overwritten.
 
         Args:
             prompt_id: The prompt ID to update
             update_data: Update data
+            current: The prompt's prompt_template and version if the caller already read
+                them (see get_prompt_fields); read here otherwise
 
         Returns:
-            True if update was successful, False otherwise
+            The changed fields (without the embedding) and version after the update,
+            or None if the prompt does not exist
+
+        Raises:
+            VersionConflict: If the prompt was updated since current was read
         """
         try:
-            from bson import ObjectId
+            object_id = ObjectId(prompt_id)
+            if current is None:
+                current = self.get_prompt_fields(prompt_id, ["prompt_template", "version"])
+                if not current:
+                    return None
+
+            current_version = current.get("version")
+            try:
+                if current_version is None:
+                    # Document predates versioning: record its template as the first revision
+                    self._insert_initial_revision(object_id, current["prompt_template"])
+                    version_filter: Dict[str, Any] = {"version": {"$exists": False}}
+                    base_version = 1
+                else:
+                    version_filter = {"version": current_version}
+                    base_version = current_version
+                new_version = base_version + 1
+
+                new_template = update_data.prompt_template
+                if new_template is None:
+                    new_template = current["prompt_template"]
+                # The unique (prompt_id, version) index rejects a concurrent writer of the
+                # same revision before the head document is touched
+                version_document = versioning.build_version_document(
+                    object_id,
+                    new_version,
+                    current["prompt_template"],
+                    new_template,
+                    update_data.changelog_entry,
+                )
+                self.compressor.encode_document(version_document, ["template"])
+                try:
+                    self.versions.insert_one(version_document)
+                except DuplicateKeyError:
+                    if not self._reclaim_stale_revision(object_id, new_version):
+                        raise
+                    self.versions.insert_one(version_document)
+            except DuplicateKeyError:
+                raise VersionConflict(prompt_id, current_version) from None
 
             # Build $set document for field updates
-            set_doc = {"last_updated": datetime.utcnow()}
+            set_doc = {"last_updated": datetime.utcnow(), "version": new_version}
             if update_data.use_case is not None:
                 set_doc["use_case"] = update_data.use_case
             if update_data.summary is not None:
                 set_doc["summary"] = update_data.summary
             if update_data.prompt_template is not None:
                 set_doc["prompt_template"] = update_data.prompt_template
+                set_doc["template_outline"] = build_outline(update_data.prompt_template)
             if update_data.history is not None:
                 set_doc["history"] = update_data.history
             if update_data.embedding is not None:
                 set_doc["embedding"] = update_data.embedding
+                set_doc["embedding_model"] = update_data.embedding_model
+
+            # Return only what changed, never the embedding
+            projection = {field: 1 for field in set_doc if field != "embedding"}
 
             # Build update document with operators
+            self.compressor.encode_document(set_doc)
             update_ops = {"$set": set_doc, "$inc": {"num_updates": 1}}
-            if update_data.changelog_entry:
-                update_ops["$push"] = {"changelog": update_data.changelog_entry}
 
-            result = self.collection.update_one({"_id": ObjectId(prompt_id)}, update_ops)
-            if result.modified_count > 0:
-                logger.info(f"Updated prompt {prompt_id}")
-                return True
-            return False
+            try:
+                updated = self.collection.find_one_and_update(
+                    {"_id": object_id, **version_filter},
+                    update_ops,
+                    projection=projection,
+                    return_document=ReturnDocument.AFTER,
+                )
+            except BaseException:
+                # Timeouts and cancellation included: a revision left behind would make
+                # every later update of the prompt conflict with it
+                self._discard_revision(version_document)
+                raise
+            if updated is None:
+                self._discard_revision(version_document)
+                raise VersionConflict(prompt_id, current_version)
+
+            if self.local_index is not None:
+                self.local_index.apply_update(prompt_id, set_doc)
+            logger.info(f"Updated prompt {prompt_id} to version {new_version}")
+            updated["_id"] = str(updated["_id"])
+            return self.compressor.decode_document(updated)
+        except VersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Failed to update prompt {prompt_id}: {e}")
             raise
 
+    def _insert_initial_revision(self, object_id: ObjectId, template: str) -> None:
+        """Record the template of a document that predates versioning as revision 1."""
+        try:
+            self.versions.insert_one(
+                self.compressor.encode_document(
+                    versioning.build_version_document(
+                        object_id, 1, None, template, "Initial version"
+                    ),
+                    ["template"],
+                )
+            )
+        except DuplicateKeyError:
+            # Recorded by an earlier attempt or a concurrent writer, from the same template
+            pass
+
+    def _discard_revision(self, version_document: Dict[str, Any]) -> None:
+        """
+        Delete a revision whose head write failed, unless the write landed anyway.
+
+        A timeout can be raised after the server applied the write; the head then carries
+        the revision's version and the revision must stay.
+
+        Args:
+            version_document: The inserted revision document
+        """
+        try:
+            head = self.collection.find_one(
+                {"_id": version_document["prompt_id"]}, {"version": 1}
+            )
+            if head and head.get("version") == version_document["version"]:
+                return
+            self.versions.delete_one({"_id": version_document["_id"]})
+        except Exception as e:
+            logger.error(
+                f"Failed to discard revision {version_document['version']} of prompt "
+                f"{version_document['prompt_id']}: {e}"
+            )
+
+    def _reclaim_stale_revision(self, object_id: ObjectId, version: int) -> bool:
+        """
+        Delete a revision that blocks an update but was never written to the head.
+
+        Failed head writes discard their revision; one is only left behind when a writer
+        died in between. It is told apart from a concurrent update in progress by the
+        head still being below its version after STALE_REVISION_AGE.
+
+        Args:
+            object_id: The prompt's ObjectId
+            version: The revision number
+
+        Returns:
+            True if a stale revision was deleted
+        """
+        head = self.collection.find_one({"_id": object_id}, {"version": 1})
+        if head is None or (head.get("version") or 1) >= version:
+            return False
+        result = self.versions.delete_one(
+            {
+                "prompt_id": object_id,
+                "version": version,
+                "created_at": {"$lt": datetime.utcnow() - STALE_REVISION_AGE},
+            }
+        )
+        if result.deleted_count:
+            logger.warning(f"Deleted stale revision {version} of prompt {object_id}")
+        return bool(result.deleted_count)
+
+    def get_changelog(self, prompt_id: str, limit: int = 10) -> List[dict]:
+        """
+        Retrieve the most recent changelog entries of a prompt.
+
+        Args:
+            prompt_id: The prompt ID
+            limit: Maximum number of entries
+
+        Returns:
+            Entries newest first, each with "version", "entry" and "created_at"
+        """
+        try:
+            object_id = ObjectId(prompt_id)
+            entries = [
+                {
+                    "version": doc["version"],
+                    "entry": doc.get("changelog_entry"),
+                    "created_at": doc.get("created_at"),
+                }
+                for doc in self.versions.find(
+                    {"prompt_id": object_id},
+                    {"version": 1, "changelog_entry": 1, "created_at": 1},
+                )
+                .sort("version", DESCENDING)
+                .limit(limit)
+            ]
+            remaining = limit - len(entries)
+            if remaining > 0:
+                # Entries written before versioning live in the legacy changelog array
+                legacy = self.collection.find_one(
+                    {"_id": object_id, "changelog": {"$exists": True}},
+                    {"changelog": {"$slice": -remaining}},
+                )
+                if legacy:
+                    entries.extend(
+                        {"version": None, "entry": entry, "created_at": None}
+                        for entry in reversed(legacy.get("changelog", []))
+                    )
+            return entries
+        except Exception as e:
+            logger.error(f"Failed to get changelog for prompt {prompt_id}: {e}")
+            raise
+
+    def get_prompt_version(self, prompt_id: str, version: int) -> Optional[dict]:
+        """
+        Reconstruct a past revision of a prompt template.
+
+        Args:
+            prompt_id: The prompt ID
+            version: The revision number
+
+        Returns:
+            Dictionary with "version", "prompt_template", "changelog_entry" and
+            "created_at", or None if the revision does not exist
+        """
+        try:
+            documents = list(
+                self.versions.find(
+                    {
+                        "prompt_id": ObjectId(prompt_id),
+                        "version": {"$gte": versioning.keyframe_for(version), "$lte": version},
+                    }
+                ).sort("version", 1)
+            )
+            for document in documents:
+                self.compressor.decode_document(document, ["template"])
+            if not documents or documents[-1]["version"] != version:
+                return None
+            return {
+                "version": version,
+                "prompt_template": versioning.reconstruct(documents),
+                "changelog_entry": documents[-1].get("changelog_entry"),
+                "created_at": documents[-1].get("created_at"),
+            }
+        except Exception as e:
+            logger.error(f"Failed to get version {version} of prompt {prompt_id}: {e}")
+            raise
+
+    def _vector_search_pipeline(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        num_candidates: int,
+        filters: Optional[SearchFilters] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        """Build a $vectorSearch pipeline returning `limit` scored documents."""
+        vector_stage = {
+            "index": config.MONGODB_VECTOR_INDEX,
+            "path": "embedding",
+            "queryVector": query_embedding,
+            "numCandidates": num_candidates,
+            "limit": limit,
+        }
+        # Pre-filters are evaluated inside the ANN scan so candidates are only
+        # drawn from matching documents
+        if filters and not filters.is_empty():
+            vector_stage["filter"] = filters.to_query()
+
+        if projection is None:
+            projection = SEARCH_PROJECTION
+        return [
+            {"$vectorSearch": vector_stage},
+            {"$project": {**projection, "score": {"$meta": "vectorSearchScore"}}},
+        ]
+
     def vector_search(
-        self, query_embedding: List[float], limit: int = 5, score_threshold: float = 0.0
+        self,
+        query_embedding: List[float],
+        limit: int = 5,
+        score_threshold: float = 0.0,
+        filters: Optional[SearchFilters] = None,
+        recall: Optional[float] = None,
     ) -> List[dict]:
         """
         Perform vector search on prompts.
 
+        The score threshold is applied after the approximate search, so when it is set
+        the search over-fetches and refills until `limit` results pass the threshold or
+        the remaining candidates score below it. With LOCAL_VECTOR_INDEX_ENABLED the
+        search is exact and served from the in-process index.
+
         Args:
             query_embedding: Query embedding vector
             limit: Maximum number of results
             score_threshold: Minimum similarity score
+            filters: Optional use_case/created_by/updated_after pre-filters
+            recall: Optional target recall overriding VECTOR_SEARCH_RECALL
 
         Returns:
             List of matching prompts with scores
         """
         try:
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "vector_index",
-                        "path": "embedding",
-                        "queryVector": query_embedding,
-                        "numCandidates": limit * 10,
-                        "limit": limit,
-                    }
-                },
-                {
-                    "$project": {
-                        "_id": 1,
-                        "use_case": 1,
-                        "summary": 1,
-                        "prompt_template": 1,
-                        "history": 1,
-                        "last_updated": 1,
-                        "score": {"$meta": "vectorSearchScore"},
-                    }
-                },
-                {"$match": {"score": {"$gte": score_threshold}}},
-            ]
-            results = list(self.collection.aggregate(pipeline))
+            if config.LOCAL_VECTOR_INDEX_ENABLED:
+                return self.get_local_index().search(
+                    query_embedding, limit, score_threshold=score_threshold, filters=filters
+                )
+            fetch = limit * config.VECTOR_SEARCH_OVERFETCH if score_threshold > 0 else limit
+            fetch = min(fetch, search_tuning.MAX_NUM_CANDIDATES)
+            results: List[dict] = []
+            for _ in range(config.VECTOR_SEARCH_MAX_REFILLS + 1):
+                pipeline = self._vector_search_pipeline(
+                    query_embedding,
+                    fetch,
+                    search_tuning.num_candidates(fetch, recall),
+                    filters,
+                )
+                raw = list(self.collection.aggregate(pipeline))
+                results = [r for r in raw if r.get("score", 0.0) >= score_threshold]
+                exhausted = len(raw) < fetch or fetch >= search_tuning.MAX_NUM_CANDIDATES
+                # Results come back in descending score order, so once the last one
+                # misses the threshold no deeper candidate can pass it
+                below_threshold = bool(raw) and raw[-1].get("score", 0.0) < score_threshold
+                if len(results) >= limit or exhausted or below_threshold:
+                    break
+                fetch = min(fetch * 2, search_tuning.MAX_NUM_CANDIDATES)
+                logger.info(f"Refilling vector search with limit {fetch}")
+
+            results = results[:limit]
             # Convert ObjectId to string
             for result in results:
                 result["_id"] = str(result["_id"])
+                self.compressor.decode_document(result)
             return results
-        except Exception as e:
+        except OperationFailure as e:
             logger.error(f"Vector search failed: {e}")
-            # Fallback to text search if vector search index doesn't exist
-            logger.warning("Falling back to text search")
-            return self._text_search_fallback(query_embedding, limit)
+            raise
+
+    def _build_local_index(self) -> LocalVectorIndex:
+        """Load a new in-process vector index searching the active embedding model."""
+        from prompt_saver_mcp.embeddings.client import embedding_client
+
+        index = LocalVectorIndex(
+            config.EMBEDDING_DIMENSIONS, self.compressor, model_id=embedding_client.model_id
+        )
+        index.load(self.collection)
+        return index
+
+    def get_local_index(self) -> LocalVectorIndex:
+        """Get the in-process vector index, loading all prompts on first use."""
+        if self.local_index is None:
+            with self._local_index_lock:
+                if self.local_index is None:
+                    self.local_index = self._build_local_index()
+        return self.local_index
+
+    def reload_local_index(self) -> Optional[LocalVectorIndex]:
+        """
+        Rebuild the in-process vector index from the collection, if it is loaded.
+
+        Searches keep using the previous index until the new one is complete.
 
-    def _text_search_fallback(self, query_embedding: List[float], limit: int) -> List[dict]:
-        """Fallback text search when vector search is not available."""
-        # Simple text search on summary field
-        # This is a basic fallback - in production you might want more sophisticated text search
+        Returns:
+            The new index, or None when no index was loaded
+        """
+        if self.local_index is None:
+            return None
+        index = self._build_local_index()
+        with self._local_index_lock:
+            self.local_index = index
+        return index
+
+    def calibrate_vector_search(
+        self, k: int = 5, sample_size: int = 20, multipliers: Optional[List[int]] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Measure recall@k of $vectorSearch against exact brute-force search on stored prompts.
+
+        Args:
+            k: Number of results compared
+            sample_size: Number of stored embeddings used as queries
+            multipliers: numCandidates multipliers to evaluate
+
+        Returns:
+            One row per multiplier with mean recall and latency
+        """
+
+        def approximate(query: List[float], limit: int, candidates: int) -> List[Any]:
+            pipeline = self._vector_search_pipeline(
+                query, limit, candidates, projection={"_id": 1}
+            )
+            return [doc["_id"] for doc in self.collection.aggregate(pipeline)]
+
+        try:
+            documents = list(
+                self.collection.find({"embedding": {"$ne": None}}, {"_id": 1, "embedding": 1})
+            )
+            kwargs = {"k": k, "sample_size": sample_size}
+            if multipliers:
+                kwargs["multipliers"] = multipliers
+            return search_tuning.calibrate_recall(documents, approximate, **kwargs)
+        except OperationFailure as e:
+            logger.error(f"Vector search calibration failed: {e}")
+            raise
+
+    def text_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[dict]:
+        """
+        Lexical search over summaries and templates using the text index.
+
+        Used as the degraded search path while embeddings are unavailable. Scores are
+        text relevance scores normalized to the best match (1.0), not similarities.
+
+        With COMPRESSION_ENABLED, templates and histories stored compressed are binaries the
+        text index cannot see, so those prompts match on their summary only.
+
+        Args:
+            query: Query text
+            limit: Maximum number of results
+            filters: Optional use_case/created_by/updated_after filters
+
+        Returns:
+            List of matching prompts with scores
+        """
         try:
-            results = list(self.collection.find().limit(limit))
+            match: Dict[str, Any] = {"$text": {"$search": query}}
+            if filters is not None and not filters.is_empty():
+                match = {"$and": [match, filters.to_query()]}
+            projection = {**SEARCH_PROJECTION, "score": {"$meta": "textScore"}}
+            results = list(
+                self.collection.find(match, projection)
+                .sort([("score", {"$meta": "textScore"})])
+                .limit(limit)
+            )
+            best = max((result["score"] for result in results), default=0.0) or 1.0
             for result in results:
                 result["_id"] = str(result["_id"])
-                result["score"] = 0.5  # Default score for text search
+                result["score"] = result["score"] / best
+                self.compressor.decode_document(result)
             return results
-        except Exception as e:
-            logger.error(f"Text search fallback failed: {e}")
-            return []
+        except OperationFailure as e:
+            logger.error(f"Text search failed: {e}")
+            raise
 
-    def search_by_use_case(self, use_case: str, limit: int = 10) -> List[dict]:
+    def list_by_use_case(
+        self, use_case: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
         """
-        Search prompts by use case category.
+        List one page of prompts in a use case category, newest first.
+
+        Pages are keyed on (last_updated, _id) so each page is an index range scan
+        regardless of how deep into the category it is.
 
         Args:
             use_case: The use case category
-            limit: Maximum number of results
+            limit: Maximum number of results per page
+            cursor: Continuation token returned by the previous page
 
         Returns:
-            List of prompts matching the use case
+            Tuple of (projected prompts, next cursor or None on the last page)
         """
         try:
+            query = {"use_case": use_case, **pagination.keyset_filter(cursor)}
+            # Fetch one extra document to learn whether another page exists
             results = list(
-                self.collection.find({"use_case": use_case})
-                .sort("last_updated", -1)
-                .limit(limit)
+                self.collection.find(query, LISTING_PROJECTION)
+                .sort([("last_updated", DESCENDING), ("_id", DESCENDING)])
+                .limit(limit + 1)
             )
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                last = results[-1]
+                next_cursor = pagination.encode_cursor(last["last_updated"], last["_id"])
             for result in results:
                 result["_id"] = str(result["_id"])
-            return results
+            return results, next_cursor
+        except Exception as e:
+            logger.error(f"Failed to list prompts for use case {use_case}: {e}")
+            raise
+
+    def migrate_compression(
+        self, batch_size: int = 100, train_dictionary: bool = False, sample_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Compress large text fields of documents written before compression was enabled.
+
+        Each rewrite only matches while the fields still hold the text that was read, so a
+        prompt updated during the migration keeps its update and is counted as skipped.
+        Rewrites stamp modified_at (see MODIFIED_AT) rather than last_updated.
+
+        Args:
+            batch_size: Number of updates sent per bulk write
+            train_dictionary: Train a zstd dictionary on existing templates first
+            sample_size: Number of documents sampled for dictionary training
+
+        Returns:
+            Counts of scanned, rewritten and skipped documents
+        """
+        try:
+            if train_dictionary:
+                samples = [
+                    text
+                    for doc in self.collection.aggregate(
+                        [
+                            {"$match": {"prompt_template": {"$type": "string"}}},
+                            {"$sample": {"size": sample_size}},
+                            {"$project": {field: 1 for field in COMPRESSED_FIELDS}},
+                        ]
+                    )
+                    for text in (doc.get(field) for field in COMPRESSED_FIELDS)
+                    if isinstance(text, str)
+                ]
+                self.compressor.train_dictionary(samples)
+
+            scanned, rewritten, skipped, batch = 0, 0, 0, []
+
+            def flush() -> None:
+                nonlocal rewritten, skipped
+                result = self.collection.bulk_write(batch, ordered=False)
+                rewritten += result.modified_count
+                skipped += len(batch) - result.matched_count
+                batch.clear()
+
+            uncompressed = {"$or": [{f: {"$type": "string"}} for f in COMPRESSED_FIELDS]}
+            projection = {field: 1 for field in COMPRESSED_FIELDS}
+            for document in self.collection.find(uncompressed, projection):
+                scanned += 1
+                encoded = self.compressor.encode_document(
+                    {k: v for k, v in document.items() if k != "_id"}
+                )
+                changed = {k: v for k, v in encoded.items() if not isinstance(v, str)}
+                if changed:
+                    # Compare-and-set on the text that was read
+                    match = {"_id": document["_id"], **{k: document[k] for k in changed}}
+                    stamp = {MODIFIED_AT: datetime.utcnow()}
+                    batch.append(UpdateOne(match, {"$set": {**changed, **stamp}}))
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+            logger.info(
+                f"Compression migration rewrote {rewritten} of {scanned} documents "
+                f"({skipped} changed concurrently and skipped)"
+            )
+            return {"scanned": scanned, "rewritten": rewritten, "skipped": skipped}
+        except OperationFailure as e:
+            logger.error(f"Compression migration failed: {e}")
+            raise
+
+    def reembed_prompts(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        model_id: str,
+        batch_size: int = 64,
+    ) -> Dict[str, int]:
+        """
+        Re-embed the summaries of prompts embedded by a different model.
+
+        Embeddings of different models are not comparable, so after switching the
+        embedding provider every stored prompt has to be re-embedded. Rewrites stamp
+        modified_at (see MODIFIED_AT) rather than last_updated.
+
+        Args:
+            embed_batch: Embeds a batch of summaries
+            model_id: Model ID of embed_batch, stored as embedding_model
+            batch_size: Summaries embedded and updated per batch
+
+        Returns:
+            Counts of scanned, rewritten and skipped documents
+        """
+
+        def flush(documents: List[dict]) -> int:
+            embeddings = embed_batch([doc["summary"] for doc in documents])
+            updates = [
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {
+                            "embedding": embedding,
+                            "embedding_model": model_id,
+                            MODIFIED_AT: datetime.utcnow(),
+                        }
+                    },
+                )
+                for doc, embedding in zip(documents, embeddings)
+            ]
+            return self.collection.bulk_write(updates, ordered=False).modified_count
+
+        try:
+            scanned, rewritten, batch = 0, 0, []
+            stale = {"embedding_model": {"$ne": model_id}}
+            for document in self.collection.find(stale, {"summary": 1}):
+                scanned += 1
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    rewritten += flush(batch)
+                    batch = []
+            if batch:
+                rewritten += flush(batch)
+            logger.info(f"Re-embedded {rewritten} of {scanned} prompts with {model_id}")
+            return {"scanned": scanned, "rewritten": rewritten}
+        except OperationFailure as e:
+            logger.error(f"Re-embedding failed: {e}")
+            raise
+
+    def get_labeled_embeddings(
+        self, model_id: str
+    ) -> Tuple[List[str], List[List[float]], List[str]]:
+        """
+        Read the use case and embedding of every prompt embedded by a model.
+
+        Args:
+            model_id: Embedding model ID, e.g. local/hash-ngram-v1-3-5-2048
+
+        Returns:
+            Tuple of (prompt IDs, embeddings, use cases)
+        """
+        try:
+            prompt_ids, embeddings, labels = [], [], []
+            query = {"embedding_model": model_id, "embedding": {"$ne": None}}
+            for document in self.collection.find(query, {"use_case": 1, "embedding": 1}):
+                prompt_ids.append(str(document["_id"]))
+                embeddings.append(document["embedding"])
+                labels.append(document.get("use_case"))
+            return prompt_ids, embeddings, labels
+        except OperationFailure as e:
+            logger.error(f"Failed to read labeled embeddings: {e}")
+            raise
+
+    def set_use_cases(self, use_cases: Dict[str, str]) -> int:
+        """
+        Relabel prompts in bulk.
+
+        A label is metadata rather than template content, so no revision is recorded, the
+        version is unchanged and modified_at (see MODIFIED_AT) is stamped instead of
+        last_updated.
+
+        Args:
+            use_cases: New use case by prompt ID
+
+        Returns:
+            Number of prompts modified
+        """
+        if not use_cases:
+            return 0
+        now = datetime.utcnow()
+        try:
+            updates = [
+                UpdateOne(
+                    {"_id": ObjectId(prompt_id)},
+                    {"$set": {"use_case": use_case, MODIFIED_AT: now}},
+                )
+                for prompt_id, use_case in use_cases.items()
+            ]
+            modified = self.collection.bulk_write(updates, ordered=False).modified_count
+            if self.local_index is not None:
+                for prompt_id, use_case in use_cases.items():
+                    self.local_index.apply_update(prompt_id, {"use_case": use_case})
+            logger.info(f"Relabeled {modified} prompts")
+            return modified
+        except OperationFailure as e:
+            logger.error(f"Failed to relabel prompts: {e}")
+            raise
+
+    def ensure_indexes(self) -> Dict[str, Any]:
+        """
+        Create the compound and vector search indexes if they are missing.
+
+        Returns:
+            Dictionary describing the ensured indexes
+        """
+        try:
+            return indexes.ensure_indexes(self.collection, self.versions)
+        except OperationFailure as e:
+            logger.error(f"Failed to ensure indexes: {e}")
+            raise
+
+    def index_diagnostics(self, sample_value: str = "general") -> Dict[str, Any]:
+        """
+        Report existing indexes and the query plans of listing queries.
+
+        Args:
+            sample_value: Value used for the equality predicates in explained queries
+
+        Returns:
+            Dictionary with index names and explained plans
+        """
+        try:
+            try:
+                search_indexes = [idx.get("name") for idx in self.collection.list_search_indexes()]
+            except OperationFailure:
+                search_indexes = []
+            return {
+                "indexes": list(self.collection.index_information().keys()),
+                "search_indexes": search_indexes,
+                "plans": indexes.explain_query_plans(self.collection, sample_value),
+            }
         except Exception as e:
-            logger.error(f"Failed to search by use case {use_case}: {e}")
+            logger.error(f"Failed to collect index diagnostics: {e}")
             raise
 
     def close(self) -> None:
@@ -0,0 +1,70 @@
+"""Opaque keyset-pagination cursors for listing queries."""
+
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def encode_cursor(last_updated: datetime, document_id: Any) -> str:
+    """
+    Encode the sort key of the last returned document as an opaque token.
+
+    Args:
+        last_updated: The document's last_updated value (naive UTC, as stored)
+        document_id: The document's _id
+
+    Returns:
+        URL-safe continuation token
+    """
+    if last_updated.tzinfo is not None:
+        last_updated = last_updated.replace(tzinfo=None) - last_updated.utcoffset()
+    # MongoDB stores datetimes with millisecond precision, so milliseconds round-trip exactly
+    millis = (last_updated - _EPOCH) // timedelta(milliseconds=1)
+    payload = json.dumps({"t": millis, "id": str(document_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a continuation token produced by encode_cursor.
+
+    Args:
+        cursor: The continuation token
+
+    Returns:
+        Tuple of (last_updated, _id) of the last document of the previous page
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _EPOCH + timedelta(milliseconds=int(payload["t"])), ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_filter(cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the query clause selecting documents after the cursor in
+    (last_updated desc, _id desc) order.
+
+    Args:
+        cursor: Optional continuation token
+
+    Returns:
+        Query clause, empty for the first page
+    """
+    if not cursor:
+        return {}
+    last_updated, document_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"last_updated": {"$lt": last_updated}},
+            {"last_updated": last_updated, "_id": {"$lt": document_id}},
+        ]
+    }
@@ -0,0 +1,201 @@
+"""Compact in-memory prompt representation for caches and indexes."""
+
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import bson
+from bson.raw_bson import RawBSONDocument
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; array('f') is used when it is missing
+    np = None
+
+# Fields kept as attributes because filters read them for every candidate
+FILTER_FIELDS = ("use_case", "created_by", "last_updated")
+
+
+class EmbeddingStore:
+    """
+    Float32 embedding rows in one contiguous buffer shared by many records.
+
+    A 2048-dimension embedding takes 8 KB here instead of ~65 KB as a list of Python
+    floats. Uses a numpy matrix when numpy is installed and a flat array('f') otherwise.
+    Rows freed by remove() are reused by later adds.
+    """
+
+    def __init__(self, dimensions: int, capacity: int = 64):
+        """
+        Initialize the store.
+
+        Args:
+            dimensions: Embedding dimensions
+            capacity: Initial number of rows allocated
+        """
+        self.dimensions = dimensions
+        self._size = 0
+        self._free: List[int] = []
+        if np is not None:
+            self._matrix = np.zeros((max(1, capacity), dimensions), dtype=np.float32)
+        else:
+            self._data = array("f")
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for embedding data."""
+        if np is not None:
+            return self._matrix.nbytes
+        return self._data.itemsize * len(self._data)
+
+    def _check(self, vector: Sequence[float]) -> None:
+        if len(vector) != self.dimensions:
+            raise ValueError(
+                f"Embedding has {len(vector)} dimensions, expected {self.dimensions}"
+            )
+
+    def add(self, vector: Sequence[float]) -> int:
+        """
+        Store an embedding.
+
+        Args:
+            vector: The embedding
+
+        Returns:
+            Row number of the stored embedding
+        """
+        self._check(vector)
+        if self._free:
+            row = self._free.pop()
+            self.set(row, vector)
+            return row
+        row = self._size
+        if np is not None:
+            if row == len(self._matrix):
+                grown = np.zeros((len(self._matrix) * 2, self.dimensions), dtype=np.float32)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._matrix[row] = vector
+        else:
+            self._data.extend(array("f", vector))
+        self._size += 1
+        return row
+
+    def set(self, row: int, vector: Sequence[float]) -> None:
+        """Overwrite the embedding in a row."""
+        self._check(vector)
+        if np is not None:
+            self._matrix[row] = vector
+        else:
+            start = row * self.dimensions
+            self._data[start : start + self.dimensions] = array("f", vector)
+
+    def remove(self, row: int) -> None:
+        """Free a row for reuse."""
+        self.set(row, [0.0] * self.dimensions)
+        self._free.append(row)
+
+    def get(self, row: int) -> List[float]:
+        """Return the embedding in a row as a list of floats."""
+        if np is not None:
+            return self._matrix[row].tolist()
+        start = row * self.dimensions
+        return self._data[start : start + self.dimensions].tolist()
+
+    def dot(self, query: Sequence[float], rows: Sequence[int]) -> List[float]:
+        """
+        Dot products of a query with the given rows.
+
+        Args:
+            query: Query embedding
+            rows: Row numbers to score
+
+        Returns:
+            One score per row, in order
+        """
+        self._check(query)
+        if not rows:
+            return []
+        if np is not None:
+            scores = self._matrix[np.asarray(rows)] @ np.asarray(query, dtype=np.float32)
+            return scores.tolist()
+        scores = []
+        for row in rows:
+            start = row * self.dimensions
+            vector = self._data[start : start + self.dimensions]
+            scores.append(sum(a * b for a, b in zip(query, vector)))
+        return scores
+
+
+class PromptRecord:
+    """
+    A prompt held in memory with its text fields left as raw BSON.
+
+    Text fields are decoded only when read (and compressed fields stay compressed until
+    then), the embedding lives in a shared EmbeddingStore row, and only the fields used
+    by filters are kept as attributes.
+    """
+
+    __slots__ = ("prompt_id", "use_case", "created_by", "last_updated", "row", "_raw")
+
+    def __init__(
+        self,
+        prompt_id: str,
+        raw: bytes,
+        row: Optional[int] = None,
+        use_case: Optional[str] = None,
+        created_by: Optional[str] = None,
+        last_updated: Optional[datetime] = None,
+    ):
+        """
+        Initialize the record.
+
+        Args:
+            prompt_id: The prompt ID
+            raw: BSON of the stored fields except _id and embedding
+            row: EmbeddingStore row of the embedding, if it has one
+            use_case: Use case category
+            created_by: Creator identifier
+            last_updated: Last update timestamp
+        """
+        self.prompt_id = prompt_id
+        self.row = row
+        self.use_case = use_case
+        self.created_by = created_by
+        self.last_updated = last_updated
+        self._raw = raw
+
+    @classmethod
+    def from_document(
+        cls, document: Mapping[str, Any], row: Optional[int] = None
+    ) -> "PromptRecord":
+        """
+        Build a record from a stored document (dict or RawBSONDocument).
+
+        The document's embedding is ignored; store it with EmbeddingStore.add and pass
+        the row.
+        """
+        fields = {k: v for k, v in document.items() if k not in ("_id", "embedding")}
+        return cls(
+            str(document["_id"]),
+            bson.encode(fields),
+            row=row,
+            use_case=fields.get("use_case"),
+            created_by=fields.get("created_by"),
+            last_updated=fields.get("last_updated"),
+        )
+
+    def fields(self) -> Dict[str, Any]:
+        """Decode the stored fields (compressed values are returned as stored)."""
+        return dict(RawBSONDocument(self._raw).items())
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Decode a single stored field."""
+        return RawBSONDocument(self._raw).get(field, default)
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the record itself (excluding its embedding row)."""
+        return object.__sizeof__(self) + len(self._raw)
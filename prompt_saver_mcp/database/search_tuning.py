@@ -0,0 +1,127 @@
+"""Recall/latency tuning for approximate vector search."""
+
+import heapq
+import logging
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database.records import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+# Atlas rejects numCandidates above this value
+MAX_NUM_CANDIDATES = 10000
+
+# Default numCandidates multipliers (relative to the requested limit) needed to reach a
+# target recall@k. Run scripts/calibrate_search.py to measure the real curve for your data
+# and pin a multiplier with VECTOR_SEARCH_CANDIDATE_MULTIPLIER.
+RECALL_MULTIPLIERS = [
+    (0.80, 5),
+    (0.90, 10),
+    (0.95, 20),
+    (0.98, 50),
+    (0.99, 100),
+]
+
+
+def candidate_multiplier(recall: Optional[float] = None) -> int:
+    """
+    Map a target recall to a numCandidates multiplier.
+
+    Args:
+        recall: Target recall in (0, 1]; defaults to VECTOR_SEARCH_RECALL
+
+    Returns:
+        Multiplier applied to the result limit
+    """
+    if recall is None:
+        if config.VECTOR_SEARCH_CANDIDATE_MULTIPLIER > 0:
+            return config.VECTOR_SEARCH_CANDIDATE_MULTIPLIER
+        recall = config.VECTOR_SEARCH_RECALL
+    for target, multiplier in RECALL_MULTIPLIERS:
+        if recall <= target:
+            return multiplier
+    return RECALL_MULTIPLIERS[-1][1] * 2
+
+
+def num_candidates(limit: int, recall: Optional[float] = None) -> int:
+    """
+    Compute numCandidates for a $vectorSearch returning `limit` results.
+
+    Args:
+        limit: Number of results the stage returns
+        recall: Optional target recall overriding the configured one
+
+    Returns:
+        numCandidates, clamped to the Atlas maximum
+    """
+    return max(limit, min(limit * candidate_multiplier(recall), MAX_NUM_CANDIDATES))
+
+
+def _exact_top_k(
+    query: Sequence[float], ids: List[Any], store: EmbeddingStore, rows: List[int], k: int
+) -> List[Any]:
+    """Brute-force top-k by dot product."""
+    scores = store.dot(query, rows)
+    top = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+    return [ids[i] for i in top]
+
+
+def calibrate_recall(
+    documents: List[Dict[str, Any]],
+    approximate_search: Callable[[List[float], int, int], List[Any]],
+    k: int = 5,
+    sample_size: int = 20,
+    multipliers: Sequence[int] = (1, 2, 5, 10, 20, 50, 100),
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """
+    Measure recall@k of approximate search against exact brute-force search.
+
+    Args:
+        documents: Documents with "_id" and "embedding"; a sample of them is used as queries
+        approximate_search: Callable (query, limit, num_candidates) -> list of result IDs
+        k: Number of results compared
+        sample_size: Number of query vectors sampled from the documents
+        multipliers: numCandidates multipliers to evaluate
+        seed: Random seed for query sampling
+
+    Returns:
+        One row per multiplier with mean recall and mean/p95 latency in milliseconds
+    """
+    documents = [d for d in documents if d.get("embedding")]
+    if not documents:
+        raise ValueError("No documents with embeddings to calibrate against")
+
+    ids = [d["_id"] for d in documents]
+    store = EmbeddingStore(len(documents[0]["embedding"]), capacity=len(documents))
+    store_rows = [store.add(d["embedding"]) for d in documents]
+
+    queries = random.Random(seed).sample(documents, min(sample_size, len(documents)))
+    truths = [set(_exact_top_k(q["embedding"], ids, store, store_rows, k)) for q in queries]
+
+    results = []
+    for multiplier in multipliers:
+        candidates = min(k * multiplier, MAX_NUM_CANDIDATES)
+        recalls, latencies = [], []
+        for query, truth in zip(queries, truths):
+            start = time.perf_counter()
+            found = approximate_search(query["embedding"], k, candidates)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(truth.intersection(found)) / len(truth))
+        latencies.sort()
+        p95_index = min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)
+        results.append(
+            {
+                "multiplier": multiplier,
+                "num_candidates": candidates,
+                "recall": sum(recalls) / len(recalls),
+                "mean_ms": sum(latencies) / len(latencies),
+                "p95_ms": latencies[p95_index],
+            }
+        )
+        logger.info(f"multiplier={multiplier} recall@{k}={results[-1]['recall']:.3f}")
+    return results
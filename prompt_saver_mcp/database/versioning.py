@@ -0,0 +1,120 @@
+"""Delta-compressed prompt template revisions."""
+
+import difflib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Every KEYFRAME_INTERVAL-th revision stores the full template so reconstructing any
+# revision replays at most KEYFRAME_INTERVAL - 1 deltas
+KEYFRAME_INTERVAL = 10
+
+
+def is_keyframe(version: int) -> bool:
+    """Return True if the revision stores the full template."""
+    return version % KEYFRAME_INTERVAL == 1
+
+
+def keyframe_for(version: int) -> int:
+    """Return the keyframe revision a revision is reconstructed from."""
+    return ((version - 1) // KEYFRAME_INTERVAL) * KEYFRAME_INTERVAL + 1
+
+
+def compute_delta(base: str, target: str) -> List[List[Any]]:
+    """
+    Compute a line-based delta that turns `base` into `target`.
+
+    Args:
+        base: The previous template
+        target: The new template
+
+    Returns:
+        List of ops: ["c", start, end] copies base lines, ["i", text] inserts text
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    delta: List[List[Any]] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(["c", i1, i2])
+        elif j2 > j1:
+            delta.append(["i", "".join(target_lines[j1:j2])])
+    return delta
+
+
+def apply_delta(base: str, delta: List[List[Any]]) -> str:
+    """
+    Apply a delta produced by compute_delta.
+
+    Args:
+        base: The previous template
+        delta: The delta ops
+
+    Returns:
+        The reconstructed template
+    """
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in delta:
+        if op[0] == "c":
+            parts.append("".join(base_lines[op[1] : op[2]]))
+        else:
+            parts.append(op[1])
+    return "".join(parts)
+
+
+def build_version_document(
+    prompt_id: Any,
+    version: int,
+    previous_template: Optional[str],
+    template: str,
+    changelog_entry: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Build the stored document for one template revision.
+
+    Args:
+        prompt_id: The prompt's ObjectId
+        version: The revision number
+        previous_template: Template of the previous revision (None for the first one)
+        template: Template of this revision
+        changelog_entry: Description of the change
+
+    Returns:
+        Document for the prompt_versions collection
+    """
+    document: Dict[str, Any] = {
+        "prompt_id": prompt_id,
+        "version": version,
+        "changelog_entry": changelog_entry,
+        "created_at": datetime.utcnow(),
+    }
+    if previous_template is None or is_keyframe(version):
+        document["template"] = template
+    elif template == previous_template:
+        # Unchanged template: nothing to store
+        document["delta"] = None
+    else:
+        document["delta"] = compute_delta(previous_template, template)
+    return document
+
+
+def reconstruct(version_documents: List[Dict[str, Any]]) -> str:
+    """
+    Reconstruct a template from its keyframe and the following deltas.
+
+    Args:
+        version_documents: Revision documents in ascending version order, starting at a keyframe
+
+    Returns:
+        The template of the last revision
+    """
+    if not version_documents or "template" not in version_documents[0]:
+        raise ValueError("Revision chain must start with a full template")
+    template = version_documents[0]["template"]
+    for document in version_documents[1:]:
+        if "template" in document:
+            template = document["template"]
+        elif document.get("delta") is not None:
+            template = apply_delta(template, document["delta"])
+    return template
@@ -0,0 +1,51 @@
+"""Embedding provider interface."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List
+
+from prompt_saver_mcp.utils.deadlines import within_deadline
+
+
+class EmbeddingProvider(ABC):
+    """
+    Turns texts into embedding vectors.
+
+    Providers implement the synchronous embed_batch. Network-bound providers also
+    override embed_batch_async so a cancelled tool call aborts the request; the default
+    runs embed_batch in a worker thread within the call's deadline.
+    """
+
+    @property
+    @abstractmethod
+    def model_id(self) -> str:
+        """Identifier of the model, stored with every embedding it produces."""
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Number of dimensions of the produced vectors."""
+
+    @abstractmethod
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per text, in order
+        """
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a single text."""
+        return self.embed_batch([text])[0]
+
+    async def embed_batch_async(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts without blocking the event loop."""
+        return await within_deadline(asyncio.to_thread(self.embed_batch, texts), "embed")
+
+    async def embed_async(self, text: str) -> List[float]:
+        """Embed a single text without blocking the event loop."""
+        return (await self.embed_batch_async([text]))[0]
@@ -0,0 +1,296 @@
+"""Nearest-centroid use case classifier over stored prompt embeddings."""
+
+import asyncio
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.llm.openai_client import USE_CASES
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; pure Python is used when it is missing
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class UseCaseClassifier:
+    """
+    Labels prompts by the use case whose centroid is closest to their summary embedding.
+
+    The model is a running sum of embeddings per label, so training is one pass over the
+    stored prompts, new labeled prompts are added in O(dimensions), and prediction for a
+    batch is a single (batch x labels) matrix product. Embeddings are unit length, so the
+    cosine similarity to a centroid is the dot product with the normalized label sum.
+    """
+
+    def __init__(
+        self, dimensions: int, labels: Sequence[str] = USE_CASES, min_examples: int = 5
+    ):
+        """
+        Initialize an untrained classifier.
+
+        Args:
+            dimensions: Embedding dimensions
+            labels: Labels the classifier can predict
+            min_examples: Examples a label needs before it is predicted
+        """
+        self.dimensions = dimensions
+        self.labels = list(labels)
+        self.min_examples = min_examples
+        self._label_index = {label: i for i, label in enumerate(self.labels)}
+        self._counts = [0] * len(self.labels)
+        if np is not None:
+            self._sums = np.zeros((len(self.labels), dimensions), dtype=np.float64)
+        else:
+            self._sums = [[0.0] * dimensions for _ in self.labels]
+        self._lock = threading.Lock()
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Training examples per label."""
+        return dict(zip(self.labels, self._counts))
+
+    @property
+    def ready(self) -> bool:
+        """Whether at least two labels have enough examples to tell apart."""
+        return sum(1 for count in self._counts if count >= self.min_examples) >= 2
+
+    @property
+    def complete(self) -> bool:
+        """Whether every label has enough examples, so any label can be predicted."""
+        return all(count >= self.min_examples for count in self._counts)
+
+    def add(self, embedding: Sequence[float], label: str) -> bool:
+        """
+        Add one labeled example.
+
+        Args:
+            embedding: Summary embedding
+            label: Its use case
+
+        Returns:
+            False if the label or embedding cannot be used
+        """
+        i = self._label_index.get(label)
+        if i is None or not embedding or len(embedding) != self.dimensions:
+            return False
+        with self._lock:
+            self._counts[i] += 1
+            if np is not None:
+                self._sums[i] += np.asarray(embedding, dtype=np.float64)
+            else:
+                row = self._sums[i]
+                for d, value in enumerate(embedding):
+                    row[d] += value
+        return True
+
+    def fit(self, embeddings: Sequence[Sequence[float]], labels: Sequence[str]) -> Dict[str, int]:
+        """
+        Add labeled examples in bulk.
+
+        Args:
+            embeddings: Summary embeddings
+            labels: Use case of each embedding
+
+        Returns:
+            Training examples per label
+        """
+        for embedding, label in zip(embeddings, labels):
+            self.add(embedding, label)
+        return self.counts
+
+    def _usable(self) -> List[bool]:
+        return [count >= self.min_examples for count in self._counts]
+
+    def _similarities(self, embeddings: Sequence[Sequence[float]]) -> List[List[float]]:
+        """Cosine similarity of each embedding to each centroid (-inf for unusable labels)."""
+        usable = self._usable()
+        if np is not None:
+            with self._lock:
+                sums = self._sums.copy()
+            norms = np.linalg.norm(sums, axis=1)
+            norms[norms == 0] = 1.0
+            sims = np.asarray(embeddings, dtype=np.float64) @ (sums / norms[:, None]).T
+            sims[:, ~np.asarray(usable)] = -np.inf
+            return sims.tolist()
+        with self._lock:
+            centroids = []
+            for row, ok in zip(self._sums, usable):
+                norm = math.sqrt(sum(v * v for v in row)) or 1.0
+                centroids.append([v / norm for v in row] if ok else None)
+        return [
+            [
+                sum(a * b for a, b in zip(embedding, c)) if c is not None else -math.inf
+                for c in centroids
+            ]
+            for embedding in embeddings
+        ]
+
+    def _ranked(self, sims: List[float]) -> Tuple[str, float]:
+        """Best label and its margin over the runner-up."""
+        order = sorted(range(len(sims)), key=sims.__getitem__, reverse=True)
+        best, second = sims[order[0]], sims[order[1]]
+        if second == -math.inf:
+            return self.labels[order[0]], 1.0
+        return self.labels[order[0]], best - second
+
+    def predict(self, embeddings: Sequence[Sequence[float]]) -> List[Tuple[str, float]]:
+        """
+        Label a batch of embeddings.
+
+        Args:
+            embeddings: Summary embeddings
+
+        Returns:
+            (use case, margin) per embedding; the margin is the cosine similarity gap to
+            the second-closest centroid, so small margins mean an ambiguous prompt
+        """
+        if not self.ready:
+            raise ValueError(f"Use case classifier is not trained: {self.counts}")
+        if not len(embeddings):
+            return []
+        return [self._ranked(sims) for sims in self._similarities(embeddings)]
+
+    def leave_one_out(
+        self, embeddings: Sequence[Sequence[float]], labels: Sequence[str]
+    ) -> List[Tuple[str, float]]:
+        """
+        Predict each training example with itself removed from its own label's centroid.
+
+        This is the honest accuracy estimate for auditing stored labels: a prompt does not
+        vote for its own label. Without numpy it falls back to predict().
+
+        Args:
+            embeddings: Embeddings the classifier was trained on
+            labels: Their stored use cases
+
+        Returns:
+            (use case, margin) per embedding
+        """
+        if not self.ready:
+            raise ValueError(f"Use case classifier is not trained: {self.counts}")
+        if np is None:
+            return self.predict(embeddings)
+        if not len(embeddings):
+            return []
+        with self._lock:
+            sums = self._sums.copy()
+            counts = np.asarray(self._counts)
+        usable = counts >= self.min_examples
+        x = np.asarray(embeddings, dtype=np.float64)
+        norms = np.linalg.norm(sums, axis=1)
+        norms[norms == 0] = 1.0
+        dots = x @ sums.T
+        sims = dots / norms
+        rows = np.arange(len(x))
+        own = np.array([self._label_index.get(label, -1) for label in labels])
+        known = own >= 0
+        # Own centroid without the example: x.(s - x) / |s - x|
+        s_x = dots[rows[known], own[known]]
+        x_x = np.einsum("ij,ij->i", x[known], x[known])
+        s_s = norms[own[known]] ** 2
+        held_out = np.sqrt(np.maximum(s_s - 2 * s_x + x_x, 1e-12))
+        sims[rows[known], own[known]] = (s_x - x_x) / held_out
+        held_out_usable = np.tile(usable, (len(x), 1))
+        held_out_usable[rows[known], own[known]] = counts[own[known]] - 1 >= self.min_examples
+        sims[~held_out_usable] = -np.inf
+        return [self._ranked(row) for row in sims.tolist()]
+
+
+# Stored when neither the classifier nor the LLM provides a valid use case
+FALLBACK_USE_CASE = "general"
+
+
+def choose_use_case(
+    classifier: Optional[UseCaseClassifier],
+    embedding: Optional[Sequence[float]],
+    llm_use_case: Optional[str],
+    train: bool = True,
+) -> str:
+    """
+    Pick the use case stored for a prompt.
+
+    A complete classifier's prediction wins. Until every label has enough examples the
+    classifier could never predict the missing ones, so the LLM's label is used and, with
+    train, added to the classifier. A missing or invalid LLM label (None) is predicted by
+    a ready classifier, or becomes FALLBACK_USE_CASE; either way it is never trained on.
+
+    Args:
+        classifier: The use case classifier, if enabled
+        embedding: The prompt's summary embedding (None skips the classifier)
+        llm_use_case: Validated use case from the LLM, or None
+        train: Add the LLM's label to a classifier that is not complete yet
+
+    Returns:
+        The use case
+    """
+    if classifier is not None and embedding is not None:
+        if classifier.complete or (llm_use_case is None and classifier.ready):
+            use_case, margin = classifier.predict([embedding])[0]
+            logger.info(f"Classified prompt as {use_case} (margin {margin:.3f})")
+            return use_case
+    if llm_use_case is None:
+        return FALLBACK_USE_CASE
+    if train and classifier is not None and embedding is not None:
+        classifier.add(embedding, llm_use_case)
+    return llm_use_case
+
+
+# Global classifier instance (trained on first use)
+_classifier: Optional[UseCaseClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def train_use_case_classifier() -> Tuple[
+    UseCaseClassifier, List[str], List[List[float]], List[str]
+]:
+    """
+    Train a classifier on the stored prompts embedded by the active embedding model.
+
+    Returns:
+        The classifier and the prompt IDs, embeddings and labels it was trained on
+    """
+    from prompt_saver_mcp.database.mongodb_client import mongodb_client
+    from prompt_saver_mcp.embeddings.client import embedding_client
+
+    classifier = UseCaseClassifier(
+        embedding_client.dimension, min_examples=config.USE_CASE_CLASSIFIER_MIN_EXAMPLES
+    )
+    prompt_ids, embeddings, labels = mongodb_client.get_labeled_embeddings(
+        embedding_client.model_id
+    )
+    counts = classifier.fit(embeddings, labels)
+    logger.info(f"Trained use case classifier on {len(prompt_ids)} prompts: {counts}")
+    return classifier, prompt_ids, embeddings, labels
+
+
+def get_use_case_classifier() -> UseCaseClassifier:
+    """Get the global classifier, training it from the database on first use."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = train_use_case_classifier()[0]
+    return _classifier
+
+
+async def load_use_case_classifier() -> Optional[UseCaseClassifier]:
+    """
+    Get the global classifier when USE_CASE_CLASSIFIER_ENABLED.
+
+    Returns:
+        The classifier, or None when it is disabled or could not be trained
+    """
+    if not config.USE_CASE_CLASSIFIER_ENABLED:
+        return None
+    if _classifier is not None:
+        return _classifier
+    try:
+        return await asyncio.to_thread(get_use_case_classifier)
+    except Exception as e:
+        logger.warning(f"Use case classifier unavailable, the LLM will categorize: {e}")
+        return None
@@ -0,0 +1,192 @@
+"""Embedding client: the configured provider plus a cache of recent embeddings."""
+
+import logging
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.embeddings.base import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("voyage", "local", "onnx")
+
+
+def create_provider(name: str) -> EmbeddingProvider:
+    """
+    Create an embedding provider by name.
+
+    Args:
+        name: "voyage" (Voyage AI API), "local" (hashed character n-grams) or "onnx"
+            (local ONNX model at ONNX_EMBEDDING_MODEL_PATH)
+
+    Returns:
+        The provider
+    """
+    if name == "voyage":
+        from prompt_saver_mcp.embeddings.voyage_client import VoyageClient
+
+        return VoyageClient()
+    if name == "local":
+        from prompt_saver_mcp.embeddings.local import HashingEmbeddingProvider
+
+        return HashingEmbeddingProvider(config.EMBEDDING_DIMENSIONS)
+    if name == "onnx":
+        from prompt_saver_mcp.embeddings.local import OnnxEmbeddingProvider
+
+        if not config.ONNX_EMBEDDING_MODEL_PATH:
+            raise ValueError("ONNX_EMBEDDING_MODEL_PATH is required for the onnx provider")
+        return OnnxEmbeddingProvider(
+            config.ONNX_EMBEDDING_MODEL_PATH, threads=config.ONNX_EMBEDDING_THREADS or None
+        )
+    raise ValueError(f"Unknown embedding provider '{name}'; expected one of {PROVIDERS}")
+
+
+class EmbeddingClient:
+    """Generates embeddings with the configured provider."""
+
+    def __init__(self, provider: EmbeddingProvider):
+        """
+        Initialize the client.
+
+        Args:
+            provider: The embedding provider
+
+        Raises:
+            ValueError: If the provider's dimensions differ from EMBEDDING_DIMENSIONS
+        """
+        if provider.dimension != config.EMBEDDING_DIMENSIONS:
+            raise ValueError(
+                f"{provider.model_id} produces {provider.dimension}-dimension embeddings; "
+                f"set EMBEDDING_DIMENSIONS={provider.dimension} and rebuild the vector index"
+            )
+        self.provider = provider
+        # Recent embeddings by text (float32), reused for repeated queries and for
+        # degraded search while the provider is unavailable
+        self._cache: "OrderedDict[str, array]" = OrderedDict()
+        self.cache_size = config.QUERY_EMBEDDING_CACHE_SIZE
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the provider's model, stored with every prompt's embedding."""
+        return self.provider.model_id
+
+    @property
+    def dimension(self) -> int:
+        """Number of embedding dimensions."""
+        return self.provider.dimension
+
+    def generate_embedding(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text.
+
+        Args:
+            text: Text to generate embedding for
+
+        Returns:
+            List of floats representing the embedding vector
+        """
+        return self.generate_embeddings_batch([text])[0]
+
+    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts in batch.
+
+        Args:
+            texts: List of texts to generate embeddings for
+
+        Returns:
+            List of embedding vectors
+        """
+        try:
+            if not texts:
+                return []
+            embeddings = self.provider.embed_batch(texts)
+            self._cache_embeddings(texts, embeddings)
+            return embeddings
+        except Exception as e:
+            logger.error(f"Failed to generate batch embeddings: {e}")
+            raise
+
+    async def generate_embedding_async(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text within the current call's deadline.
+
+        Args:
+            text: Text to generate embedding for
+
+        Returns:
+            List of floats representing the embedding vector
+        """
+        embeddings = await self.generate_embeddings_batch_async([text])
+        return embeddings[0]
+
+    async def generate_embeddings_batch_async(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts within the current call's deadline.
+
+        Args:
+            texts: List of texts to generate embeddings for
+
+        Returns:
+            List of embedding vectors
+        """
+        try:
+            if not texts:
+                return []
+            embeddings = await self.provider.embed_batch_async(texts)
+            self._cache_embeddings(texts, embeddings)
+            return embeddings
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            raise
+
+    def cached_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Return the cached embedding of a text, if any.
+
+        Args:
+            text: The embedded text
+
+        Returns:
+            The embedding vector, or None if it is not cached
+        """
+        vector = self._cache.get(text)
+        if vector is None:
+            return None
+        self._cache.move_to_end(text)
+        return vector.tolist()
+
+    def _cache_embeddings(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """Remember embeddings, evicting the least recently used."""
+        if self.cache_size <= 0:
+            return
+        for text, embedding in zip(texts, embeddings):
+            self._cache[text] = array("f", embedding)
+            self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+# Global embedding client instance (lazy initialization)
+_embedding_client: Optional[EmbeddingClient] = None
+
+
+def get_embedding_client() -> EmbeddingClient:
+    """Get or create the global embedding client for EMBEDDING_PROVIDER."""
+    global _embedding_client
+    if _embedding_client is None:
+        _embedding_client = EmbeddingClient(create_provider(config.EMBEDDING_PROVIDER))
+    return _embedding_client
+
+
+# Create a simple object that delegates to get_embedding_client()
+class EmbeddingClientProxy:
+    """Proxy for lazy-loaded embedding client."""
+
+    def __getattr__(self, name):
+        return getattr(get_embedding_client(), name)
+
+
+embedding_client = EmbeddingClientProxy()
@@ -0,0 +1,162 @@
+"""Local CPU embedding providers that need no network access."""
+
+import logging
+import math
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from prompt_saver_mcp.embeddings.base import EmbeddingProvider
+
+try:
+    import numpy as np
+except ImportError:  # only needed by the ONNX provider
+    np = None
+
+try:
+    import onnxruntime
+except ImportError:  # onnxruntime is optional; install the "onnx" extra
+    onnxruntime = None
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:  # tokenizers is optional; install the "onnx" extra
+    Tokenizer = None
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Feature-hashed character n-gram embeddings.
+
+    Every word and every character n-gram of the boundary-padded word ("<csv>") is
+    hashed with CRC32 into one of `dimension` buckets with a hash-derived sign. Counts
+    are log-scaled and the vector is L2-normalized, so the dot product is cosine
+    similarity. It captures shared vocabulary and word forms rather than meaning, in
+    well under a millisecond per query and with no model files.
+    """
+
+    # Bump when the feature extraction changes, so stored vectors are re-embedded
+    VERSION = 1
+
+    def __init__(self, dimension: int, ngram_range: Tuple[int, int] = (3, 5)):
+        """
+        Initialize the provider.
+
+        Args:
+            dimension: Number of hash buckets (vector dimensions)
+            ngram_range: Smallest and largest character n-gram length
+        """
+        self._dimension = dimension
+        self.ngram_range = ngram_range
+
+    @property
+    def model_id(self) -> str:
+        low, high = self.ngram_range
+        return f"local/hash-ngram-v{self.VERSION}-{low}-{high}-{self._dimension}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def _features(self, text: str) -> Dict[int, float]:
+        """Signed bucket counts of a text's words and character n-grams."""
+        low, high = self.ngram_range
+        counts: Dict[int, float] = {}
+        for word in _WORD.findall(text.lower()):
+            padded = f"<{word}>"
+            grams = [f"w:{word}"]
+            for n in range(low, high + 1):
+                grams.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+            for gram in grams:
+                hashed = zlib.crc32(gram.encode("utf-8"))
+                bucket = hashed % self._dimension
+                sign = 1.0 if hashed & 0x80000000 else -1.0
+                counts[bucket] = counts.get(bucket, 0.0) + sign
+        return counts
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        embeddings = []
+        for text in texts:
+            vector = [0.0] * self._dimension
+            for bucket, count in self._features(text).items():
+                if count:
+                    vector[bucket] = math.copysign(1.0 + math.log(abs(count)), count)
+            norm = math.sqrt(sum(value * value for value in vector))
+            if norm:
+                vector = [value / norm for value in vector]
+            embeddings.append(vector)
+        return embeddings
+
+    async def embed_batch_async(self, texts: List[str]) -> List[List[float]]:
+        # Cheaper than a thread hop, so run inline
+        return self.embed_batch(texts)
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """
+    A sentence-embedding model exported to ONNX, run locally on CPU.
+
+    The model directory must contain model.onnx and a Hugging Face tokenizer.json
+    (e.g. an ONNX export of all-MiniLM-L6-v2). Token embeddings are mean-pooled over the
+    attention mask and L2-normalized.
+    """
+
+    def __init__(self, model_path: str, max_length: int = 256, threads: Optional[int] = None):
+        """
+        Load the model.
+
+        Args:
+            model_path: Directory containing model.onnx and tokenizer.json
+            max_length: Maximum tokens per text; longer texts are truncated
+            threads: ONNX Runtime intra-op threads (default: runtime's choice)
+        """
+        if onnxruntime is None or Tokenizer is None or np is None:
+            raise RuntimeError(
+                "onnxruntime, tokenizers and numpy are required for the onnx embedding "
+                "provider; install them with pip install 'prompt-saver-mcp[onnx]'"
+            )
+        path = Path(model_path)
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            str(path / "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = Tokenizer.from_file(str(path / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self._model_id = f"onnx/{path.name}"
+        dimension = self.session.get_outputs()[0].shape[-1]
+        # Symbolic output shapes are resolved by embedding a probe text
+        self._dimension = dimension if isinstance(dimension, int) else len(self.embed("probe"))
+        logger.info(f"Loaded ONNX embedding model {path} ({self._dimension} dimensions)")
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        output = self.session.run(None, feeds)[0]
+        if output.ndim == 3:
+            weights = mask[..., None].astype(np.float32)
+            output = (output * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        output = output / np.clip(np.linalg.norm(output, axis=1, keepdims=True), 1e-12, None)
+        return output.astype(np.float32).tolist()
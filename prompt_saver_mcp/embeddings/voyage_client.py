@@ -4,44 +4,93 @@ import logging
 from typing import List, Optional
 
 import voyageai
+import voyageai.error
 
 from prompt_saver_mcp.config import config
+from prompt_saver_mcp.embeddings.base import EmbeddingProvider
+from prompt_saver_mcp.utils.circuit_breaker import get_breaker
+from prompt_saver_mcp.utils.deadlines import DeadlineExceeded, expired, within_deadline
+from prompt_saver_mcp.utils.hedging import HedgePolicy, hedged
 
 logger = logging.getLogger(__name__)
 
 
-class VoyageClient:
-    """Voyage AI client for generating embeddings."""
+def _is_outage(error: BaseException) -> bool:
+    """
+    Errors that say Voyage AI is unavailable, as opposed to a bad request or a call that
+    ran out of its own deadline.
+    """
+    if expired():
+        return False
+    return not isinstance(
+        error,
+        (
+            voyageai.error.InvalidRequestError,
+            voyageai.error.MalformedRequestError,
+            DeadlineExceeded,
+        ),
+    )
+
+
+class VoyageClient(EmbeddingProvider):
+    """Voyage AI embedding provider."""
 
     def __init__(self):
         """Initialize Voyage AI client."""
         if not config.VOYAGE_AI_API_KEY:
             raise ValueError("VOYAGE_AI_API_KEY is required")
-        self.client = voyageai.Client(api_key=config.VOYAGE_AI_API_KEY)
+        self.client = voyageai.Client(
+            api_key=config.VOYAGE_AI_API_KEY, timeout=config.VOYAGE_TIMEOUT
+        )
+        # Async client for tool calls: cancelling the awaiting task aborts the HTTP request
+        self.async_client = voyageai.AsyncClient(
+            api_key=config.VOYAGE_AI_API_KEY, timeout=config.VOYAGE_TIMEOUT
+        )
         self.model = config.VOYAGE_AI_EMBEDDING_MODEL
-
-    def generate_embedding(self, text: str) -> List[float]:
+        self.breaker = get_breaker("voyage", is_failure=_is_outage)
+        # Optional hedging of async requests to cut tail latency
+        self.hedge_policy: Optional[HedgePolicy] = None
+        if config.VOYAGE_HEDGING_ENABLED:
+            self.hedge_policy = HedgePolicy(
+                percentile=config.VOYAGE_HEDGE_PERCENTILE,
+                max_rate=config.VOYAGE_HEDGE_MAX_RATE,
+                min_delay=config.VOYAGE_HEDGE_MIN_DELAY,
+                initial_delay=config.VOYAGE_HEDGE_INITIAL_DELAY,
+            )
+
+    @property
+    def model_id(self) -> str:
+        return f"voyage/{self.model}"
+
+    @property
+    def dimension(self) -> int:
+        return config.EMBEDDING_DIMENSIONS
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embedding for a single text.
+        Generate embeddings for multiple texts in batch.
 
         Args:
-            text: Text to generate embedding for
+            texts: List of texts to generate embeddings for
 
         Returns:
-            List of floats representing the embedding vector
+            List of embedding vectors
         """
-        try:
-            result = self.client.embed([text], model=self.model)
-            if result.embeddings and len(result.embeddings) > 0:
-                return result.embeddings[0]
-            raise ValueError("No embedding generated")
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            raise
-
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        result = self.client.embed(texts, model=self.model)
+        if result.embeddings:
+            return result.embeddings
+        raise ValueError("No embeddings generated")
+
+    async def embed_batch_async(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embeddings for multiple texts in batch.
+        Generate embeddings for multiple texts within the current call's deadline.
+
+        Calls go through the "voyage" circuit breaker, so while the API is down they fail
+        immediately with CircuitOpenError. With VOYAGE_HEDGING_ENABLED, a duplicate
+        request is sent when the first one has not answered within the observed latency
+        percentile.
 
         Args:
             texts: List of texts to generate embeddings for
@@ -49,16 +98,21 @@ class VoyageClient:
         Returns:
             List of embedding vectors
         """
-        try:
-            if not texts:
-                return []
-            result = self.client.embed(texts, model=self.model)
-            if result.embeddings:
-                return result.embeddings
-            raise ValueError("No embeddings generated")
-        except Exception as e:
-            logger.error(f"Failed to generate batch embeddings: {e}")
-            raise
+        if not texts:
+            return []
+
+        def request():
+            return self.async_client.embed(texts, model=self.model)
+
+        def attempt():
+            if self.hedge_policy is not None:
+                return within_deadline(hedged(request, self.hedge_policy), "embed")
+            return within_deadline(request(), "embed")
+
+        result = await self.breaker.call(attempt)
+        if result.embeddings:
+            return result.embeddings
+        raise ValueError("No embeddings generated")
 
 
 # Global Voyage client instance (lazy initialization)
@@ -71,15 +125,3 @@ def get_voyage_client() -> VoyageClient:
     if _voyage_client is None:
         _voyage_client = VoyageClient()
     return _voyage_client
-
-
-# Create a simple object that delegates to get_voyage_client()
-class VoyageClientProxy:
-    """Proxy for lazy-loaded Voyage client."""
-
-    def __getattr__(self, name):
-        return getattr(get_voyage_client(), name)
-
-
-voyage_client = VoyageClientProxy()
-
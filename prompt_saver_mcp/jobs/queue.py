@@ -0,0 +1,245 @@
+"""Durable job queue backed by a MongoDB collection."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.collection import Collection
+
+from prompt_saver_mcp.config import config
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle: pending -> running -> succeeded | failed (running -> pending on retry)
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+class JobQueue:
+    """Job queue with lease-based, crash-safe delivery and bounded retries."""
+
+    def __init__(self, collection: Collection):
+        """
+        Initialize the job queue.
+
+        Args:
+            collection: Collection holding the jobs
+        """
+        self.collection = collection
+        self._swept: Optional[datetime] = None
+
+    def ensure_indexes(self) -> None:
+        """Create the indexes used to lease jobs."""
+        self.collection.create_index([("status", ASCENDING), ("available_at", ASCENDING)])
+        self.collection.create_index([("status", ASCENDING), ("lease_expires", ASCENDING)])
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            kind: Job type, used to pick the handler
+            payload: Job input
+
+        Returns:
+            The job ID as a string
+        """
+        now = datetime.utcnow()
+        result = self.collection.insert_one(
+            {
+                "kind": kind,
+                "payload": payload,
+                "status": STATUS_PENDING,
+                "progress": "queued",
+                "attempts": 0,
+                "max_attempts": config.JOB_MAX_ATTEMPTS,
+                "available_at": now,
+                "lease_owner": None,
+                "lease_expires": None,
+                "result": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        logger.info(f"Enqueued {kind} job {result.inserted_id}")
+        return str(result.inserted_id)
+
+    def lease(self, worker_id: str, lease_seconds: Optional[float] = None) -> Optional[dict]:
+        """
+        Atomically claim the oldest available job.
+
+        Pending jobs and running jobs whose lease expired (their worker crashed) with
+        attempts left are both eligible, so no job is lost when a process dies mid-job.
+        Expired jobs without attempts left are failed every JOB_SWEEP_INTERVAL seconds.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: Lease duration (default: JOB_LEASE_SECONDS)
+
+        Returns:
+            The claimed job, or None if the queue is empty
+        """
+        now = datetime.utcnow()
+        lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        if self._swept is None or now - self._swept >= timedelta(
+            seconds=config.JOB_SWEEP_INTERVAL
+        ):
+            self._swept = now
+            self._fail_exhausted(now)
+        return self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": STATUS_PENDING, "available_at": {"$lte": now}},
+                    {
+                        "status": STATUS_RUNNING,
+                        "lease_expires": {"$lt": now},
+                        "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                    },
+                ]
+            },
+            {
+                "$set": {
+                    "status": STATUS_RUNNING,
+                    "lease_owner": worker_id,
+                    "lease_expires": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _fail_exhausted(self, now: datetime) -> None:
+        """Fail jobs whose lease expired on their last allowed attempt."""
+        self.collection.update_many(
+            {
+                "status": STATUS_RUNNING,
+                "lease_expires": {"$lt": now},
+                "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+            },
+            {
+                "$set": {
+                    "status": STATUS_FAILED,
+                    "error": "Worker lease expired on the final attempt",
+                    "lease_owner": None,
+                    "updated_at": now,
+                }
+            },
+        )
+
+    def heartbeat(self, job_id: Any, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Extend the lease of a running job.
+
+        Returns:
+            False if the worker no longer owns the job
+        """
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": STATUS_RUNNING, "lease_owner": worker_id},
+            {
+                "$set": {
+                    "lease_expires": now
+                    + timedelta(seconds=lease_seconds or config.JOB_LEASE_SECONDS),
+                    "updated_at": now,
+                }
+            },
+        )
+        return result.matched_count > 0
+
+    def update_progress(self, job_id: Any, worker_id: str, progress: str) -> None:
+        """Record a human-readable progress step of a running job."""
+        self.collection.update_one(
+            {"_id": ObjectId(job_id), "lease_owner": worker_id},
+            {"$set": {"progress": progress, "updated_at": datetime.utcnow()}},
+        )
+
+    def complete(self, job_id: Any, worker_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job as succeeded with its result."""
+        self.collection.update_one(
+            {"_id": ObjectId(job_id), "lease_owner": worker_id},
+            {
+                "$set": {
+                    "status": STATUS_SUCCEEDED,
+                    "progress": "done",
+                    "result": result,
+                    "error": None,
+                    "lease_owner": None,
+                    "lease_expires": None,
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+        )
+
+    def fail(self, job_id: Any, worker_id: str, attempts: int, max_attempts: int, error: str) -> None:
+        """
+        Record a failed attempt; retry with exponential backoff until attempts run out.
+
+        Args:
+            job_id: The job ID
+            worker_id: Identifier of the worker owning the lease
+            attempts: Attempts made so far, including this one
+            max_attempts: Maximum attempts allowed
+            error: Error message of this attempt
+        """
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {
+            "error": error,
+            "lease_owner": None,
+            "lease_expires": None,
+            "updated_at": now,
+        }
+        if attempts < max_attempts:
+            update["status"] = STATUS_PENDING
+            update["progress"] = f"retrying after attempt {attempts}"
+            update["available_at"] = now + timedelta(seconds=2**attempts)
+        else:
+            update["status"] = STATUS_FAILED
+        self.collection.update_one(
+            {"_id": ObjectId(job_id), "lease_owner": worker_id}, {"$set": update}
+        )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Retrieve a job by ID.
+
+        Args:
+            job_id: The job ID
+
+        Returns:
+            The job document without its payload, or None if not found
+        """
+        if not ObjectId.is_valid(job_id):
+            return None
+        return self.collection.find_one({"_id": ObjectId(job_id)}, {"payload": 0})
+
+
+# Global job queue instance (lazy initialization)
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the global job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        from prompt_saver_mcp.database.mongodb_client import get_mongodb_client
+
+        _job_queue = JobQueue(get_mongodb_client().db[config.MONGODB_JOBS_COLLECTION])
+    return _job_queue
+
+
+# Create a simple object that delegates to get_job_queue()
+class JobQueueProxy:
+    """Proxy for lazy-loaded job queue."""
+
+    def __getattr__(self, name):
+        return getattr(get_job_queue(), name)
+
+
+job_queue = JobQueueProxy()
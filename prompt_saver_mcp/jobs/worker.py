@@ -0,0 +1,173 @@
+"""Worker pool that drains the job queue with bounded concurrency."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.jobs.queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+# A handler receives the job payload and a progress callback, and returns the job result.
+# Synchronous handlers run in a thread so slow API calls never block the event loop.
+JobHandler = Callable[[Dict[str, Any], Callable[[str], None]], Any]
+
+
+class JobWorkerPool:
+    """Fixed number of asyncio workers leasing jobs from a JobQueue."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            queue: Queue to drain
+            handlers: Handler per job kind
+            concurrency: Number of jobs processed at once (default: JOB_WORKERS)
+            poll_interval: Seconds to wait when the queue is empty (default: JOB_POLL_INTERVAL)
+            lease_seconds: Job lease duration (default: JOB_LEASE_SECONDS)
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency or config.JOB_WORKERS
+        self.poll_interval = poll_interval or config.JOB_POLL_INTERVAL
+        self.lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._idle_timeout: Optional[float] = None
+        self._started = 0.0
+
+    def start(self, idle_timeout: Optional[float] = None) -> None:
+        """
+        Start the workers on the running event loop, restarting any that stopped when idle.
+
+        Args:
+            idle_timeout: Seconds without jobs after which workers stop (None: run until
+                stopped). Ignored while workers started without one are running.
+        """
+        self._started = time.monotonic()
+        if not any(not task.done() for task in self._tasks.values()):
+            self._idle_timeout = idle_timeout
+        started = 0
+        for i in range(self.concurrency):
+            task = self._tasks.get(i)
+            if task is None or task.done():
+                self._tasks[i] = asyncio.create_task(self._run(f"{self._prefix}:{i}"))
+                started += 1
+        if started:
+            logger.info(f"Started {started} job workers")
+
+    async def stop(self) -> None:
+        """Stop the workers. Jobs they were running are re-leased after their lease expires."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {}
+
+    async def _run(self, worker_id: str) -> None:
+        """Lease and process jobs until cancelled or idle for the idle timeout."""
+        last_job = time.monotonic()
+        while True:
+            try:
+                job = await asyncio.to_thread(self.queue.lease, worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Worker {worker_id} could not lease a job: {e}")
+                job = None
+            if job is None:
+                # start() resets the idle clock, so a job queued just now is not stranded
+                idle = time.monotonic() - max(last_job, self._started)
+                if self._idle_timeout is not None and idle >= self._idle_timeout:
+                    logger.info(f"Worker {worker_id} stopping after {idle:.0f}s without jobs")
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self._process(worker_id, job)
+            last_job = time.monotonic()
+
+    async def _process(self, worker_id: str, job: dict) -> None:
+        """Run one job's handler while keeping its lease alive."""
+        job_id = job["_id"]
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            await asyncio.to_thread(
+                self.queue.fail,
+                job_id,
+                worker_id,
+                job["max_attempts"],
+                job["max_attempts"],
+                f"No handler for job kind '{job['kind']}'",
+            )
+            return
+
+        is_async = asyncio.iscoroutinefunction(handler)
+        loop = asyncio.get_running_loop()
+
+        def report_progress(progress: str) -> None:
+            if is_async:
+                # Called on the event loop: record progress without blocking it
+                loop.run_in_executor(
+                    None, self.queue.update_progress, job_id, worker_id, progress
+                )
+            else:
+                self.queue.update_progress(job_id, worker_id, progress)
+
+        if is_async:
+            work = asyncio.ensure_future(handler(job["payload"], report_progress))
+        else:
+            work = asyncio.ensure_future(
+                asyncio.to_thread(handler, job["payload"], report_progress)
+            )
+        heartbeat = asyncio.create_task(self._heartbeat(worker_id, job_id, work))
+        try:
+            result = await work
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled():
+                # The lease was lost and the job belongs to another worker now
+                return
+            # Shutting down: leave the lease to expire so another worker picks the job up
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} attempt {job['attempts']} failed: {e}", exc_info=True)
+            await asyncio.to_thread(
+                self.queue.fail, job_id, worker_id, job["attempts"], job["max_attempts"], str(e)
+            )
+        else:
+            await asyncio.to_thread(self.queue.complete, job_id, worker_id, result)
+            logger.info(f"Job {job_id} succeeded")
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, worker_id: str, job_id: Any, work: asyncio.Future) -> None:
+        """
+        Extend the lease periodically while a job runs.
+
+        If the lease was lost (it expired and another worker re-leased the job), the job's
+        handler is cancelled so no further LLM or embedding calls are spent on it. A
+        synchronous handler's thread cannot be interrupted; its result is discarded.
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                owned = await asyncio.to_thread(
+                    self.queue.heartbeat, job_id, worker_id, self.lease_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Could not extend lease of job {job_id}: {e}")
+                continue
+            if not owned:
+                logger.warning(f"Worker {worker_id} lost the lease of job {job_id}; cancelling it")
+                work.cancel()
+                return
@@ -1,78 +1,260 @@
-"""OpenAI client for prompt analysis and generation."""
+"""OpenAI-compatible client for prompt analysis and generation."""
 
+import asyncio
 import json
 import logging
+import re
 from typing import Dict, List, Optional
 
-from openai import OpenAI
-
 from prompt_saver_mcp.config import config
+from prompt_saver_mcp.llm.providers import LLMProvider, get_llm_provider
 
 logger = logging.getLogger(__name__)
 
 USE_CASES = ["code-gen", "text-gen", "data-analysis", "creative", "general"]
 
+# A JSON object wrapped in a markdown code fence, as some local models reply
+_FENCED_JSON = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+
+# A whole reply wrapped in a markdown code fence
+_FENCED_MARKDOWN = re.compile(r"\A```(?:markdown|md)?[ \t]*\n(.*)\n```\s*\Z", re.DOTALL)
+
+_TEMPLATE_GUIDELINES = """The prompt template should be:
+- COMPREHENSIVE and DETAILED - include specific examples, code snippets, file paths, commands, and concrete patterns from the conversation
+- Well-structured with clear sections and subsections
+- Include specific examples alongside placeholders for variable inputs
+- Preserve important details like exact file paths, SQL queries, specific commands, error messages, and solutions
+- Capture the complete problem-solving approach with all nuances
+- Include a detailed "Overview" section at the beginning explaining the context and what this prompt helps accomplish
+- Be VERBOSE - include all relevant details that would help someone replicate the success
+
+IMPORTANT: Do NOT oversimplify or make it too generic. Include:
+- Specific code examples from the conversation
+- Exact file paths mentioned
+- Complete SQL queries or commands
+- Detailed step-by-step procedures
+- Common pitfalls and solutions
+- Validation checklists
+- Any specific technical details discussed"""
+
 
 class OpenAIClient:
-    """OpenAI client for analyzing conversations and generating prompts."""
+    """Analyzes conversations and generates prompts with an OpenAI-compatible provider."""
+
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        fast_provider: Optional[LLMProvider] = None,
+        template_provider: Optional[LLMProvider] = None,
+    ):
+        """
+        Initialize the client.
 
-    def __init__(self):
-        """Initialize OpenAI client."""
-        if not config.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY is required")
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
-        self.model = config.OPENAI_MODEL
+        Args:
+            provider: LLM provider to use (default: the LLM_PROVIDER provider)
+            fast_provider: Provider of split summary calls (default: ANALYSIS_FAST_PROVIDER,
+                falling back to provider)
+            template_provider: Provider of split template calls (default:
+                ANALYSIS_TEMPLATE_PROVIDER, falling back to provider)
+        """
+        self.provider = provider or get_llm_provider()
+        self.model = self.provider.model
+        self.fast_provider = fast_provider or (
+            get_llm_provider(config.ANALYSIS_FAST_PROVIDER)
+            if config.ANALYSIS_FAST_PROVIDER
+            else self.provider
+        )
+        self.template_provider = template_provider or (
+            get_llm_provider(config.ANALYSIS_TEMPLATE_PROVIDER)
+            if config.ANALYSIS_TEMPLATE_PROVIDER
+            else self.provider
+        )
 
     def analyze_conversation(
-        self, conversation_messages: List[Dict], task_description: Optional[str] = None
-    ) -> Dict[str, str]:
+        self,
+        conversation_messages: List[Dict],
+        task_description: Optional[str] = None,
+        categorize: bool = True,
+    ) -> Dict[str, Optional[str]]:
         """
         Analyze a conversation thread and extract key information.
 
         Args:
             conversation_messages: List of conversation messages
             task_description: Optional description of the task
+            categorize: Ask the model for the use case; when False (the use case
+                classifier labels the prompt) use_case is None. An invalid label from
+                the model is also returned as None (see choose_use_case)
 
         Returns:
             Dictionary with use_case, summary, and prompt_template
         """
         try:
-            # Format conversation for analysis
-            conversation_text = self._format_conversation(conversation_messages)
+            reply = self.provider.complete(
+                self._analysis_messages(conversation_messages, task_description, categorize),
+                "analyze",
+                json_output=True,
+            )
+            return self._parse_analysis(reply, categorize)
+        except Exception as e:
+            logger.error(f"Failed to analyze conversation: {e}")
+            raise
 
-            system_prompt = """You are an expert at analyzing conversation threads and extracting comprehensive, reusable prompt patterns.
+    async def analyze_conversation_async(
+        self,
+        conversation_messages: List[Dict],
+        task_description: Optional[str] = None,
+        categorize: bool = True,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Analyze a conversation thread without blocking the event loop.
 
-Your task is to:
-1. Categorize the conversation into one of these use cases: code-gen, text-gen, data-analysis, creative, general
-2. Create a detailed summary of what the conversation accomplished
-3. Generate a comprehensive, reusable prompt template in markdown format that captures ALL the key patterns, steps, examples, and details
+        The request timeout is the remaining deadline of the current call (capped by the
+        provider's timeout), and cancelling the awaiting task aborts the request.
 
-The prompt template should be:
-- COMPREHENSIVE and DETAILED - include specific examples, code snippets, file paths, commands, and concrete patterns from the conversation
-- Well-structured with clear sections and subsections
-- Include specific examples alongside placeholders for variable inputs
-- Preserve important details like exact file paths, SQL queries, specific commands, error messages, and solutions
-- Capture the complete problem-solving approach with all nuances
-- Include a detailed "Overview" section at the beginning explaining the context and what this prompt helps accomplish
-- Be VERBOSE - include all relevant details that would help someone replicate the success
+        With ANALYSIS_SPLIT_ENABLED the summary and the template are requested
+        concurrently from their own models (see summarize_conversation_async and
+        generate_template_async), so the reply takes as long as the slower of the two.
 
-IMPORTANT: Do NOT oversimplify or make it too generic. Include:
-- Specific code examples from the conversation
-- Exact file paths mentioned
-- Complete SQL queries or commands
-- Detailed step-by-step procedures
-- Common pitfalls and solutions
-- Validation checklists
-- Any specific technical details discussed
+        Args:
+            conversation_messages: List of conversation messages
+            task_description: Optional description of the task
+            categorize: Ask the model for the use case; when False (the use case
+                classifier labels the prompt) use_case is None. An invalid label from
+                the model is also returned as None (see choose_use_case)
+
+        Returns:
+            Dictionary with use_case, summary, and prompt_template
+        """
+        if config.ANALYSIS_SPLIT_ENABLED:
+            template_task = asyncio.ensure_future(
+                self.generate_template_async(conversation_messages, task_description)
+            )
+            try:
+                analysis = await self.summarize_conversation_async(
+                    conversation_messages, task_description, categorize
+                )
+                analysis["prompt_template"] = await template_task
+                return analysis
+            finally:
+                template_task.cancel()
+        try:
+            reply = await self.provider.complete_async(
+                self._analysis_messages(conversation_messages, task_description, categorize),
+                "analyze",
+                json_output=True,
+            )
+            return self._parse_analysis(reply, categorize)
+        except Exception as e:
+            logger.error(f"Failed to analyze conversation: {e}")
+            raise
+
+    async def summarize_conversation_async(
+        self,
+        conversation_messages: List[Dict],
+        task_description: Optional[str] = None,
+        categorize: bool = True,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Summarize (and categorize) a conversation without generating its template.
+
+        The reply is short, so this runs on the fast model (ANALYSIS_FAST_PROVIDER and
+        ANALYSIS_FAST_MODEL) at a low temperature.
+
+        Args:
+            conversation_messages: List of conversation messages
+            task_description: Optional description of the task
+            categorize: Ask the model for the use case; when False, or when the model's
+                label is invalid, use_case is None
+
+        Returns:
+            Dictionary with use_case, summary and history
+        """
+        try:
+            reply = await self.fast_provider.complete_async(
+                self._summary_messages(conversation_messages, task_description, categorize),
+                "summarize",
+                json_output=True,
+                model=config.ANALYSIS_FAST_MODEL,
+                temperature=0.2,
+            )
+            analysis = self._parse_analysis(reply, categorize)
+            del analysis["prompt_template"]
+            return analysis
+        except Exception as e:
+            logger.error(f"Failed to summarize conversation: {e}")
+            raise
+
+    async def generate_template_async(
+        self, conversation_messages: List[Dict], task_description: Optional[str] = None
+    ) -> str:
+        """
+        Generate the reusable prompt template of a conversation.
+
+        Runs on the template model (ANALYSIS_TEMPLATE_PROVIDER and ANALYSIS_TEMPLATE_MODEL)
+        and returns plain markdown, so no JSON has to be produced or parsed.
+
+        Args:
+            conversation_messages: List of conversation messages
+            task_description: Optional description of the task
+
+        Returns:
+            The markdown prompt template
+        """
+        try:
+            reply = await self.template_provider.complete_async(
+                self._template_messages(conversation_messages, task_description),
+                "template",
+                model=config.ANALYSIS_TEMPLATE_MODEL,
+            )
+            if not reply or not reply.strip():
+                raise ValueError(f"Empty response from {self.template_provider.name}")
+            fenced = _FENCED_MARKDOWN.match(reply.strip())
+            return (fenced.group(1) if fenced else reply).strip()
+        except Exception as e:
+            logger.error(f"Failed to generate prompt template: {e}")
+            raise
+
+    def _analysis_messages(
+        self,
+        conversation_messages: List[Dict],
+        task_description: Optional[str] = None,
+        categorize: bool = True,
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for conversation analysis."""
+        # Format conversation for analysis
+        conversation_text = self._format_conversation(conversation_messages)
+
+        tasks = [
+            "Create a detailed summary of what the conversation accomplished",
+            "Generate a comprehensive, reusable prompt template in markdown format that captures ALL the key patterns, steps, examples, and details",
+        ]
+        keys = [
+            "- summary: a detailed summary (can be multiple sentences, include key details)",
+            "- prompt_template: the comprehensive markdown-formatted prompt template with overview, examples, and details",
+            "- history: a detailed summary of the steps taken and end result (include specific details)",
+        ]
+        if categorize:
+            tasks.insert(
+                0,
+                f"Categorize the conversation into one of these use cases: {', '.join(USE_CASES)}",
+            )
+            keys.insert(0, "- use_case: one of the use case categories")
+        task_list = "\n".join(f"{i}. {task}" for i, task in enumerate(tasks, 1))
+        key_list = "\n".join(keys)
+
+        system_prompt = f"""You are an expert at analyzing conversation threads and extracting comprehensive, reusable prompt patterns.
+
+Your task is to:
+{task_list}
+
+{_TEMPLATE_GUIDELINES}
 
 Return your response as a JSON object with these keys:
-- use_case: one of the use case categories
-- summary: a detailed summary (can be multiple sentences, include key details)
-- prompt_template: the comprehensive markdown-formatted prompt template with overview, examples, and details
-- history: a detailed summary of the steps taken and end result (include specific details)
+{key_list}
 """
 
-            user_prompt = f"""Analyze this conversation thread:
+        user_prompt = f"""Analyze this conversation thread:
 
 {conversation_text}
 
@@ -80,36 +262,98 @@ Return your response as a JSON object with these keys:
 
 Extract the reusable prompt pattern and return as JSON."""
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-            )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _summary_messages(
+        self,
+        conversation_messages: List[Dict],
+        task_description: Optional[str] = None,
+        categorize: bool = True,
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for the summary half of a split analysis."""
+        conversation_text = self._format_conversation(conversation_messages)
+
+        categorize_task = (
+            f"- use_case: one of these use cases: {', '.join(USE_CASES)}\n" if categorize else ""
+        )
+        system_prompt = f"""You are an expert at analyzing conversation threads.
+
+Return a JSON object with these keys:
+{categorize_task}- summary: a detailed summary of what the conversation accomplished (can be multiple sentences, include key details)
+- history: a detailed summary of the steps taken and end result (include specific details)
+"""
 
-            result_text = response.choices[0].message.content
-            if not result_text:
-                raise ValueError("Empty response from OpenAI")
+        user_prompt = f"""Analyze this conversation thread:
 
-            result = json.loads(result_text)
+{conversation_text}
 
-            # Validate use_case
-            if result.get("use_case") not in USE_CASES:
-                logger.warning(f"Invalid use_case {result.get('use_case')}, defaulting to 'general'")
-                result["use_case"] = "general"
+{f'Task description: {task_description}' if task_description else ''}
 
-            return {
-                "use_case": result.get("use_case", "general"),
-                "summary": result.get("summary", ""),
-                "prompt_template": result.get("prompt_template", ""),
-                "history": result.get("history", ""),
-            }
-        except Exception as e:
-            logger.error(f"Failed to analyze conversation: {e}")
-            raise
+Summarize it and return as JSON."""
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _template_messages(
+        self, conversation_messages: List[Dict], task_description: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for the template half of a split analysis."""
+        conversation_text = self._format_conversation(conversation_messages)
+
+        system_prompt = f"""You are an expert at extracting comprehensive, reusable prompt patterns from conversation threads.
+
+Your task is to generate a comprehensive, reusable prompt template in markdown format that captures ALL the key patterns, steps, examples, and details of the conversation.
+
+{_TEMPLATE_GUIDELINES}
+
+Return only the prompt template in markdown format, without any additional commentary."""
+
+        user_prompt = f"""Conversation thread:
+
+{conversation_text}
+
+{f'Task description: {task_description}' if task_description else ''}
+
+Generate the reusable prompt template."""
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _parse_analysis(
+        self, result_text: Optional[str], categorize: bool = True
+    ) -> Dict[str, Optional[str]]:
+        """
+        Parse and validate the JSON analysis returned by the model.
+
+        A use case outside USE_CASES is returned as None rather than replaced, so callers
+        can tell it apart from a real label (and never train the classifier on it).
+        """
+        if not result_text:
+            raise ValueError(f"Empty response from {self.provider.name}")
+
+        fenced = _FENCED_JSON.search(result_text)
+        result = json.loads(fenced.group(1) if fenced else result_text)
+
+        # Validate use_case
+        if not categorize:
+            result["use_case"] = None
+        elif result.get("use_case") not in USE_CASES:
+            logger.warning(f"Invalid use_case {result.get('use_case')!r}; leaving it unset")
+            result["use_case"] = None
+
+        return {
+            "use_case": result["use_case"],
+            "summary": result.get("summary", ""),
+            "prompt_template": result.get("prompt_template", ""),
+            "history": result.get("history", ""),
+        }
 
     def improve_prompt_from_feedback(
         self, current_prompt: str, feedback: str, conversation_context: Optional[str] = None
@@ -126,7 +370,44 @@ Extract the reusable prompt pattern and return as JSON."""
             Improved prompt template
         """
         try:
-            system_prompt = """You are an expert at improving prompts based on feedback.
+            reply = self.provider.complete(
+                self._improvement_messages(current_prompt, feedback, conversation_context),
+                "improve",
+            )
+            return self._parse_improvement(reply)
+        except Exception as e:
+            logger.error(f"Failed to improve prompt: {e}")
+            raise
+
+    async def improve_prompt_from_feedback_async(
+        self, current_prompt: str, feedback: str, conversation_context: Optional[str] = None
+    ) -> str:
+        """
+        Improve a prompt based on user feedback without blocking the event loop.
+
+        Args:
+            current_prompt: The current prompt template
+            feedback: User feedback on the prompt
+            conversation_context: Optional context about how the prompt was used
+
+        Returns:
+            Improved prompt template
+        """
+        try:
+            reply = await self.provider.complete_async(
+                self._improvement_messages(current_prompt, feedback, conversation_context),
+                "improve",
+            )
+            return self._parse_improvement(reply)
+        except Exception as e:
+            logger.error(f"Failed to improve prompt: {e}")
+            raise
+
+    def _improvement_messages(
+        self, current_prompt: str, feedback: str, conversation_context: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for feedback-driven improvement."""
+        system_prompt = """You are an expert at improving prompts based on feedback.
 
 Your task is to take the current prompt and user feedback, then generate an improved version that:
 - Addresses the feedback points comprehensively
@@ -140,7 +421,7 @@ Include specific examples, code snippets, exact commands, and detailed explanati
 
 Return only the improved prompt template in markdown format, without any additional commentary."""
 
-            user_prompt = f"""Current prompt template:
+        user_prompt = f"""Current prompt template:
 
 {current_prompt}
 
@@ -151,23 +432,16 @@ User feedback:
 
 Generate an improved version of this prompt."""
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.7,
-            )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
 
-            improved_prompt = response.choices[0].message.content
-            if not improved_prompt:
-                raise ValueError("Empty response from OpenAI")
-
-            return improved_prompt.strip()
-        except Exception as e:
-            logger.error(f"Failed to improve prompt: {e}")
-            raise
+    def _parse_improvement(self, improved_prompt: Optional[str]) -> str:
+        """Validate the improved template returned by the model."""
+        if not improved_prompt:
+            raise ValueError(f"Empty response from {self.provider.name}")
+        return improved_prompt.strip()
 
     def _format_conversation(self, messages: List[Dict]) -> str:
         """
@@ -0,0 +1,223 @@
+"""OpenAI-compatible LLM providers with their own timeouts and concurrency limits."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from openai import AsyncOpenAI, BadRequestError, OpenAI
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.utils.circuit_breaker import get_breaker
+from prompt_saver_mcp.utils.deadlines import DeadlineExceeded, expired, remaining, within_deadline
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("openai", "local")
+
+
+def _is_outage(error: BaseException) -> bool:
+    """
+    Errors that say the provider is unavailable, as opposed to a bad request or reply, or a
+    call that ran out of its own deadline.
+    """
+    if expired():
+        return False
+    return not isinstance(error, (BadRequestError, ValueError, DeadlineExceeded))
+
+
+class LLMProvider:
+    """
+    A chat completions endpoint: OpenAI itself or any OpenAI-compatible server
+    (vLLM, llama.cpp, Ollama, ...).
+
+    Async requests wait for one of max_concurrency slots, bounded by the call's deadline,
+    so a small local GPU server is not overloaded by concurrent saves. Each provider has
+    its own circuit breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: float = 120.0,
+        max_concurrency: int = 4,
+        json_mode: bool = True,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Provider name used in errors, breakers and metrics
+            model: Model name sent with every request
+            base_url: API base URL (default: OpenAI)
+            api_key: API key; OpenAI-compatible servers usually accept any value
+            timeout: Upper bound for a single request in seconds
+            max_concurrency: Requests in flight at once
+            json_mode: Whether the server supports response_format json_object
+        """
+        self.name = name
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.json_mode = json_mode
+        self.client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+        # Async client for tool calls: cancelling the awaiting task aborts the HTTP request
+        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+        self.breaker = get_breaker(name, is_failure=_is_outage)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+
+    def _request(
+        self,
+        messages: List[Dict[str, str]],
+        stage: str,
+        json_output: bool,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """Keyword arguments of a chat completion request."""
+        request: Dict[str, Any] = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "timeout": remaining(stage, self.timeout),
+        }
+        if json_output and self.json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        stage: str,
+        json_output: bool = False,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Optional[str]:
+        """
+        Run a chat completion.
+
+        Args:
+            messages: Chat messages
+            stage: Stage name used for the deadline
+            json_output: Ask for a JSON object reply
+            model: Model for this request (default: the provider's model)
+            temperature: Sampling temperature
+
+        Returns:
+            The reply text
+        """
+        with self._sync_slots:
+            response = self.client.chat.completions.create(
+                **self._request(messages, stage, json_output, model, temperature)
+            )
+        return response.choices[0].message.content
+
+    async def complete_async(
+        self,
+        messages: List[Dict[str, str]],
+        stage: str,
+        json_output: bool = False,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Optional[str]:
+        """
+        Run a chat completion without blocking the event loop.
+
+        The slot wait and the request share the remaining deadline of the current call,
+        and cancelling the awaiting task aborts the request.
+
+        Args:
+            messages: Chat messages
+            stage: Stage name used for the deadline
+            json_output: Ask for a JSON object reply
+            model: Model for this request (default: the provider's model)
+            temperature: Sampling temperature
+
+        Returns:
+            The reply text
+        """
+        self.waiting += 1
+        try:
+            await within_deadline(self._slots.acquire(), stage)
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            response = await self.breaker.call(
+                lambda: self.async_client.chat.completions.create(
+                    **self._request(messages, stage, json_output, model, temperature)
+                )
+            )
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+        return response.choices[0].message.content
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the provider's endpoint, limits and load."""
+        return {
+            "model": self.model,
+            "base_url": self.base_url or "https://api.openai.com/v1",
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "timeout_s": self.timeout,
+        }
+
+
+def create_llm_provider(name: str) -> LLMProvider:
+    """
+    Create an LLM provider from its configuration.
+
+    Args:
+        name: "openai" (OPENAI_* settings) or "local" (LOCAL_LLM_* settings)
+
+    Returns:
+        The provider
+    """
+    if name == "openai":
+        if not config.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY is required")
+        return LLMProvider(
+            name,
+            config.OPENAI_MODEL,
+            base_url=config.OPENAI_BASE_URL,
+            api_key=config.OPENAI_API_KEY,
+            timeout=config.OPENAI_TIMEOUT,
+            max_concurrency=config.OPENAI_MAX_CONCURRENCY,
+        )
+    if name == "local":
+        return LLMProvider(
+            name,
+            config.LOCAL_LLM_MODEL,
+            base_url=config.LOCAL_LLM_BASE_URL,
+            api_key=config.LOCAL_LLM_API_KEY,
+            timeout=config.LOCAL_LLM_TIMEOUT,
+            max_concurrency=config.LOCAL_LLM_MAX_CONCURRENCY,
+            json_mode=config.LOCAL_LLM_JSON_MODE,
+        )
+    raise ValueError(f"Unknown LLM provider '{name}'; expected one of {PROVIDERS}")
+
+
+# Providers by name, created on first use
+_providers: Dict[str, LLMProvider] = {}
+
+
+def get_llm_provider(name: Optional[str] = None) -> LLMProvider:
+    """Get or create an LLM provider (default: LLM_PROVIDER)."""
+    name = name or config.LLM_PROVIDER
+    if name not in _providers:
+        _providers[name] = create_llm_provider(name)
+    return _providers[name]
+
+
+def provider_snapshots() -> Dict[str, Dict[str, Any]]:
+    """Return the state of every provider created so far."""
+    return {name: provider.snapshot() for name, provider in _providers.items()}
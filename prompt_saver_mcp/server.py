@@ -1,15 +1,30 @@
 """MCP server for prompt saving and retrieval."""
 
 import asyncio
+import contextlib
 import logging
 import sys
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator
 
+import uvicorn
 from mcp.server import Server
+from mcp.server.sse import SseServerTransport
 from mcp.server.stdio import stdio_server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from mcp.types import Tool
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
 
 from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database.change_watcher import create_change_watcher
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.embeddings.classifier import load_use_case_classifier
+from prompt_saver_mcp.jobs.queue import job_queue
+from prompt_saver_mcp.llm.providers import provider_snapshots
 from prompt_saver_mcp.tools.get_prompt_details import (
     get_get_prompt_details_tool,
     handle_get_prompt_details,
@@ -18,11 +33,19 @@ from prompt_saver_mcp.tools.improve_prompt_from_feedback import (
     get_improve_prompt_from_feedback_tool,
     handle_improve_prompt_from_feedback,
 )
-from prompt_saver_mcp.tools.save_prompt import get_save_prompt_tool, handle_save_prompt
+from prompt_saver_mcp.tools.save_prompt import (
+    get_save_prompt_tool,
+    handle_save_prompt,
+    save_workers,
+)
 from prompt_saver_mcp.tools.search_prompts import (
     get_search_prompts_tool,
     handle_search_prompts,
 )
+from prompt_saver_mcp.tools.search_prompts_batch import (
+    get_search_prompts_batch_tool,
+    handle_search_prompts_batch,
+)
 from prompt_saver_mcp.tools.search_prompts_by_use_case import (
     get_search_prompts_by_use_case_tool,
     handle_search_prompts_by_use_case,
@@ -39,6 +62,25 @@ from prompt_saver_mcp.tools.save_approved_prompt import (
     get_save_approved_prompt_tool,
     handle_save_approved_prompt,
 )
+from prompt_saver_mcp.tools.get_prompts import get_get_prompts_tool, handle_get_prompts
+from prompt_saver_mcp.tools.get_prompt_version import (
+    get_get_prompt_version_tool,
+    handle_get_prompt_version,
+)
+from prompt_saver_mcp.tools.get_job_status import get_get_job_status_tool, handle_get_job_status
+from prompt_saver_mcp.tools.index_diagnostics import (
+    get_index_diagnostics_tool,
+    handle_index_diagnostics,
+)
+from prompt_saver_mcp.tools.server_metrics import get_server_metrics_tool, handle_server_metrics
+from prompt_saver_mcp.utils.admission import (
+    AdmissionRejected,
+    classify,
+    get_admission_controller,
+)
+from prompt_saver_mcp.utils.circuit_breaker import breaker_snapshots
+from prompt_saver_mcp.utils.compaction import compaction_totals
+from prompt_saver_mcp.utils.deadlines import deadline
 
 # Configure logging
 logging.basicConfig(
@@ -55,32 +97,86 @@ async def list_tools() -> list[Tool]:
     """List all available tools."""
     return [
         get_save_prompt_tool(),
+        get_get_job_status_tool(),
         get_preview_prompt_tool(),
         get_save_approved_prompt_tool(),
         get_search_prompts_tool(),
+        get_search_prompts_batch_tool(),
         get_search_prompts_by_use_case_tool(),
         get_update_prompt_tool(),
         get_get_prompt_details_tool(),
+        get_get_prompts_tool(),
+        get_get_prompt_version_tool(),
         get_improve_prompt_from_feedback_tool(),
+        get_index_diagnostics_tool(),
+        get_server_metrics_tool(),
     ]
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[dict]:
-    """Handle tool calls."""
+    """Handle tool calls, admitting them by priority class."""
+    if name == "get_server_metrics":
+        # Never queued, so load can be inspected while the server is saturated
+        result = await handle_server_metrics()
+        return [{"type": "text", "text": result[0].text}]
+
+    admission_class = classify(name, arguments)
+    try:
+        # The deadline covers the admission wait and every stage of the call. A client
+        # cancellation cancels this task, which aborts in-flight provider requests.
+        with deadline(config.tool_deadline(name)):
+            async with get_admission_controller().admit(admission_class) as waited:
+                if waited > 0.5:
+                    logger.info(f"{name} waited {waited:.2f}s for an {admission_class} slot")
+                return await dispatch_tool(name, arguments)
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected {name}: {e}")
+        return [
+            {
+                "type": "text",
+                "text": f"Error: Server busy ({e}). Retry after {e.retry_after:.0f}s.",
+            }
+        ]
+
+
+async def dispatch_tool(name: str, arguments: dict[str, Any]) -> list[dict]:
+    """Run a tool by name."""
     try:
         if name == "save_prompt":
             result = await handle_save_prompt(
                 conversation_messages=arguments.get("conversation_messages", ""),
                 task_description=arguments.get("task_description"),
                 context_info=arguments.get("context_info"),
+                async_mode=arguments.get("async_mode", False),
             )
             return [{"type": "text", "text": result[0].text}]
 
+        elif name == "get_job_status":
+            result = await handle_get_job_status(job_id=arguments.get("job_id", ""))
+            return [{"type": "text", "text": result[0].text}]
+
         elif name == "search_prompts":
             result = await handle_search_prompts(
                 query=arguments.get("query", ""),
                 limit=arguments.get("limit", 5),
+                use_case=arguments.get("use_case"),
+                created_by=arguments.get("created_by"),
+                updated_after=arguments.get("updated_after"),
+                min_score=arguments.get("min_score"),
+                recall_target=arguments.get("recall_target"),
+                token_budget=arguments.get("token_budget"),
+            )
+            return [{"type": "text", "text": result[0].text}]
+
+        elif name == "search_prompts_batch":
+            result = await handle_search_prompts_batch(
+                queries=arguments.get("queries", []),
+                limit=arguments.get("limit", 5),
+                dedupe=arguments.get("dedupe", False),
+                use_case=arguments.get("use_case"),
+                created_by=arguments.get("created_by"),
+                updated_after=arguments.get("updated_after"),
             )
             return [{"type": "text", "text": result[0].text}]
 
@@ -88,6 +184,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[dict]:
             result = await handle_search_prompts_by_use_case(
                 use_case=arguments.get("use_case", ""),
                 limit=arguments.get("limit", 10),
+                cursor=arguments.get("cursor"),
             )
             return [{"type": "text", "text": result[0].text}]
 
@@ -99,12 +196,33 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[dict]:
                 summary=arguments.get("summary"),
                 use_case=arguments.get("use_case"),
                 history=arguments.get("history"),
+                expected_version=arguments.get("expected_version"),
             )
             return [{"type": "text", "text": result[0].text}]
 
         elif name == "get_prompt_details":
             result = await handle_get_prompt_details(
-                prompt_id=arguments.get("prompt_id", "")
+                prompt_id=arguments.get("prompt_id", ""),
+                changelog_limit=arguments.get("changelog_limit", 10),
+                mode=arguments.get("mode", "full"),
+                sections=arguments.get("sections"),
+                start=arguments.get("start"),
+                end=arguments.get("end"),
+                unit=arguments.get("unit", "chars"),
+            )
+            return [{"type": "text", "text": result[0].text}]
+
+        elif name == "get_prompts":
+            result = await handle_get_prompts(
+                prompt_ids=arguments.get("prompt_ids", []),
+                fields=arguments.get("fields"),
+            )
+            return [{"type": "text", "text": result[0].text}]
+
+        elif name == "get_prompt_version":
+            result = await handle_get_prompt_version(
+                prompt_id=arguments.get("prompt_id", ""),
+                version=arguments.get("version", 1),
             )
             return [{"type": "text", "text": result[0].text}]
 
@@ -133,6 +251,13 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[dict]:
             )
             return [{"type": "text", "text": result[0].text}]
 
+        elif name == "get_index_diagnostics":
+            result = await handle_index_diagnostics(
+                ensure=arguments.get("ensure", False),
+                sample_value=arguments.get("sample_value", "general"),
+            )
+            return [{"type": "text", "text": result[0].text}]
+
         else:
             raise ValueError(f"Unknown tool: {name}")
     except Exception as e:
@@ -140,6 +265,79 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[dict]:
         return [{"type": "text", "text": f"Error: {str(e)}"}]
 
 
+def create_http_app() -> Starlette:
+    """
+    Build the ASGI app serving MCP over HTTP.
+
+    Streamable HTTP is served at /mcp; the older SSE transport at /sse (GET) and
+    /messages/ (POST) for clients that do not support it yet, and admission and
+    circuit breaker metrics at /metrics. Every client gets its own MCP session, while
+    the database pool and clients are shared by all sessions.
+
+    Returns:
+        The Starlette application
+    """
+    session_manager = StreamableHTTPSessionManager(app=server)
+    sse = SseServerTransport("/messages/")
+
+    async def handle_streamable_http(scope: Scope, receive: Receive, send: Send) -> None:
+        await session_manager.handle_request(scope, receive, send)
+
+    async def handle_metrics(request: Request) -> JSONResponse:
+        return JSONResponse(
+            {
+                **get_admission_controller().snapshot(),
+                "llm_providers": provider_snapshots(),
+                "compaction": compaction_totals(),
+                "circuit_breakers": breaker_snapshots(),
+            }
+        )
+
+    async def handle_sse(request: Request) -> Response:
+        async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
+            await server.run(streams[0], streams[1], server.create_initialization_options())
+        return Response()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with session_manager.run():
+            yield
+
+    return Starlette(
+        routes=[
+            Mount("/mcp", app=handle_streamable_http),
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Route("/metrics", endpoint=handle_metrics, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+        ],
+        lifespan=lifespan,
+    )
+
+
+async def run_stdio() -> None:
+    """Serve a single client over stdio."""
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(
+            read_stream,
+            write_stream,
+            server.create_initialization_options(),
+        )
+
+
+async def run_http() -> None:
+    """Serve many clients over HTTP from one process."""
+    logger.info(f"Serving MCP over HTTP on http://{config.MCP_HOST}:{config.MCP_PORT}/mcp")
+    http_server = uvicorn.Server(
+        uvicorn.Config(
+            create_http_app(),
+            host=config.MCP_HOST,
+            port=config.MCP_PORT,
+            log_level="info",
+        )
+    )
+    await http_server.serve()
+
+
 async def main():
     """Main entry point for the MCP server."""
     try:
@@ -147,13 +345,44 @@ async def main():
         config.validate()
         logger.info("Configuration validated successfully")
 
-        # Run the server with stdio transport
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options(),
+        # Blocking database and API calls run in this pool (asyncio.to_thread)
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=config.MCP_WORKER_THREADS, thread_name_prefix="prompt-saver"
             )
+        )
+
+        if config.ENSURE_INDEXES_ON_STARTUP:
+            try:
+                mongodb_client.ensure_indexes()
+                job_queue.ensure_indexes()
+            except Exception as e:
+                # Missing indexes degrade performance but must not block startup
+                logger.warning(f"Could not ensure indexes at startup: {e}")
+
+        if config.USE_CASE_CLASSIFIER_ENABLED:
+            # Train before the first save; the LLM keeps categorizing if this fails
+            await load_use_case_classifier()
+
+        # Background workers for save_prompt calls made with async_mode; otherwise they
+        # start on the first queued save
+        if config.JOB_WORKERS_ON_STARTUP:
+            save_workers.start()
+
+        # Apply prompts written by other server instances to the local index
+        watcher = create_change_watcher(mongodb_client)
+        if watcher is not None:
+            watcher.start()
+
+        try:
+            if config.MCP_TRANSPORT == "http":
+                await run_http()
+            else:
+                await run_stdio()
+        finally:
+            await save_workers.stop()
+            if watcher is not None:
+                await watcher.stop()
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
         sys.exit(1)
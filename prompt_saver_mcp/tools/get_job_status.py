@@ -0,0 +1,70 @@
+"""Tool for checking the status of a queued save job."""
+
+import logging
+
+from mcp.types import Tool, TextContent
+
+from prompt_saver_mcp.jobs.queue import STATUS_FAILED, STATUS_SUCCEEDED, job_queue
+from prompt_saver_mcp.utils.deadlines import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+def get_get_job_status_tool() -> Tool:
+    """Get the get_job_status tool definition."""
+    return Tool(
+        name="get_job_status",
+        description="Returns the status, progress and result of a job queued by save_prompt with async_mode.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "The job ID returned by save_prompt",
+                },
+            },
+            "required": ["job_id"],
+        },
+    )
+
+
+async def handle_get_job_status(job_id: str) -> list[TextContent]:
+    """
+    Handle get_job_status tool execution.
+
+    Args:
+        job_id: ID of the job
+
+    Returns:
+        List of text content with the job status
+    """
+    try:
+        job = await run_blocking("database", job_queue.get, job_id)
+        if not job:
+            return [TextContent(type="text", text=f"Error: Job with ID {job_id} not found.")]
+
+        details = [
+            "# Job Status\n",
+            f"**Job ID:** {job_id}",
+            f"**Type:** {job['kind']}",
+            f"**Status:** {job['status']}",
+            f"**Progress:** {job['progress']}",
+            f"**Attempts:** {job['attempts']}/{job['max_attempts']}",
+            f"**Created:** {job['created_at']}",
+            f"**Last Updated:** {job['updated_at']}",
+        ]
+
+        result = job.get("result") or {}
+        if job["status"] == STATUS_SUCCEEDED and result.get("prompt_id"):
+            details.append(f"\n**Prompt ID:** {result['prompt_id']}")
+            details.append(f"**Use Case:** {result['use_case']}")
+            details.append(f"**Summary:** {result['summary']}")
+        if job.get("error"):
+            label = "Error" if job["status"] == STATUS_FAILED else "Last Error"
+            details.append(f"\n**{label}:** {job['error']}")
+
+        return [TextContent(type="text", text="\n".join(details))]
+    except Exception as e:
+        error_message = f"Failed to get job status: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        return [TextContent(type="text", text=f"Error: {error_message}")]
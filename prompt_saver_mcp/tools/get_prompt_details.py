@@ -1,19 +1,27 @@
 """Tool for retrieving full prompt details."""
 
 import logging
+from typing import List, Optional
 
 from mcp.types import Tool, TextContent
 
 from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
+from prompt_saver_mcp.utils.template_outline import build_outline, find_section, format_outline
+from prompt_saver_mcp.utils.tokens import slice_tokens
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHANGELOG_LIMIT = 10
+
+MODES = ["full", "outline", "sections", "range"]
+
 
 def get_get_prompt_details_tool() -> Tool:
     """Get the get_prompt_details tool definition."""
     return Tool(
         name="get_prompt_details",
-        description="Retrieves the complete details of a specific prompt including the full template, history, and metadata.",
+        description="Retrieves the details of a specific prompt. By default returns the full template, history, and metadata; use mode 'outline' to list the template's sections, then 'sections' or 'range' to fetch only the parts you need.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -21,24 +29,76 @@ def get_get_prompt_details_tool() -> Tool:
                     "type": "string",
                     "description": "The ID of the prompt to retrieve",
                 },
+                "changelog_limit": {
+                    "type": "integer",
+                    "description": f"Number of most recent changelog entries to include (default: {DEFAULT_CHANGELOG_LIMIT}, 0 to omit)",
+                    "default": DEFAULT_CHANGELOG_LIMIT,
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "full (default): whole template and history; outline: heading outline only; sections: selected sections; range: a character or token range of the template",
+                    "enum": MODES,
+                    "default": "full",
+                },
+                "sections": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Heading paths to return in 'sections' mode, e.g. ['Overview', 'Steps/Validation']",
+                },
+                "start": {
+                    "type": "integer",
+                    "description": "Start offset for 'range' mode (default: 0)",
+                },
+                "end": {
+                    "type": "integer",
+                    "description": "End offset (exclusive) for 'range' mode (default: end of template)",
+                },
+                "unit": {
+                    "type": "string",
+                    "description": "Unit of start/end in 'range' mode: chars (default) or tokens",
+                    "enum": ["chars", "tokens"],
+                    "default": "chars",
+                },
             },
             "required": ["prompt_id"],
         },
     )
 
 
-async def handle_get_prompt_details(prompt_id: str) -> list[TextContent]:
+async def handle_get_prompt_details(
+    prompt_id: str,
+    changelog_limit: Optional[int] = DEFAULT_CHANGELOG_LIMIT,
+    mode: Optional[str] = "full",
+    sections: Optional[List[str]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    unit: Optional[str] = "chars",
+) -> list[TextContent]:
     """
     Handle get_prompt_details tool execution.
 
     Args:
         prompt_id: ID of the prompt to retrieve
+        changelog_limit: Number of most recent changelog entries to include
+        mode: full, outline, sections or range
+        sections: Heading paths to return in sections mode
+        start: Start offset in range mode
+        end: End offset (exclusive) in range mode
+        unit: Unit of start/end in range mode: chars or tokens
 
     Returns:
         List of text content with prompt details
     """
     try:
-        prompt = mongodb_client.get_prompt(prompt_id)
+        mode = mode or "full"
+        if mode not in MODES:
+            return [
+                TextContent(
+                    type="text", text=f"Invalid mode. Must be one of: {', '.join(MODES)}"
+                )
+            ]
+
+        prompt = await run_blocking("database", mongodb_client.get_prompt, prompt_id)
         if not prompt:
             return [
                 TextContent(
@@ -54,23 +114,71 @@ async def handle_get_prompt_details(prompt_id: str) -> list[TextContent]:
             f"**Summary:** {prompt.summary}",
             f"**Last Updated:** {prompt.last_updated}",
             f"**Number of Updates:** {prompt.num_updates}",
+            f"**Version:** {prompt.version}",
         ]
 
         if prompt.created_by:
             details.append(f"**Created By:** {prompt.created_by}")
 
-        if prompt.changelog:
-            details.append(f"\n## Changelog")
-            for i, change in enumerate(prompt.changelog, 1):
-                details.append(f"{i}. {change}")
-
-        details.append(f"\n## History\n{prompt.history}")
-
-        details.append(f"\n## Prompt Template\n\n{prompt.prompt_template}")
+        if changelog_limit is None:
+            changelog_limit = DEFAULT_CHANGELOG_LIMIT
+        if changelog_limit > 0:
+            changelog = await run_blocking(
+                "database", mongodb_client.get_changelog, prompt_id, limit=changelog_limit
+            )
+            if changelog:
+                details.append(f"\n## Changelog (latest {len(changelog)})")
+                for change in changelog:
+                    label = f"v{change['version']}" if change["version"] else "legacy"
+                    details.append(f"- **{label}:** {change['entry']}")
+
+        template = prompt.prompt_template
+        # Documents saved before outlines were cached are parsed on the fly
+        outline = prompt.template_outline
+        if outline is None:
+            outline = build_outline(template)
+
+        if mode == "full":
+            details.append(f"\n## History\n{prompt.history}")
+            details.append(f"\n## Prompt Template\n\n{template}")
+
+        elif mode == "outline":
+            details.append(f"\n## Template Outline ({len(template)} chars)\n")
+            details.append(format_outline(outline) if outline else "(no headings)")
+            details.append(
+                "\nUse mode 'sections' with heading paths, or 'range', to fetch parts of the template."
+            )
+
+        elif mode == "sections":
+            if not sections:
+                return [
+                    TextContent(
+                        type="text", text="Error: 'sections' mode requires a list of heading paths."
+                    )
+                ]
+            for path in sections:
+                section = find_section(outline, path)
+                if section is None:
+                    details.append(f"\n## {path}\n\n(section not found)")
+                else:
+                    details.append(
+                        f"\n## Section `{section['path']}`\n\n"
+                        f"{template[section['start']:section['end']]}"
+                    )
+
+        else:
+            start = start or 0
+            if unit == "tokens":
+                excerpt = slice_tokens(template, start, end)
+            else:
+                excerpt = template[start:end]
+            end_label = end if end is not None else "end"
+            details.append(
+                f"\n## Prompt Template ({unit or 'chars'} {start}-{end_label})\n\n{excerpt}"
+            )
 
         return [TextContent(type="text", text="\n".join(details))]
     except Exception as e:
         error_message = f"Failed to get prompt details: {str(e)}"
         logger.error(error_message, exc_info=True)
         return [TextContent(type="text", text=f"Error: {error_message}")]
-
@@ -0,0 +1,71 @@
+"""Tool for retrieving a past revision of a prompt template."""
+
+import logging
+
+from mcp.types import Tool, TextContent
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+def get_get_prompt_version_tool() -> Tool:
+    """Get the get_prompt_version tool definition."""
+    return Tool(
+        name="get_prompt_version",
+        description="Reconstructs a past revision of a prompt template by version number. Use get_prompt_details to see the current version and changelog.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "prompt_id": {
+                    "type": "string",
+                    "description": "The ID of the prompt",
+                },
+                "version": {
+                    "type": "integer",
+                    "description": "The revision number to reconstruct (1 is the original template)",
+                },
+            },
+            "required": ["prompt_id", "version"],
+        },
+    )
+
+
+async def handle_get_prompt_version(prompt_id: str, version: int) -> list[TextContent]:
+    """
+    Handle get_prompt_version tool execution.
+
+    Args:
+        prompt_id: ID of the prompt
+        version: Revision number to reconstruct
+
+    Returns:
+        List of text content with the reconstructed template
+    """
+    try:
+        revision = await run_blocking(
+            "database", mongodb_client.get_prompt_version, prompt_id, version
+        )
+        if not revision:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Error: Version {version} of prompt {prompt_id} not found.",
+                )
+            ]
+
+        details = [
+            f"# Prompt Version {version}\n",
+            f"**Prompt ID:** {prompt_id}",
+            f"**Created At:** {revision['created_at']}",
+        ]
+        if revision["changelog_entry"]:
+            details.append(f"**Change:** {revision['changelog_entry']}")
+        details.append(f"\n## Prompt Template\n\n{revision['prompt_template']}")
+
+        return [TextContent(type="text", text="\n".join(details))]
+    except Exception as e:
+        error_message = f"Failed to get prompt version: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        return [TextContent(type="text", text=f"Error: {error_message}")]
@@ -0,0 +1,118 @@
+"""Tool for retrieving several prompts in one call."""
+
+import logging
+from typing import List, Optional
+
+from mcp.types import Tool, TextContent
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
+
+logger = logging.getLogger(__name__)
+
+MAX_PROMPT_IDS = 50
+
+FIELDS = [
+    "use_case",
+    "summary",
+    "prompt_template",
+    "history",
+    "last_updated",
+    "num_updates",
+    "version",
+    "created_by",
+]
+
+DEFAULT_FIELDS = ["use_case", "summary", "prompt_template", "last_updated", "version"]
+
+FIELD_LABELS = {
+    "use_case": "Use Case",
+    "summary": "Summary",
+    "last_updated": "Last Updated",
+    "num_updates": "Number of Updates",
+    "version": "Version",
+    "created_by": "Created By",
+}
+
+
+def get_get_prompts_tool() -> Tool:
+    """Get the get_prompts tool definition."""
+    return Tool(
+        name="get_prompts",
+        description="Retrieves several prompts by ID in one call, in the order given. Reports IDs that were not found. Prefer this over several get_prompt_details calls.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "prompt_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": f"IDs of the prompts to retrieve (max {MAX_PROMPT_IDS})",
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": FIELDS},
+                    "description": f"Fields to return (default: {', '.join(DEFAULT_FIELDS)})",
+                },
+            },
+            "required": ["prompt_ids"],
+        },
+    )
+
+
+async def handle_get_prompts(
+    prompt_ids: List[str], fields: Optional[List[str]] = None
+) -> list[TextContent]:
+    """
+    Handle get_prompts tool execution.
+
+    Args:
+        prompt_ids: IDs of the prompts to retrieve
+        fields: Fields to return
+
+    Returns:
+        List of text content with the prompts
+    """
+    try:
+        if not prompt_ids:
+            return [TextContent(type="text", text="Error: Provide at least one prompt ID.")]
+        if len(prompt_ids) > MAX_PROMPT_IDS:
+            return [
+                TextContent(
+                    type="text", text=f"Error: At most {MAX_PROMPT_IDS} prompt IDs per call."
+                )
+            ]
+
+        fields = fields or DEFAULT_FIELDS
+        invalid = [field for field in fields if field not in FIELDS]
+        if invalid:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Invalid fields: {', '.join(invalid)}. Must be among: {', '.join(FIELDS)}",
+                )
+            ]
+
+        documents, missing = await run_blocking(
+            "database", mongodb_client.get_prompts, prompt_ids, fields
+        )
+
+        lines = [f"Retrieved {len(documents)} of {len(prompt_ids)} prompt(s).\n"]
+        if missing:
+            lines.append(f"**Not Found:** {', '.join(missing)}\n")
+
+        for document in documents:
+            lines.append(f"# Prompt {document['_id']}\n")
+            for field in fields:
+                if field in FIELD_LABELS and document.get(field) is not None:
+                    lines.append(f"**{FIELD_LABELS[field]}:** {document[field]}")
+            if "history" in fields and document.get("history"):
+                lines.append(f"\n## History\n{document['history']}")
+            if "prompt_template" in fields and document.get("prompt_template"):
+                lines.append(f"\n## Prompt Template\n\n{document['prompt_template']}")
+            lines.append("")
+
+        return [TextContent(type="text", text="\n".join(lines))]
+    except Exception as e:
+        error_message = f"Failed to get prompts: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        return [TextContent(type="text", text=f"Error: {error_message}")]
@@ -5,10 +5,10 @@ from typing import Optional
 
 from mcp.types import Tool, TextContent
 
-from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.database.mongodb_client import VersionConflict, mongodb_client
 from prompt_saver_mcp.database.models import PromptUpdate
-from prompt_saver_mcp.embeddings.voyage_client import voyage_client
 from prompt_saver_mcp.llm.openai_client import openai_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -54,8 +54,10 @@ async def handle_improve_prompt_from_feedback(
         List of text content with improved prompt
     """
     try:
-        # Get existing prompt
-        existing_prompt = mongodb_client.get_prompt(prompt_id)
+        # Get the template and the version the improvement is based on
+        existing_prompt = await run_blocking(
+            "database", mongodb_client.get_prompt_fields, prompt_id, ["prompt_template", "version"]
+        )
         if not existing_prompt:
             return [
                 TextContent(
@@ -65,24 +67,29 @@ async def handle_improve_prompt_from_feedback(
 
         # Use OpenAI to improve the prompt
         logger.info(f"Improving prompt {prompt_id} based on feedback...")
-        improved_template = openai_client.improve_prompt_from_feedback(
-            existing_prompt.prompt_template, feedback, conversation_context
+        improved_template = await openai_client.improve_prompt_from_feedback_async(
+            existing_prompt["prompt_template"],
+            feedback,
+            conversation_context,
         )
 
-        # Regenerate embedding since template changed
-        logger.info("Regenerating embedding for improved prompt...")
-        new_embedding = voyage_client.generate_embedding(existing_prompt.summary)
-
-        # Update prompt with improved template
+        # Update prompt with improved template. The embedding is of the summary, which
+        # is unchanged, so it is kept as is.
         update_data = PromptUpdate(
             prompt_template=improved_template,
-            embedding=new_embedding,
             changelog_entry=f"Improved prompt based on feedback: {feedback}",
         )
 
-        success = mongodb_client.update_prompt(prompt_id, update_data)
+        # Fails rather than overwrite an update made while the LLM was running
+        updated = await run_blocking(
+            "database",
+            mongodb_client.update_prompt,
+            prompt_id,
+            update_data,
+            current=existing_prompt,
+        )
 
-        if success:
+        if updated:
             result_message = f"""Successfully improved prompt {prompt_id}!
 
 **Feedback:** {feedback}
@@ -97,9 +104,17 @@ async def handle_improve_prompt_from_feedback(
         else:
             return [
                 TextContent(
-                    type="text", text=f"Error: Failed to update prompt {prompt_id}."
+                    type="text", text=f"Error: Prompt with ID {prompt_id} not found."
                 )
             ]
+    except VersionConflict as e:
+        logger.warning(str(e))
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: {e} while the improvement was generated. Retry to improve the latest version.",
+            )
+        ]
     except Exception as e:
         error_message = f"Failed to improve prompt: {str(e)}"
         logger.error(error_message, exc_info=True)
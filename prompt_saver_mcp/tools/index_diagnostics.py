@@ -0,0 +1,83 @@
+"""Tool for inspecting database indexes and query plans."""
+
+import logging
+from typing import Optional
+
+from mcp.types import Tool, TextContent
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+def get_index_diagnostics_tool() -> Tool:
+    """Get the get_index_diagnostics tool definition."""
+    return Tool(
+        name="get_index_diagnostics",
+        description="Reports the indexes on the prompts collection and the explain() plans of the listing queries. Optionally creates missing indexes first.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "ensure": {
+                    "type": "boolean",
+                    "description": "Create missing indexes before reporting (default: false)",
+                    "default": False,
+                },
+                "sample_value": {
+                    "type": "string",
+                    "description": "Value used for the equality predicates in explained queries (default: general)",
+                    "default": "general",
+                },
+            },
+        },
+    )
+
+
+async def handle_index_diagnostics(
+    ensure: Optional[bool] = False, sample_value: Optional[str] = "general"
+) -> list[TextContent]:
+    """
+    Handle get_index_diagnostics tool execution.
+
+    Args:
+        ensure: Whether to create missing indexes first
+        sample_value: Value used for the equality predicates in explained queries
+
+    Returns:
+        List of text content with the diagnostics report
+    """
+    try:
+        lines = ["# Index Diagnostics\n"]
+
+        if ensure:
+            logger.info("Ensuring indexes...")
+            ensured = await run_blocking("database", mongodb_client.ensure_indexes)
+            lines.append(f"**Ensured Compound Indexes:** {', '.join(ensured['compound_indexes'])}")
+            lines.append(f"**Vector Index:** {ensured['vector_index']}\n")
+
+        diagnostics = await run_blocking(
+            "database", mongodb_client.index_diagnostics, sample_value or "general"
+        )
+        lines.append(f"**Indexes:** {', '.join(diagnostics['indexes'])}")
+        search_indexes = diagnostics["search_indexes"]
+        lines.append(
+            f"**Search Indexes:** {', '.join(search_indexes) if search_indexes else 'none'}"
+        )
+
+        lines.append("\n## Query Plans")
+        for report in diagnostics["plans"]:
+            lines.append(f"\n### {report['query']} `{report['filter']}`")
+            if "error" in report:
+                lines.append(f"Error: {report['error']}")
+                continue
+            lines.append(f"- **Plan:** {report['plan']}")
+            lines.append(f"- **Keys Examined:** {report['keys_examined']}")
+            lines.append(f"- **Docs Examined:** {report['docs_examined']}")
+            lines.append(f"- **Returned:** {report['returned']}")
+
+        return [TextContent(type="text", text="\n".join(lines))]
+    except Exception as e:
+        error_message = f"Failed to collect index diagnostics: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        return [TextContent(type="text", text=f"Error: {error_message}")]
@@ -1,12 +1,17 @@
 """Tool for previewing prompt before saving."""
 
+import asyncio
+import json
 import logging
 from typing import Optional
 
 from mcp.types import Tool, TextContent
 
+from prompt_saver_mcp.embeddings.classifier import choose_use_case, load_use_case_classifier
+from prompt_saver_mcp.embeddings.client import embedding_client
 from prompt_saver_mcp.llm.openai_client import openai_client
-from prompt_saver_mcp.utils.prompt_formatter import format_prompt_template, parse_conversation_json
+from prompt_saver_mcp.utils.compaction import prepare_conversation
+from prompt_saver_mcp.utils.prompt_formatter import format_prompt_template, iter_conversation_json
 
 logger = logging.getLogger(__name__)
 
@@ -49,17 +54,52 @@ async def handle_preview_prompt(
     """
     try:
         # Parse conversation JSON
-        messages = parse_conversation_json(conversation_messages)
+        messages, compaction = await asyncio.to_thread(
+            prepare_conversation, iter_conversation_json(conversation_messages)
+        )
+
+        # Categorize like save_prompt would: a trained classifier replaces the LLM's label
+        classifier = await load_use_case_classifier()
+        classify = classifier is not None and classifier.complete
 
         # Analyze conversation with OpenAI
         logger.info("Analyzing conversation with OpenAI for preview...")
-        analysis_result = openai_client.analyze_conversation(messages, task_description)
+        analysis_result = await openai_client.analyze_conversation_async(
+            messages, task_description, categorize=not classify
+        )
+        embedding = None
+        if classify:
+            embedding = await embedding_client.generate_embedding_async(
+                analysis_result["summary"]
+            )
+        # A preview is not saved, so it does not train the classifier
+        analysis_result["use_case"] = choose_use_case(
+            classifier, embedding, analysis_result["use_case"], train=False
+        )
 
         # Format prompt template
         prompt_template = format_prompt_template(messages, analysis_result)
 
+        compaction_note = (
+            f"\n🗜️ **Conversation compacted:** {compaction.describe()}\n"
+            if compaction is not None and compaction.tokens_saved
+            else ""
+        )
+
         # Store preview data in a special format for later saving
-        # We'll return it in a structured way for Cursor to display
+        # We'll return it in a structured way for Cursor to display. The conversation
+        # itself is not echoed back: save_approved_prompt does not need it.
+        preview_data = json.dumps(
+            {
+                "use_case": analysis_result["use_case"],
+                "summary": analysis_result["summary"],
+                "prompt_template": prompt_template,
+                "history": analysis_result["history"],
+                "task_description": task_description,
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
         preview_message = f"""📋 PROMPT PREVIEW
 
 📁 **Category:** {analysis_result['use_case']}
@@ -74,21 +114,14 @@ async def handle_preview_prompt(
 {'-' * 60}
 {prompt_template}
 {'-' * 60}
-
+{compaction_note}
 ---
 
 💡 **To save this prompt:** Use the `save_approved_prompt` tool with this preview data.
 
 **Preview Data (for saving):**
 ```json
-{{
-  "use_case": "{analysis_result['use_case']}",
-  "summary": "{analysis_result['summary']}",
-  "prompt_template": {prompt_template.__repr__()},
-  "history": "{analysis_result['history']}",
-  "conversation_messages": {conversation_messages.__repr__()},
-  "task_description": "{task_description}"
-}}
+{preview_data}
 ```
 
 **Note:** You can ask me to regenerate with specific feedback before saving, or proceed to save this version.
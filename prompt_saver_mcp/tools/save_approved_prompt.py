@@ -7,7 +7,9 @@ from mcp.types import Tool, TextContent
 
 from prompt_saver_mcp.database.mongodb_client import mongodb_client
 from prompt_saver_mcp.database.models import PromptCreate
-from prompt_saver_mcp.embeddings.voyage_client import voyage_client
+from prompt_saver_mcp.embeddings.classifier import load_use_case_classifier
+from prompt_saver_mcp.embeddings.client import embedding_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +71,7 @@ async def handle_save_approved_prompt(
     try:
         # Generate embedding
         logger.info("Generating embedding for approved prompt...")
-        embedding = voyage_client.generate_embedding(summary)
+        embedding = await embedding_client.generate_embedding_async(summary)
 
         # Create prompt data
         prompt_data = PromptCreate(
@@ -78,12 +80,18 @@ async def handle_save_approved_prompt(
             prompt_template=prompt_template,
             history=history,
             embedding=embedding,
+            embedding_model=embedding_client.model_id,
             created_by=None,
         )
 
         # Save to MongoDB
         logger.info("Saving approved prompt to database...")
-        prompt_id = mongodb_client.create_prompt(prompt_data)
+        prompt_id = await run_blocking("database", mongodb_client.create_prompt, prompt_data)
+
+        # Reviewed labels keep the use case classifier current
+        classifier = await load_use_case_classifier()
+        if classifier is not None:
+            classifier.add(embedding, use_case)
 
         result_message = f"""✅ Successfully saved prompt!
 
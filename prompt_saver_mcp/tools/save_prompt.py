@@ -1,15 +1,23 @@
 """Tool for saving conversation threads as prompts."""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, TextIO, Union
 
+from bson import ObjectId
 from mcp.types import Tool, TextContent
 
+from prompt_saver_mcp.config import config
 from prompt_saver_mcp.database.mongodb_client import mongodb_client
 from prompt_saver_mcp.database.models import PromptCreate
-from prompt_saver_mcp.embeddings.voyage_client import voyage_client
+from prompt_saver_mcp.embeddings.classifier import choose_use_case, load_use_case_classifier
+from prompt_saver_mcp.embeddings.client import embedding_client
+from prompt_saver_mcp.jobs.queue import job_queue
+from prompt_saver_mcp.jobs.worker import JobWorkerPool
 from prompt_saver_mcp.llm.openai_client import openai_client
-from prompt_saver_mcp.utils.prompt_formatter import format_prompt_template, parse_conversation_json
+from prompt_saver_mcp.utils.compaction import prepare_conversation
+from prompt_saver_mcp.utils.deadlines import deadline, run_blocking
+from prompt_saver_mcp.utils.prompt_formatter import format_prompt_template, iter_conversation_json
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +26,7 @@ def get_save_prompt_tool() -> Tool:
     """Get the save_prompt tool definition."""
     return Tool(
         name="save_prompt",
-        description="Summarizes, categorizes, and converts conversation history into a markdown formatted prompt template. Run upon completion of a successful complex task to build your prompt library.",
+        description="Summarizes, categorizes, and converts conversation history into a markdown formatted prompt template. Run upon completion of a successful complex task to build your prompt library. Set async_mode to get a job ID immediately and poll get_job_status instead of waiting.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -34,64 +42,185 @@ def get_save_prompt_tool() -> Tool:
                     "type": "string",
                     "description": "Additional context about the conversation",
                 },
+                "async_mode": {
+                    "type": "boolean",
+                    "description": "Queue the save and return a job ID right away (default: false)",
+                    "default": False,
+                },
             },
             "required": ["conversation_messages"],
         },
     )
 
 
+SAVE_PROMPT_JOB = "save_prompt"
+
+
+async def run_save_pipeline(
+    messages: List[Dict[str, Any]],
+    task_description: Optional[str] = None,
+    prompt_id: Optional[str] = None,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze a conversation, embed its summary and store the resulting prompt.
+
+    Args:
+        messages: Parsed conversation messages
+        task_description: Optional task description
+        prompt_id: Optional preassigned prompt ID (makes retries idempotent)
+        progress: Optional callback receiving the current step
+
+    Returns:
+        Dictionary with prompt_id, use_case and summary
+    """
+    report = progress or (lambda step: None)
+
+    # A use case classifier trained on every label replaces the LLM's categorization
+    classifier = await load_use_case_classifier()
+    classify = classifier is not None and classifier.complete
+
+    # Analyze conversation with OpenAI
+    logger.info("Analyzing conversation with OpenAI...")
+    report("analyzing conversation")
+    template_task = None
+    try:
+        if config.ANALYSIS_SPLIT_ENABLED:
+            # The template is generated while the summary is embedded and classified
+            template_task = asyncio.ensure_future(
+                openai_client.generate_template_async(messages, task_description)
+            )
+            analysis_result = await openai_client.summarize_conversation_async(
+                messages, task_description, categorize=not classify
+            )
+        else:
+            analysis_result = await openai_client.analyze_conversation_async(
+                messages, task_description, categorize=not classify
+            )
+
+        # Generate embedding
+        logger.info("Generating embedding...")
+        report("generating embedding")
+        embedding = await embedding_client.generate_embedding_async(analysis_result["summary"])
+
+        analysis_result["use_case"] = choose_use_case(
+            classifier, embedding, analysis_result["use_case"]
+        )
+
+        if template_task is not None:
+            report("generating template")
+            analysis_result["prompt_template"] = await template_task
+    finally:
+        if template_task is not None:
+            template_task.cancel()
+
+    # Format prompt template
+    prompt_template = format_prompt_template(messages, analysis_result)
+
+    # Create prompt data
+    prompt_data = PromptCreate(
+        use_case=analysis_result["use_case"],
+        summary=analysis_result["summary"],
+        prompt_template=prompt_template,
+        history=analysis_result["history"],
+        embedding=embedding,
+        embedding_model=embedding_client.model_id,
+        created_by=None,  # Can be extended to include user identification
+    )
+
+    # Save to MongoDB
+    logger.info("Saving prompt to database...")
+    report("saving prompt")
+    prompt_id = await run_blocking(
+        "database", mongodb_client.create_prompt, prompt_data, prompt_id=prompt_id
+    )
+
+    return {
+        "prompt_id": prompt_id,
+        "use_case": analysis_result["use_case"],
+        "summary": analysis_result["summary"],
+    }
+
+
+async def run_save_job(
+    payload: Dict[str, Any], progress: Callable[[str], None]
+) -> Dict[str, Any]:
+    """Job handler for queued saves; each attempt gets the save_prompt deadline."""
+    with deadline(config.tool_deadline(SAVE_PROMPT_JOB)):
+        return await run_save_pipeline(
+            payload["messages"],
+            payload.get("task_description"),
+            prompt_id=payload["prompt_id"],
+            progress=progress,
+        )
+
+
+# Background workers for queued saves; started on the first one (see JOB_WORKERS_ON_STARTUP)
+save_workers = JobWorkerPool(job_queue, {SAVE_PROMPT_JOB: run_save_job})
+
+
 async def handle_save_prompt(
-    conversation_messages: str,
+    conversation_messages: Union[str, TextIO],
     task_description: Optional[str] = None,
     context_info: Optional[str] = None,
+    async_mode: Optional[bool] = False,
 ) -> list[TextContent]:
     """
     Handle save_prompt tool execution.
 
     Args:
-        conversation_messages: JSON string containing conversation history
+        conversation_messages: JSON string (or text stream) containing conversation history
         task_description: Optional task description
         context_info: Optional context information
+        async_mode: Queue the save and return a job ID instead of waiting
 
     Returns:
         List of text content with result message
     """
     try:
-        # Parse conversation JSON
-        messages = parse_conversation_json(conversation_messages)
+        # Parse and compact the conversation one message at a time, before queueing too
+        # so job documents stay small
+        messages, compaction = await asyncio.to_thread(
+            prepare_conversation, iter_conversation_json(conversation_messages)
+        )
+        compaction_note = (
+            f"\n\n**Conversation compacted:** {compaction.describe()}"
+            if compaction is not None and compaction.tokens_saved
+            else ""
+        )
 
-        # Analyze conversation with OpenAI
-        logger.info("Analyzing conversation with OpenAI...")
-        analysis_result = openai_client.analyze_conversation(messages, task_description)
+        if async_mode:
+            job_id = await run_blocking(
+                "database",
+                job_queue.enqueue,
+                SAVE_PROMPT_JOB,
+                {
+                    "messages": messages,
+                    "task_description": task_description,
+                    "prompt_id": str(ObjectId()),
+                },
+            )
+            save_workers.start(config.JOB_WORKER_IDLE_TIMEOUT)
+            result_message = f"""Queued prompt save.
 
-        # Format prompt template
-        prompt_template = format_prompt_template(messages, analysis_result)
+**Job ID:** {job_id}
 
-        # Generate embedding
-        logger.info("Generating embedding...")
-        embedding = voyage_client.generate_embedding(analysis_result["summary"])
-
-        # Create prompt data
-        prompt_data = PromptCreate(
-            use_case=analysis_result["use_case"],
-            summary=analysis_result["summary"],
-            prompt_template=prompt_template,
-            history=analysis_result["history"],
-            embedding=embedding,
-            created_by=None,  # Can be extended to include user identification
-        )
+Use get_job_status with this job ID to follow progress and get the prompt ID once it is saved."""
+            result_message += compaction_note
+            if context_info:
+                result_message += f"\n\n**Context:** {context_info}"
+            return [TextContent(type="text", text=result_message)]
 
-        # Save to MongoDB
-        logger.info("Saving prompt to database...")
-        prompt_id = mongodb_client.create_prompt(prompt_data)
+        saved = await run_save_pipeline(messages, task_description)
 
         result_message = f"""Successfully saved prompt!
 
-**Prompt ID:** {prompt_id}
-**Use Case:** {analysis_result['use_case']}
-**Summary:** {analysis_result['summary']}
+**Prompt ID:** {saved['prompt_id']}
+**Use Case:** {saved['use_case']}
+**Summary:** {saved['summary']}
 
 The prompt has been saved and can be retrieved using the prompt ID or searched using semantic search."""
+        result_message += compaction_note
         if context_info:
             result_message += f"\n\n**Context:** {context_info}"
 
@@ -104,4 +233,3 @@ The prompt has been saved and can be retrieved using the prompt ID or searched u
         error_message = f"Failed to save prompt: {str(e)}"
         logger.error(error_message, exc_info=True)
         return [TextContent(type="text", text=f"Error: {error_message}")]
-
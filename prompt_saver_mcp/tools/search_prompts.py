@@ -1,21 +1,29 @@
 """Tool for searching prompts using vector search."""
 
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from mcp.types import Tool, TextContent
+from pydantic import ValidationError
+from pymongo.errors import OperationFailure
 
+from prompt_saver_mcp.database.models import SearchFilters
 from prompt_saver_mcp.database.mongodb_client import mongodb_client
-from prompt_saver_mcp.embeddings.voyage_client import voyage_client
+from prompt_saver_mcp.embeddings.client import embedding_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
+from prompt_saver_mcp.utils.result_packing import pack_templates
+from prompt_saver_mcp.utils.tokens import count_tokens
 
 logger = logging.getLogger(__name__)
 
+USE_CASES = ["code-gen", "text-gen", "data-analysis", "creative", "general"]
+
 
 def get_search_prompts_tool() -> Tool:
     """Get the search_prompts tool definition."""
     return Tool(
         name="search_prompts",
-        description="Retrieves prompts from the database using semantic search (if Voyage API key is available) or text search as fallback. Returns ranked results with summaries.",
+        description="Retrieves prompts from the database using semantic search, or keyword search while the embedding provider is unavailable. Returns ranked results with summaries.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -28,19 +36,191 @@ def get_search_prompts_tool() -> Tool:
                     "description": "Maximum number of results to return (default: 5)",
                     "default": 5,
                 },
+                "use_case": {
+                    "type": "string",
+                    "description": "Optional use case category to restrict the search to",
+                    "enum": USE_CASES,
+                },
+                "created_by": {
+                    "type": "string",
+                    "description": "Optional creator identifier to restrict the search to",
+                },
+                "updated_after": {
+                    "type": "string",
+                    "description": "Optional ISO 8601 timestamp; only prompts updated after it are searched",
+                },
+                "min_score": {
+                    "type": "number",
+                    "description": "Optional minimum similarity score (0-1) for returned prompts",
+                },
+                "recall_target": {
+                    "type": "number",
+                    "description": "Optional search quality (0-1). Higher values scan more candidates for better recall at the cost of latency.",
+                },
+                "token_budget": {
+                    "type": "integer",
+                    "description": "Optional token budget for the response. Top-ranked templates are inlined (in full or truncated) until it is used up, so no follow-up get_prompt_details call is needed.",
+                },
             },
             "required": ["query"],
         },
     )
 
 
-async def handle_search_prompts(query: str, limit: Optional[int] = 5) -> list[TextContent]:
+def format_search_results(results: List[dict], token_budget: Optional[int] = None) -> str:
+    """
+    Format ranked search results, inlining templates that fit the token budget.
+
+    Args:
+        results: Ranked search results
+        token_budget: Optional token budget for the whole response
+
+    Returns:
+        Markdown-formatted results
+    """
+    entries = []
+    for i, result in enumerate(results, 1):
+        score = result.get("score", 0.0)
+        prompt_id = result.get("_id", "unknown")
+        use_case = result.get("use_case", "unknown")
+        summary = result.get("summary", "No summary")
+        last_updated = result.get("last_updated", "")
+
+        entries.append(
+            f"{i}. **Prompt ID:** {prompt_id}\n"
+            f"   **Use Case:** {use_case}\n"
+            f"   **Summary:** {summary}\n"
+            f"   **Similarity Score:** {score:.3f}\n"
+            f"   **Last Updated:** {last_updated}\n"
+        )
+
+    header = f"Found {len(results)} matching prompt(s):\n"
+    footer = "\nUse `get_prompt_details` with a prompt ID to view the full prompt template."
+    if not token_budget:
+        return "\n".join([header, *entries, footer])
+
+    reserved = count_tokens("\n".join([header, *entries, footer]))
+    packed = pack_templates(results, token_budget, reserved)
+    result_lines = [header]
+    for result, entry, template in zip(results, entries, packed):
+        result_lines.append(entry)
+        if template is None:
+            continue
+        result_lines.append(f"   **Prompt Template:**\n\n{template['text']}\n")
+        if template["truncated"]:
+            result_lines.append(
+                f"   _(template truncated at {template['tokens']} tokens; use "
+                f"`get_prompt_details` with mode 'range', unit 'tokens' and start "
+                f"{template['tokens']} for the rest)_\n"
+            )
+    inlined = sum(1 for template in packed if template is not None)
+    if inlined < len(results):
+        result_lines.append(footer)
+    return "\n".join(result_lines)
+
+
+async def embed_queries(
+    queries: List[str],
+) -> Tuple[List[Optional[List[float]]], Optional[str]]:
+    """
+    Embed search queries, reusing cached embeddings.
+
+    Args:
+        queries: Query strings
+
+    Returns:
+        Embedding per query (None where unavailable) and the reason embeddings are
+        missing, if the embedding service failed or its circuit is open
+    """
+    embeddings = [embedding_client.cached_embedding(query) for query in queries]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if not missing:
+        return embeddings, None
+    try:
+        fresh = await embedding_client.generate_embeddings_batch_async(
+            [queries[i] for i in missing]
+        )
+    except Exception as e:
+        logger.warning(f"Embedding queries failed, degrading to lexical search: {e}")
+        return embeddings, f"embedding failed: {e}"
+    for i, embedding in zip(missing, fresh):
+        embeddings[i] = embedding
+    return embeddings, None
+
+
+async def search_with_fallback(
+    query: str,
+    query_embedding: Optional[List[float]],
+    limit: int,
+    filters: SearchFilters,
+    score_threshold: float = 0.0,
+    recall: Optional[float] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Vector search, falling back to lexical search without an embedding or vector index.
+
+    Args:
+        query: Query string
+        query_embedding: Query embedding, or None if it could not be generated
+        limit: Maximum number of results
+        filters: Pre-filters
+        score_threshold: Minimum similarity score (vector search only)
+        recall: Optional target recall for the approximate search
+
+    Returns:
+        Results and the reason for degrading, or None for a normal vector search
+    """
+    reason = None
+    if query_embedding is not None:
+        try:
+            results = await run_blocking(
+                "database",
+                mongodb_client.vector_search,
+                query_embedding,
+                limit=limit,
+                score_threshold=score_threshold,
+                filters=filters,
+                recall=recall,
+            )
+            return results, None
+        except OperationFailure as e:
+            reason = f"vector search failed: {e}"
+    results = await run_blocking(
+        "database", mongodb_client.text_search, query, limit=limit, filters=filters
+    )
+    return results, reason
+
+
+def format_degraded_notice(reason: str) -> str:
+    """Explain that results come from lexical search."""
+    return (
+        f"**Degraded mode:** {reason}. Showing keyword matches instead of semantic "
+        "matches; scores are relative text relevance.\n"
+    )
+
+
+async def handle_search_prompts(
+    query: str,
+    limit: Optional[int] = 5,
+    use_case: Optional[str] = None,
+    created_by: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    min_score: Optional[float] = None,
+    recall_target: Optional[float] = None,
+    token_budget: Optional[int] = None,
+) -> list[TextContent]:
     """
     Handle search_prompts tool execution.
 
     Args:
         query: Search query string
         limit: Maximum number of results
+        use_case: Optional use case pre-filter
+        created_by: Optional creator pre-filter
+        updated_after: Optional ISO 8601 timestamp pre-filter
+        min_score: Optional minimum similarity score
+        recall_target: Optional target recall for the approximate search
+        token_budget: Optional token budget for inlining templates
 
     Returns:
         List of text content with search results
@@ -49,44 +229,55 @@ async def handle_search_prompts(query: str, limit: Optional[int] = 5) -> list[Te
         if limit is None:
             limit = 5
 
+        if use_case is not None and use_case not in USE_CASES:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Invalid use case. Must be one of: {', '.join(USE_CASES)}",
+                )
+            ]
+
+        try:
+            filters = SearchFilters(
+                use_case=use_case, created_by=created_by, updated_after=updated_after
+            )
+        except ValidationError:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Invalid updated_after timestamp '{updated_after}'. Use ISO 8601, e.g. 2025-01-31T00:00:00Z.",
+                )
+            ]
+
         # Generate embedding for query
         logger.info(f"Generating embedding for query: {query}")
-        query_embedding = voyage_client.generate_embedding(query)
+        embeddings, reason = await embed_queries([query])
 
         # Perform vector search
         logger.info("Performing vector search...")
-        results = mongodb_client.vector_search(query_embedding, limit=limit)
+        results, search_reason = await search_with_fallback(
+            query,
+            embeddings[0],
+            limit,
+            filters,
+            score_threshold=min_score or 0.0,
+            recall=recall_target,
+        )
+        reason = reason or search_reason
+        notice = format_degraded_notice(reason) + "\n" if reason else ""
 
         if not results:
             return [
                 TextContent(
                     type="text",
-                    text="No prompts found matching your query. Try a different search term or save a new prompt.",
+                    text=notice
+                    + "No prompts found matching your query. Try a different search term or save a new prompt.",
                 )
             ]
 
-        # Format results
-        result_lines = [f"Found {len(results)} matching prompt(s):\n"]
-        for i, result in enumerate(results, 1):
-            score = result.get("score", 0.0)
-            prompt_id = result.get("_id", "unknown")
-            use_case = result.get("use_case", "unknown")
-            summary = result.get("summary", "No summary")
-            last_updated = result.get("last_updated", "")
-
-            result_lines.append(
-                f"{i}. **Prompt ID:** {prompt_id}\n"
-                f"   **Use Case:** {use_case}\n"
-                f"   **Summary:** {summary}\n"
-                f"   **Similarity Score:** {score:.3f}\n"
-                f"   **Last Updated:** {last_updated}\n"
-            )
-
-        result_lines.append(
-            "\nUse `get_prompt_details` with a prompt ID to view the full prompt template."
-        )
-
-        return [TextContent(type="text", text="\n".join(result_lines))]
+        return [
+            TextContent(type="text", text=notice + format_search_results(results, token_budget))
+        ]
     except Exception as e:
         error_message = f"Failed to search prompts: {str(e)}"
         logger.error(error_message, exc_info=True)
@@ -0,0 +1,175 @@
+"""Tool for running several semantic searches in one call."""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from mcp.types import Tool, TextContent
+from pydantic import ValidationError
+
+from prompt_saver_mcp.database.models import SearchFilters
+from prompt_saver_mcp.tools.search_prompts import (
+    USE_CASES,
+    embed_queries,
+    format_degraded_notice,
+    format_search_results,
+    search_with_fallback,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERIES = 20
+
+
+def get_search_prompts_batch_tool() -> Tool:
+    """Get the search_prompts_batch tool definition."""
+    return Tool(
+        name="search_prompts_batch",
+        description="Runs several semantic prompt searches in one call. Embeds all queries in a single request, searches concurrently, and returns results grouped by query. Prefer this over several search_prompts calls in a row.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": f"Search queries (max {MAX_QUERIES})",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results per query (default: 5)",
+                    "default": 5,
+                },
+                "dedupe": {
+                    "type": "boolean",
+                    "description": "Show each prompt only under the query it matches best (default: false)",
+                    "default": False,
+                },
+                "use_case": {
+                    "type": "string",
+                    "description": "Optional use case category to restrict all searches to",
+                    "enum": USE_CASES,
+                },
+                "created_by": {
+                    "type": "string",
+                    "description": "Optional creator identifier to restrict all searches to",
+                },
+                "updated_after": {
+                    "type": "string",
+                    "description": "Optional ISO 8601 timestamp; only prompts updated after it are searched",
+                },
+            },
+            "required": ["queries"],
+        },
+    )
+
+
+def dedupe_results(groups: List[List[dict]]) -> List[List[dict]]:
+    """
+    Keep each prompt only in the group where it scored highest.
+
+    Args:
+        groups: Ranked results per query
+
+    Returns:
+        Groups with cross-query duplicates removed
+    """
+    best: Dict[str, tuple] = {}
+    for group_index, group in enumerate(groups):
+        for result in group:
+            score = result.get("score", 0.0)
+            prompt_id = result.get("_id")
+            if prompt_id not in best or score > best[prompt_id][0]:
+                best[prompt_id] = (score, group_index)
+    return [
+        [result for result in group if best[result.get("_id")][1] == group_index]
+        for group_index, group in enumerate(groups)
+    ]
+
+
+async def handle_search_prompts_batch(
+    queries: List[str],
+    limit: Optional[int] = 5,
+    dedupe: Optional[bool] = False,
+    use_case: Optional[str] = None,
+    created_by: Optional[str] = None,
+    updated_after: Optional[str] = None,
+) -> list[TextContent]:
+    """
+    Handle search_prompts_batch tool execution.
+
+    Args:
+        queries: Search query strings
+        limit: Maximum number of results per query
+        dedupe: Show each prompt only under its best-matching query
+        use_case: Optional use case pre-filter
+        created_by: Optional creator pre-filter
+        updated_after: Optional ISO 8601 timestamp pre-filter
+
+    Returns:
+        List of text content with grouped search results
+    """
+    try:
+        queries = [query for query in (queries or []) if query and query.strip()]
+        if not queries:
+            return [TextContent(type="text", text="Error: Provide at least one query.")]
+        if len(queries) > MAX_QUERIES:
+            return [
+                TextContent(
+                    type="text", text=f"Error: At most {MAX_QUERIES} queries per batch."
+                )
+            ]
+
+        if limit is None:
+            limit = 5
+
+        if use_case is not None and use_case not in USE_CASES:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Invalid use case. Must be one of: {', '.join(USE_CASES)}",
+                )
+            ]
+
+        try:
+            filters = SearchFilters(
+                use_case=use_case, created_by=created_by, updated_after=updated_after
+            )
+        except ValidationError:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Invalid updated_after timestamp '{updated_after}'. Use ISO 8601, e.g. 2025-01-31T00:00:00Z.",
+                )
+            ]
+
+        # One embedding request for all queries
+        logger.info(f"Generating embeddings for {len(queries)} queries...")
+        embeddings, reason = await embed_queries(queries)
+
+        # Run the searches concurrently
+        logger.info("Performing vector searches...")
+        outcomes = await asyncio.gather(
+            *(
+                search_with_fallback(query, embedding, limit, filters)
+                for query, embedding in zip(queries, embeddings)
+            )
+        )
+        groups = [results for results, _ in outcomes]
+        reason = reason or next((r for _, r in outcomes if r), None)
+
+        if dedupe:
+            groups = dedupe_results(groups)
+
+        sections = [format_degraded_notice(reason)] if reason else []
+        for i, (query, group) in enumerate(zip(queries, groups), 1):
+            sections.append(f"## Query {i}: {query}")
+            if group:
+                sections.append(format_search_results(group))
+            else:
+                sections.append("No prompts found matching this query.")
+
+        return [TextContent(type="text", text="\n\n".join(sections))]
+    except Exception as e:
+        error_message = f"Failed to search prompts: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        return [TextContent(type="text", text=f"Error: {error_message}")]
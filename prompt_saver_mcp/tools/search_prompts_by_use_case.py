@@ -6,17 +6,20 @@ from typing import Optional
 from mcp.types import Tool, TextContent
 
 from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
 
 logger = logging.getLogger(__name__)
 
 USE_CASES = ["code-gen", "text-gen", "data-analysis", "creative", "general"]
 
+MAX_PAGE_SIZE = 100
+
 
 def get_search_prompts_by_use_case_tool() -> Tool:
     """Get the search_prompts_by_use_case tool definition."""
     return Tool(
         name="search_prompts_by_use_case",
-        description="Retrieves prompts filtered by use case category. Use cases: code-gen, text-gen, data-analysis, creative, general.",
+        description="Lists prompts in a use case category, newest first, one page at a time. Use cases: code-gen, text-gen, data-analysis, creative, general. Pass the returned next_cursor to get the following page.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -27,9 +30,13 @@ def get_search_prompts_by_use_case_tool() -> Tool:
                 },
                 "limit": {
                     "type": "integer",
-                    "description": "Maximum number of results to return (default: 10)",
+                    "description": f"Maximum number of results per page (default: 10, max: {MAX_PAGE_SIZE})",
                     "default": 10,
                 },
+                "cursor": {
+                    "type": "string",
+                    "description": "Continuation token (next_cursor) from the previous page",
+                },
             },
             "required": ["use_case"],
         },
@@ -37,14 +44,15 @@ def get_search_prompts_by_use_case_tool() -> Tool:
 
 
 async def handle_search_prompts_by_use_case(
-    use_case: str, limit: Optional[int] = 10
+    use_case: str, limit: Optional[int] = 10, cursor: Optional[str] = None
 ) -> list[TextContent]:
     """
     Handle search_prompts_by_use_case tool execution.
 
     Args:
         use_case: Use case category to filter by
-        limit: Maximum number of results
+        limit: Maximum number of results per page
+        cursor: Optional continuation token from the previous page
 
     Returns:
         List of text content with search results
@@ -60,10 +68,21 @@ async def handle_search_prompts_by_use_case(
 
         if limit is None:
             limit = 10
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
 
-        # Search by use case
+        # List one page of the use case
         logger.info(f"Searching prompts for use case: {use_case}")
-        results = mongodb_client.search_by_use_case(use_case, limit=limit)
+        try:
+            results, next_cursor = await run_blocking(
+                "database", mongodb_client.list_by_use_case, use_case, limit=limit, cursor=cursor
+            )
+        except ValueError as e:
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+        if not results and cursor:
+            return [
+                TextContent(type="text", text=f"No more prompts for use case '{use_case}'.")
+            ]
 
         if not results:
             return [
@@ -86,6 +105,10 @@ async def handle_search_prompts_by_use_case(
                 f"   **Last Updated:** {last_updated}\n"
             )
 
+        if next_cursor:
+            result_lines.append(f"**next_cursor:** {next_cursor}")
+            result_lines.append("Pass `cursor` with this value to get the next page.")
+
         result_lines.append(
             "\nUse `get_prompt_details` with a prompt ID to view the full prompt template."
         )
@@ -0,0 +1,81 @@
+"""Tool for inspecting server load and admission control metrics."""
+
+import logging
+
+from mcp.types import Tool, TextContent
+
+from prompt_saver_mcp.llm.providers import provider_snapshots
+from prompt_saver_mcp.utils.admission import get_admission_controller
+from prompt_saver_mcp.utils.circuit_breaker import breaker_snapshots
+from prompt_saver_mcp.utils.compaction import compaction_totals
+
+logger = logging.getLogger(__name__)
+
+
+def get_server_metrics_tool() -> Tool:
+    """Get the get_server_metrics tool definition."""
+    return Tool(
+        name="get_server_metrics",
+        description="Reports concurrency, queue depth, rejections and wait times per admission class (interactive vs LLM-bound calls), the load of each LLM provider, tokens saved by conversation compaction, and the circuit breaker state of each dependency.",
+        inputSchema={"type": "object", "properties": {}},
+    )
+
+
+async def handle_server_metrics() -> list[TextContent]:
+    """
+    Handle get_server_metrics tool execution.
+
+    Returns:
+        List of text content with the metrics report
+    """
+    try:
+        metrics = get_admission_controller().snapshot()
+        lines = [
+            "# Server Metrics\n",
+            f"**In Flight:** {metrics['in_flight']}/{metrics['total_limit']}",
+        ]
+        for name, stats in metrics["classes"].items():
+            lines.append(f"\n## {name}")
+            lines.append(f"- In flight: {stats['in_flight']}/{stats['limit']}")
+            lines.append(f"- Queued: {stats['queued']} (max {stats['max_queued']})")
+            lines.append(f"- Admitted: {stats['admitted']}, rejected: {stats['rejected']}")
+            lines.append(
+                f"- Wait p50/p95: {stats['wait_p50_ms']} / {stats['wait_p95_ms']} ms"
+            )
+            lines.append(f"- Mean duration: {stats['mean_duration_ms']} ms")
+
+        providers = provider_snapshots()
+        if providers:
+            lines.append("\n## LLM Providers")
+            for name, stats in providers.items():
+                lines.append(
+                    f"- {name} ({stats['model']} at {stats['base_url']}): "
+                    f"{stats['in_flight']}/{stats['max_concurrency']} in flight, "
+                    f"{stats['waiting']} waiting"
+                )
+
+        compaction = compaction_totals()
+        if compaction["conversations"]:
+            lines.append("\n## Conversation Compaction")
+            lines.append(
+                f"- {compaction['conversations']} conversations, "
+                f"{compaction['tokens_saved']:,} of {compaction['tokens_before']:,} tokens saved"
+            )
+
+        breakers = breaker_snapshots()
+        if breakers:
+            lines.append("\n## Circuit Breakers")
+            for name, stats in breakers.items():
+                line = (
+                    f"- {name}: {stats['state']} (trips: {stats['trips']}, "
+                    f"rejected: {stats['rejected']}"
+                )
+                if stats["retry_after_s"]:
+                    line += f", retry in {stats['retry_after_s']}s"
+                lines.append(line + ")")
+
+        return [TextContent(type="text", text="\n".join(lines))]
+    except Exception as e:
+        error_message = f"Failed to get server metrics: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        return [TextContent(type="text", text=f"Error: {error_message}")]
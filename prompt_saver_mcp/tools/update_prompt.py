@@ -5,9 +5,10 @@ from typing import Optional
 
 from mcp.types import Tool, TextContent
 
-from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.database.mongodb_client import VersionConflict, mongodb_client
 from prompt_saver_mcp.database.models import PromptUpdate
-from prompt_saver_mcp.embeddings.voyage_client import voyage_client
+from prompt_saver_mcp.embeddings.client import embedding_client
+from prompt_saver_mcp.utils.deadlines import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,7 @@ def get_update_prompt_tool() -> Tool:
     """Get the update_prompt tool definition."""
     return Tool(
         name="update_prompt",
-        description="Updates an existing prompt with new information. Regenerates embedding if summary changes. Tracks changes in changelog.",
+        description="Updates an existing prompt with new information. Regenerates embedding if summary changes. Tracks changes in changelog. Pass expected_version to reject the update if the prompt changed since you read it.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -44,6 +45,10 @@ def get_update_prompt_tool() -> Tool:
                     "type": "string",
                     "description": "Optional updated history",
                 },
+                "expected_version": {
+                    "type": "integer",
+                    "description": "Optional version the update is based on; the update fails if the prompt has a newer version",
+                },
             },
             "required": ["prompt_id", "change_description"],
         },
@@ -57,6 +62,7 @@ async def handle_update_prompt(
     summary: Optional[str] = None,
     use_case: Optional[str] = None,
     history: Optional[str] = None,
+    expected_version: Optional[int] = None,
 ) -> list[TextContent]:
     """
     Handle update_prompt tool execution.
@@ -68,25 +74,40 @@ async def handle_update_prompt(
         summary: Optional new summary (triggers embedding regeneration)
         use_case: Optional new use case
         history: Optional updated history
+        expected_version: Optional version the update must apply to
 
     Returns:
         List of text content with result message
     """
     try:
-        # Get existing prompt to check if summary changed
-        existing_prompt = mongodb_client.get_prompt(prompt_id)
+        # Read only what the update needs: the summary to check for changes, and the
+        # template and version the new revision is based on
+        existing_prompt = await run_blocking(
+            "database",
+            mongodb_client.get_prompt_fields,
+            prompt_id,
+            ["summary", "prompt_template", "version"],
+        )
         if not existing_prompt:
             return [
                 TextContent(
                     type="text", text=f"Error: Prompt with ID {prompt_id} not found."
                 )
             ]
+        current_version = existing_prompt.get("version", 1)
+        if expected_version is not None and expected_version != current_version:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Error: Prompt {prompt_id} is at version {current_version}, not {expected_version}. Re-read it and retry.",
+                )
+            ]
 
         # Regenerate embedding if summary changed
         embedding = None
-        if summary and summary != existing_prompt.summary:
+        if summary and summary != existing_prompt.get("summary"):
             logger.info("Summary changed, regenerating embedding...")
-            embedding = voyage_client.generate_embedding(summary)
+            embedding = await embedding_client.generate_embedding_async(summary)
 
         # Prepare update data
         update_data = PromptUpdate(
@@ -95,16 +116,24 @@ async def handle_update_prompt(
             use_case=use_case,
             history=history,
             embedding=embedding,
+            embedding_model=embedding_client.model_id if embedding else None,
             changelog_entry=change_description,
         )
 
         # Update prompt
         logger.info(f"Updating prompt {prompt_id}...")
-        success = mongodb_client.update_prompt(prompt_id, update_data)
+        updated = await run_blocking(
+            "database",
+            mongodb_client.update_prompt,
+            prompt_id,
+            update_data,
+            current=existing_prompt,
+        )
 
-        if success:
+        if updated:
             result_message = f"""Successfully updated prompt {prompt_id}!
 
+**Version:** {updated['version']}
 **Change Description:** {change_description}
 """
             if summary:
@@ -119,9 +148,12 @@ async def handle_update_prompt(
         else:
             return [
                 TextContent(
-                    type="text", text=f"Error: Failed to update prompt {prompt_id}."
+                    type="text", text=f"Error: Prompt with ID {prompt_id} not found."
                 )
             ]
+    except VersionConflict as e:
+        logger.warning(str(e))
+        return [TextContent(type="text", text=f"Error: {e}. Re-read it and retry.")]
     except Exception as e:
         error_message = f"Failed to update prompt: {str(e)}"
         logger.error(error_message, exc_info=True)
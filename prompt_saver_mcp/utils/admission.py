@@ -0,0 +1,265 @@
+"""Priority-aware admission control for concurrent tool calls."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from prompt_saver_mcp.config import config
+
+logger = logging.getLogger(__name__)
+
+# Admission classes in priority order: queued interactive calls are admitted before
+# queued LLM-bound calls whenever a slot frees up.
+INTERACTIVE = "interactive"
+LLM = "llm"
+PRIORITIES = [INTERACTIVE, LLM]
+
+# Tools that wait on a chat completion; everything else is a cheap read or a single
+# embedding call.
+LLM_TOOLS = {"save_prompt", "preview_prompt", "improve_prompt_from_feedback"}
+
+# Wait-time samples kept per class for percentiles
+_WAIT_SAMPLES = 1000
+
+
+def classify(name: str, arguments: Dict[str, Any]) -> str:
+    """
+    Pick the admission class of a tool call.
+
+    Args:
+        name: Tool name
+        arguments: Tool arguments
+
+    Returns:
+        INTERACTIVE or LLM
+    """
+    if name == "save_prompt" and arguments.get("async_mode"):
+        # Only enqueues a job; the LLM call happens in a background worker
+        return INTERACTIVE
+    return LLM if name in LLM_TOOLS else INTERACTIVE
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call cannot be admitted; carries a retry hint in seconds."""
+
+    def __init__(self, admission_class: str, reason: str, retry_after: float):
+        super().__init__(f"{admission_class} calls {reason}")
+        self.admission_class = admission_class
+        self.retry_after = retry_after
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    """Return the given percentile of a list of samples (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AdmissionController:
+    """
+    Bounded concurrency per admission class with priority queues.
+
+    A call starts immediately when its class and the server are below their limits and
+    no call of its class is already waiting. Otherwise it queues; a full queue or a wait
+    longer than the class's maximum rejects it straight away with a retry hint instead
+    of letting it pile up.
+    """
+
+    def __init__(
+        self,
+        total_limit: int,
+        limits: Dict[str, int],
+        max_queue: Dict[str, int],
+        max_wait: Dict[str, float],
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            total_limit: Maximum calls running at once across all classes
+            limits: Maximum calls running at once per class
+            max_queue: Maximum queued calls per class
+            max_wait: Maximum seconds a call may wait for a slot, per class
+        """
+        self.total_limit = total_limit
+        self.limits = limits
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._total = 0
+        self._in_flight = {c: 0 for c in PRIORITIES}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {c: deque() for c in PRIORITIES}
+        self._admitted = {c: 0 for c in PRIORITIES}
+        self._rejected = {c: 0 for c in PRIORITIES}
+        self._max_depth = {c: 0 for c in PRIORITIES}
+        self._waits: Dict[str, Deque[float]] = {
+            c: deque(maxlen=_WAIT_SAMPLES) for c in PRIORITIES
+        }
+        # Exponentially weighted mean call duration, used for retry hints
+        self._service_time = {c: 1.0 for c in PRIORITIES}
+
+    def _can_start(self, admission_class: str) -> bool:
+        return (
+            self._total < self.total_limit
+            and self._in_flight[admission_class] < self.limits[admission_class]
+        )
+
+    def _start(self, admission_class: str) -> None:
+        self._total += 1
+        self._in_flight[admission_class] += 1
+
+    def _retry_after(self, admission_class: str) -> float:
+        """Estimate when a slot of the class is likely to be free."""
+        backlog = len(self._waiters[admission_class]) + 1
+        estimate = self._service_time[admission_class] * backlog / self.limits[admission_class]
+        return max(1.0, round(estimate, 1))
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued calls, highest priority first."""
+        for admission_class in PRIORITIES:
+            waiters = self._waiters[admission_class]
+            while waiters and self._can_start(admission_class):
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                self._start(admission_class)
+                waiter.set_result(None)
+
+    def _release(self, admission_class: str) -> None:
+        self._total -= 1
+        self._in_flight[admission_class] -= 1
+        self._dispatch()
+
+    async def acquire(self, admission_class: str) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            admission_class: Class of the call
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait exceeds the class maximum
+        """
+        if self._can_start(admission_class) and not self._waiters[admission_class]:
+            self._start(admission_class)
+            self._record_admission(admission_class, 0.0)
+            return 0.0
+
+        waiters = self._waiters[admission_class]
+        if len(waiters) >= self.max_queue[admission_class]:
+            self._rejected[admission_class] += 1
+            raise AdmissionRejected(
+                admission_class, "are saturated", self._retry_after(admission_class)
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        self._max_depth[admission_class] = max(self._max_depth[admission_class], len(waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_wait[admission_class])
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(admission_class)
+            else:
+                waiter.cancel()
+                self._discard(admission_class, waiter)
+            raise
+
+        if not waiter.done():
+            waiter.cancel()
+            self._discard(admission_class, waiter)
+            self._rejected[admission_class] += 1
+            raise AdmissionRejected(
+                admission_class,
+                f"waited over {self.max_wait[admission_class]:.0f}s for a slot",
+                self._retry_after(admission_class),
+            )
+
+        waited = time.monotonic() - started
+        self._record_admission(admission_class, waited)
+        return waited
+
+    def _discard(self, admission_class: str, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters[admission_class].remove(waiter)
+        except ValueError:
+            pass
+
+    def _record_admission(self, admission_class: str, waited: float) -> None:
+        self._admitted[admission_class] += 1
+        self._waits[admission_class].append(waited)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, admission_class: str) -> AsyncIterator[float]:
+        """
+        Hold a slot of the class for the duration of the block.
+
+        Yields:
+            Seconds spent waiting for the slot
+        """
+        waited = await self.acquire(admission_class)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_time[admission_class] = (
+                0.8 * self._service_time[admission_class] + 0.2 * elapsed
+            )
+            self._release(admission_class)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return current queue depth, concurrency and wait-time metrics.
+
+        Returns:
+            Dictionary with totals and per-class metrics
+        """
+        classes = {}
+        for admission_class in PRIORITIES:
+            waits = list(self._waits[admission_class])
+            classes[admission_class] = {
+                "limit": self.limits[admission_class],
+                "in_flight": self._in_flight[admission_class],
+                "queued": len(self._waiters[admission_class]),
+                "max_queued": self._max_depth[admission_class],
+                "admitted": self._admitted[admission_class],
+                "rejected": self._rejected[admission_class],
+                "wait_p50_ms": round(_percentile(waits, 0.5) * 1000, 1),
+                "wait_p95_ms": round(_percentile(waits, 0.95) * 1000, 1),
+                "mean_duration_ms": round(self._service_time[admission_class] * 1000, 1),
+            }
+        return {"total_limit": self.total_limit, "in_flight": self._total, "classes": classes}
+
+
+# Global admission controller instance (lazy initialization)
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the global admission controller instance."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            total_limit=config.ADMISSION_MAX_CONCURRENCY,
+            limits={
+                INTERACTIVE: config.ADMISSION_INTERACTIVE_LIMIT,
+                LLM: config.ADMISSION_LLM_LIMIT,
+            },
+            max_queue={
+                INTERACTIVE: config.ADMISSION_INTERACTIVE_QUEUE,
+                LLM: config.ADMISSION_LLM_QUEUE,
+            },
+            max_wait={
+                INTERACTIVE: config.ADMISSION_INTERACTIVE_MAX_WAIT,
+                LLM: config.ADMISSION_LLM_MAX_WAIT,
+            },
+        )
+    return _admission_controller
@@ -0,0 +1,171 @@
+"""Circuit breakers that fail fast while a dependency is down."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from prompt_saver_mcp.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_after:.0f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing.
+
+    After failure_threshold consecutive failures the circuit opens and calls fail
+    immediately with CircuitOpenError. Once reset_timeout has passed, a single probe call
+    is let through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Dependency name used in errors and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            is_failure: Predicate deciding which exceptions count as dependency failures
+                (default: all except cancellation)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda error: True)
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe in flight
+        """
+        if self.state == OPEN:
+            if self._retry_after() > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self._retry_after())
+            self.state = HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, probing")
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self.state != CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self, error: BaseException) -> None:
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        self._probing = False
+        if not self.is_failure(error):
+            if self.state == HALF_OPEN:
+                # The probe reached the dependency, so it is up
+                self.record_success()
+            return
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+                logger.warning(f"Circuit {self.name} opened after: {error}")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Release a half-open probe slot without an outcome (e.g. the call was cancelled)."""
+        self._probing = False
+
+    async def call(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an async call through the breaker.
+
+        Args:
+            make_call: Factory creating the awaitable
+
+        Returns:
+            The call's result
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        self.before_call()
+        try:
+            result = await make_call()
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker's state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_after_s": round(self._retry_after(), 1) if self.state == OPEN else 0.0,
+        }
+
+
+# Breakers by dependency name, shared by all clients of the dependency
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(
+    name: str, is_failure: Optional[Callable[[BaseException], bool]] = None
+) -> CircuitBreaker:
+    """Get or create the circuit breaker of a dependency."""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(
+            name,
+            failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=config.CIRCUIT_RESET_TIMEOUT,
+            is_failure=is_failure,
+        )
+    return _breakers[name]
+
+
+def breaker_snapshots() -> Dict[str, Dict[str, Any]]:
+    """Return the state of every breaker created so far."""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
@@ -0,0 +1,274 @@
+"""Conversation compaction before LLM analysis."""
+
+import hashlib
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.utils.tokens import count_tokens, slice_tokens
+
+logger = logging.getLogger(__name__)
+
+# Roles whose messages are tool output rather than conversation
+TOOL_ROLES = ("tool", "function")
+
+# A fenced markdown code block, including its fences
+_CODE_BLOCK = re.compile(r"```[^\n]*\n.*?\n[ \t]*```", re.DOTALL)
+
+# Blank lines between prose blocks, captured so they survive a split
+_BLOCK_SEPARATOR = re.compile(r"(\n[ \t]*\n)")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Characters per token assumed when cutting head and tail windows out of a long text
+_MAX_TOKEN_CHARS = 16
+
+
+class CompactionReport:
+    """What compaction removed from a conversation and the tokens it saved."""
+
+    __slots__ = (
+        "tokens_before",
+        "tokens_after",
+        "duplicate_messages",
+        "duplicate_blocks",
+        "collapsed_code_blocks",
+        "truncated_messages",
+    )
+
+    def __init__(self):
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.duplicate_messages = 0
+        self.duplicate_blocks = 0
+        self.collapsed_code_blocks = 0
+        self.truncated_messages = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens removed from the conversation."""
+        return self.tokens_before - self.tokens_after
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the report as a dictionary."""
+        report = {name: getattr(self, name) for name in self.__slots__}
+        report["tokens_saved"] = self.tokens_saved
+        return report
+
+    def describe(self) -> str:
+        """One-line description, e.g. for tool responses."""
+        details = [
+            f"{count} {label}"
+            for count, label in (
+                (self.duplicate_messages, "duplicate messages"),
+                (self.duplicate_blocks, "repeated blocks"),
+                (self.collapsed_code_blocks, "repeated code blocks"),
+                (self.truncated_messages, "truncated messages"),
+            )
+            if count
+        ]
+        text = (
+            f"{self.tokens_before:,} -> {self.tokens_after:,} tokens "
+            f"({self.tokens_saved:,} saved"
+        )
+        return text + (f": {', '.join(details)})" if details else ")")
+
+
+def _fingerprint(text: str) -> bytes:
+    """Whitespace-insensitive digest of a block."""
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def _excerpt(text: str, length: int = 60) -> str:
+    """First line of a block, shortened for a marker."""
+    line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    line = line.strip("`").strip()
+    return line if len(line) <= length else line[: length - 3] + "..."
+
+
+def truncate_middle(
+    text: str, max_tokens: int, total: Optional[int] = None
+) -> Tuple[str, int]:
+    """
+    Keep the head and tail of an oversized text and drop the middle.
+
+    The start of a log or tool output usually says what ran and the end how it
+    finished, so both halves of the budget are kept. Only the head and tail windows are
+    tokenized, so huge texts cost one counting pass.
+
+    Args:
+        text: The text
+        max_tokens: Token budget
+        total: Token count of the text, if already known
+
+    Returns:
+        The (possibly) truncated text and the number of tokens omitted
+    """
+    total = count_tokens(text) if total is None else total
+    if total <= max_tokens:
+        return text, 0
+    head_tokens = max_tokens // 2
+    tail_tokens = max_tokens - head_tokens
+    omitted = total - head_tokens - tail_tokens
+    head = slice_tokens(text[: head_tokens * _MAX_TOKEN_CHARS], 0, head_tokens).rstrip()
+    window = text[-tail_tokens * _MAX_TOKEN_CHARS :]
+    tail = slice_tokens(window, max(0, count_tokens(window) - tail_tokens)).lstrip()
+    return f"{head}\n\n[... {omitted:,} tokens omitted ...]\n\n{tail}", omitted
+
+
+class _Compactor:
+    """Compaction state of one conversation: blocks seen so far and the report."""
+
+    def __init__(self, min_block_chars: int):
+        self.min_block_chars = min_block_chars
+        self.seen: Dict[bytes, int] = {}
+        self.report = CompactionReport()
+
+    def _first_seen(self, block: str, number: int) -> Optional[int]:
+        """Message number where a block first appeared, or None (and remember it)."""
+        if len(block.strip()) < self.min_block_chars:
+            return None
+        key = _fingerprint(block)
+        first = self.seen.get(key)
+        if first is None:
+            self.seen[key] = number
+        return first
+
+    def _prose(self, text: str, number: int) -> str:
+        pieces = _BLOCK_SEPARATOR.split(text)
+        # Even indexes are blocks, odd indexes the separators between them
+        for i in range(0, len(pieces), 2):
+            first = self._first_seen(pieces[i], number)
+            if first is not None:
+                self.report.duplicate_blocks += 1
+                pieces[i] = (
+                    f"[repeated block omitted, first seen in message {first}: "
+                    f'"{_excerpt(pieces[i])}"]'
+                )
+        return "".join(pieces)
+
+    def content(self, text: str, number: int) -> str:
+        """Replace code and prose blocks already seen in earlier messages with markers."""
+        parts = []
+        position = 0
+        for match in _CODE_BLOCK.finditer(text):
+            parts.append(self._prose(text[position : match.start()], number))
+            block = match.group(0)
+            first = self._first_seen(block, number)
+            if first is None:
+                parts.append(block)
+            else:
+                self.report.collapsed_code_blocks += 1
+                code = block.split("\n", 1)[-1]
+                parts.append(
+                    f"```\n[repeated code block omitted, first seen in message {first}: "
+                    f'"{_excerpt(code)}"]\n```'
+                )
+            position = match.end()
+        parts.append(self._prose(text[position:], number))
+        return "".join(parts)
+
+
+def compact_conversation(
+    messages: Iterable[Dict[str, Any]],
+    max_tool_tokens: Optional[int] = None,
+    max_message_tokens: Optional[int] = None,
+    min_block_chars: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], CompactionReport]:
+    """
+    Shrink a conversation before analysis without losing what it accomplished.
+
+    In order, for each message:
+    - a message repeating an earlier one entirely becomes a one-line reference;
+    - code blocks and paragraphs seen in an earlier message become one-line markers;
+    - tool output over max_tool_tokens, and any other message over max_message_tokens,
+      keeps its head and tail and drops the middle.
+
+    Blocks shorter than min_block_chars are never deduplicated. Messages whose content
+    is not a string are passed through unchanged.
+
+    Args:
+        messages: Conversation messages
+        max_tool_tokens: Budget per tool output (default: COMPACTION_MAX_TOOL_TOKENS)
+        max_message_tokens: Budget per other message (default: COMPACTION_MAX_MESSAGE_TOKENS)
+        min_block_chars: Smallest deduplicated block (default: COMPACTION_MIN_BLOCK_CHARS)
+
+    Returns:
+        The compacted messages (new dicts; the input is not modified) and a report
+    """
+    max_tool_tokens = max_tool_tokens or config.COMPACTION_MAX_TOOL_TOKENS
+    max_message_tokens = max_message_tokens or config.COMPACTION_MAX_MESSAGE_TOKENS
+    compactor = _Compactor(min_block_chars or config.COMPACTION_MIN_BLOCK_CHARS)
+    report = compactor.report
+    whole_messages: Dict[bytes, int] = {}
+    compacted = []
+    for number, message in enumerate(messages, 1):
+        content = message.get("content")
+        if not isinstance(content, str):
+            compacted.append(message)
+            continue
+        tokens = count_tokens(content)
+        report.tokens_before += tokens
+
+        key = _fingerprint(content)
+        first = whole_messages.get(key)
+        if first is not None and len(content.strip()) >= compactor.min_block_chars:
+            report.duplicate_messages += 1
+            content = f"[same content as message {first}]"
+            tokens = count_tokens(content)
+        else:
+            whole_messages.setdefault(key, number)
+            deduplicated = compactor.content(content, number)
+            if deduplicated != content:
+                content, tokens = deduplicated, count_tokens(deduplicated)
+            limit = max_tool_tokens if message.get("role") in TOOL_ROLES else max_message_tokens
+            content, omitted = truncate_middle(content, limit, tokens)
+            if omitted:
+                report.truncated_messages += 1
+                tokens = count_tokens(content)
+
+        report.tokens_after += tokens
+        compacted.append({**message, "content": content})
+
+    _record(report)
+    if report.tokens_saved:
+        logger.info(f"Compacted conversation: {report.describe()}")
+    return compacted, report
+
+
+# Totals over all compacted conversations, for metrics
+_totals = {"conversations": 0, "tokens_before": 0, "tokens_saved": 0}
+_totals_lock = threading.Lock()
+
+
+def _record(report: CompactionReport) -> None:
+    with _totals_lock:
+        _totals["conversations"] += 1
+        _totals["tokens_before"] += report.tokens_before
+        _totals["tokens_saved"] += report.tokens_saved
+
+
+def compaction_totals() -> Dict[str, int]:
+    """Conversations compacted so far, their tokens and the tokens saved."""
+    with _totals_lock:
+        return dict(_totals)
+
+
+def prepare_conversation(
+    messages: Iterable[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Optional[CompactionReport]]:
+    """
+    Compact a conversation when CONVERSATION_COMPACTION_ENABLED.
+
+    Args:
+        messages: Parsed conversation messages
+
+    Returns:
+        The messages to analyze and the compaction report (None when disabled)
+    """
+    if not config.CONVERSATION_COMPACTION_ENABLED:
+        return list(messages), None
+    return compact_conversation(messages)
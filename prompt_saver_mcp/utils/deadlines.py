@@ -0,0 +1,149 @@
+"""Per-call deadline budgets propagated to every stage of a tool call."""
+
+import asyncio
+import contextlib
+import contextvars
+import time
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+import pymongo
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from prompt_saver_mcp.utils.circuit_breaker import get_breaker
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() deadline of the current call; None means unbounded.
+# Context variables are copied into asyncio tasks and asyncio.to_thread calls, so every
+# stage of a call sees the same budget.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage runs past the deadline of its tool call."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Deadline exceeded during {stage}")
+        self.stage = stage
+
+
+@contextlib.contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound everything run inside the block to the given budget.
+
+    A nested deadline can only shorten an enclosing one.
+
+    Args:
+        seconds: Budget in seconds (None or <= 0 for no additional bound)
+    """
+    current = _deadline.get()
+    if seconds and seconds > 0:
+        candidate = time.monotonic() + seconds
+        current = candidate if current is None else min(current, candidate)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(stage: str = "call", default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left in the current budget.
+
+    Args:
+        stage: Stage name used in the error when the budget is spent
+        default: Value returned when no deadline is set
+
+    Returns:
+        Remaining seconds, or default without a deadline
+
+    Raises:
+        DeadlineExceeded: If the budget is already spent
+    """
+    current = _deadline.get()
+    if current is None:
+        return default
+    left = current - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded(stage)
+    return left
+
+
+def expired() -> bool:
+    """Whether the current call has a deadline and it has passed."""
+    current = _deadline.get()
+    return current is not None and time.monotonic() >= current
+
+
+def _is_mongodb_outage(error: BaseException) -> bool:
+    """
+    Connection failures, except timeouts of a call that ran out of its own budget.
+
+    The budget is enforced as a pymongo operation timeout, whose NetworkTimeout is a
+    ConnectionFailure too; slow calls must not open the breaker for a healthy server.
+    """
+    return isinstance(error, ConnectionFailure) and not expired()
+
+
+async def within_deadline(awaitable: Awaitable[T], stage: str) -> T:
+    """
+    Await a stage, cancelling it when the budget runs out.
+
+    Args:
+        awaitable: The stage to run
+        stage: Stage name used in the error
+
+    Returns:
+        The stage's result
+
+    Raises:
+        DeadlineExceeded: If the stage does not finish within the remaining budget
+    """
+    try:
+        budget = remaining(stage)
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+    try:
+        return await asyncio.wait_for(awaitable, budget)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(stage) from None
+
+
+async def run_blocking(stage: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database call in a worker thread within the remaining budget.
+
+    The budget is applied as a pymongo client-side operation timeout, so the server-side
+    operation is abandoned rather than left running when the deadline passes. Calls go
+    through the "mongodb" circuit breaker, which opens on connection failures (but not
+    on the call's own deadline expiring).
+
+    Args:
+        stage: Stage name used in the error
+        func: Blocking function
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The function's result
+    """
+    budget = remaining(stage)
+
+    def call() -> T:
+        with pymongo.timeout(budget):
+            return func(*args, **kwargs)
+
+    breaker = get_breaker("mongodb", is_failure=_is_mongodb_outage)
+    try:
+        return await breaker.call(lambda: within_deadline(asyncio.to_thread(call), stage))
+    except PyMongoError as e:
+        if e.timeout:
+            raise DeadlineExceeded(stage) from e
+        raise
+
@@ -0,0 +1,129 @@
+"""Hedged requests: race a duplicate call when the first one is slower than usual."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Latencies observed before the tracked percentile is trusted
+MIN_SAMPLES = 20
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge: after the observed latency percentile, within a rate cap.
+
+    The rate cap is a token bucket: every request earns max_rate tokens and every hedge
+    spends one, so at most about max_rate of requests are duplicated even when the
+    dependency is slow across the board.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_rate: float = 0.1,
+        min_delay: float = 0.05,
+        initial_delay: float = 1.0,
+        window: int = 500,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            max_rate: Maximum fraction of requests that may be hedged
+            min_delay: Lower bound on the hedge delay in seconds
+            initial_delay: Hedge delay used until MIN_SAMPLES latencies are observed
+            window: Number of recent latencies tracked
+        """
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._tokens = 0.0
+        self._max_tokens = max(1.0, max_rate * 100)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a request."""
+        self._latencies.append(latency)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first request before hedging."""
+        if len(self._latencies) < MIN_SAMPLES:
+            return self.initial_delay
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def start_request(self) -> None:
+        """Count a request and earn hedge budget."""
+        self.requests += 1
+        self._tokens = min(self._max_tokens, self._tokens + self.max_rate)
+
+    def try_hedge(self) -> bool:
+        """Spend hedge budget if available."""
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        self.hedges += 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """Return request, hedge and hedge-win counts and the current hedge delay."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+        }
+
+
+async def hedged(make_call: Callable[[], Awaitable[T]], policy: HedgePolicy) -> T:
+    """
+    Run a call, sending one duplicate if it has not answered within the hedge delay.
+
+    The first successful response wins and the other request is cancelled. Errors are
+    not hedged: if the first request fails before the delay, its error is raised.
+
+    Args:
+        make_call: Factory creating a fresh awaitable for each attempt
+        policy: Hedge policy shared by all calls to the same dependency
+
+    Returns:
+        The result of whichever request answered first
+    """
+    policy.start_request()
+    started = time.monotonic()
+    primary = asyncio.ensure_future(make_call())
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=policy.hedge_delay())
+        if not done and policy.try_hedge():
+            logger.debug("Hedging slow request")
+            pending.add(asyncio.ensure_future(make_call()))
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    # The primary's latency when it wins; otherwise a lower bound on it
+                    policy.record(time.monotonic() - started)
+                    if task is not primary:
+                        policy.hedge_wins += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -2,42 +2,136 @@
 
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Union
 
 logger = logging.getLogger(__name__)
 
 
-def parse_conversation_json(conversation_json: str) -> List[Dict]:
+def _validate_message(message: Any) -> Dict:
+    """Check that a decoded message has the expected structure."""
+    if not isinstance(message, dict):
+        raise ValueError("Each message must be a dictionary")
+    if "role" not in message or "content" not in message:
+        raise ValueError("Each message must have 'role' and 'content' keys")
+    return message
+
+
+class _ChunkedText:
+    """Text read on demand from a string or a text stream."""
+
+    def __init__(self, source: Union[str, TextIO], chunk_size: int):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.eof = isinstance(source, str)
+        self.buffer = source if self.eof else ""
+        self.offset = 0  # Position of the buffer start in the whole text
+
+    def read_more(self, position: int) -> bool:
+        """Drop text before position and append the next chunk; False at end of input."""
+        if self.eof:
+            return False
+        chunk = self.source.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += position
+        self.buffer = self.buffer[position:] + chunk
+        # A value spanning many chunks is re-decoded on every read; read more per step
+        # until it is complete
+        self.chunk_size *= 2
+        return True
+
+    def skip_whitespace(self, position: int) -> int:
+        """Position of the next non-whitespace character, reading more as needed."""
+        while True:
+            while position < len(self.buffer) and self.buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(self.buffer) or not self.read_more(position):
+                return position
+            position = 0
+
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+def iter_conversation_json(
+    conversation_json: Union[str, TextIO], chunk_size: int = 1 << 16
+) -> Iterator[Dict]:
     """
-    Parse conversation JSON string into a list of message dictionaries.
+    Parse a conversation JSON array incrementally, yielding each message once validated.
+
+    Only one message is decoded at a time, so consumers that keep a smaller form of each
+    message (such as compaction) never hold the whole decoded conversation. A text
+    stream is read in chunks instead of all at once.
 
     Args:
-        conversation_json: JSON string containing conversation messages
+        conversation_json: JSON string, or text stream, containing conversation messages
+        chunk_size: Characters read per step from a stream
 
-    Returns:
-        List of message dictionaries with 'role' and 'content' keys
+    Yields:
+        Message dictionaries with 'role' and 'content' keys
+
+    Raises:
+        ValueError: If the JSON is malformed or a message is invalid
     """
+    text = _ChunkedText(conversation_json, chunk_size)
     try:
-        messages = json.loads(conversation_json)
-        if not isinstance(messages, list):
+        position = text.skip_whitespace(0)
+        if position >= len(text.buffer) or text.buffer[position] != "[":
             raise ValueError("Conversation JSON must be a list of messages")
-
-        # Validate message structure
-        for msg in messages:
-            if not isinstance(msg, dict):
-                raise ValueError("Each message must be a dictionary")
-            if "role" not in msg or "content" not in msg:
-                raise ValueError("Each message must have 'role' and 'content' keys")
-
-        return messages
+        position = text.skip_whitespace(position + 1)
+        expect_value = None  # Unknown until the first element or the closing bracket
+        while True:
+            if position >= len(text.buffer):
+                raise json.JSONDecodeError("Unterminated array", text.buffer, position)
+            if text.buffer[position] == "]" and expect_value is not True:
+                position = text.skip_whitespace(position + 1)
+                if position < len(text.buffer):
+                    raise json.JSONDecodeError("Extra data", text.buffer, position)
+                return
+            while True:
+                try:
+                    message, end = _DECODER.raw_decode(text.buffer, position)
+                    text.chunk_size = chunk_size
+                    break
+                except json.JSONDecodeError:
+                    # The value may continue in the next chunk
+                    if not text.read_more(position):
+                        raise
+                    position = 0
+            yield _validate_message(message)
+            position = text.skip_whitespace(end)
+            if position < len(text.buffer) and text.buffer[position] == ",":
+                position = text.skip_whitespace(position + 1)
+                expect_value = True
+            else:
+                expect_value = False
+                if position < len(text.buffer) and text.buffer[position] != "]":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text.buffer, position)
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse conversation JSON: {e}")
-        raise ValueError(f"Invalid JSON format: {e}")
+        # Positions in a stream are relative to the buffered chunk
+        detail = str(e) if text.offset == 0 else f"{e.msg} (char {text.offset + e.pos})"
+        logger.error(f"Failed to parse conversation JSON: {detail}")
+        raise ValueError(f"Invalid JSON format: {detail}")
     except Exception as e:
         logger.error(f"Failed to parse conversation: {e}")
         raise
 
 
+def parse_conversation_json(conversation_json: Union[str, TextIO]) -> List[Dict]:
+    """
+    Parse conversation JSON string into a list of message dictionaries.
+
+    Args:
+        conversation_json: JSON string (or text stream) containing conversation messages
+
+    Returns:
+        List of message dictionaries with 'role' and 'content' keys
+    """
+    return list(iter_conversation_json(conversation_json))
+
+
 def format_prompt_template(
     conversation_messages: List[Dict], analysis_result: Dict[str, str]
 ) -> str:
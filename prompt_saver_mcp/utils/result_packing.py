@@ -0,0 +1,50 @@
+"""Token-budget-aware packing of prompt templates into search responses."""
+
+from typing import Dict, List, Optional
+
+from prompt_saver_mcp.utils.tokens import count_tokens, truncate_to_tokens
+
+# Below this many tokens a truncated template is more noise than help
+MIN_EXCERPT_TOKENS = 200
+
+
+def pack_templates(
+    results: List[Dict], token_budget: int, reserved_tokens: int = 0
+) -> List[Optional[Dict]]:
+    """
+    Choose which templates to inline into a search response.
+
+    Results are taken in rank order. Each template is inlined in full if it fits the
+    remaining budget; otherwise it is truncated to the remaining budget (if that leaves
+    at least MIN_EXCERPT_TOKENS) and packing stops.
+
+    Args:
+        results: Ranked search results with "prompt_template"
+        token_budget: Total token budget of the response
+        reserved_tokens: Tokens already used by the rest of the response
+
+    Returns:
+        One entry per result: None if not inlined, otherwise a dict with "text",
+        "tokens" and "truncated"
+    """
+    remaining = token_budget - reserved_tokens
+    packed: List[Optional[Dict]] = []
+    for result in results:
+        template = result.get("prompt_template") or ""
+        if remaining < MIN_EXCERPT_TOKENS or not template:
+            packed.append(None)
+            continue
+        tokens = count_tokens(template)
+        if tokens <= remaining:
+            packed.append({"text": template, "tokens": tokens, "truncated": False})
+            remaining -= tokens
+        else:
+            packed.append(
+                {
+                    "text": truncate_to_tokens(template, remaining),
+                    "tokens": remaining,
+                    "truncated": True,
+                }
+            )
+            remaining = 0
+    return packed
@@ -0,0 +1,104 @@
+"""Markdown heading outlines for section-addressable template retrieval."""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from prompt_saver_mcp.utils.tokens import count_tokens
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE_PATTERN = re.compile(r"^[ \t]*(```|~~~)")
+
+
+def build_outline(template: str) -> List[Dict]:
+    """
+    Parse the markdown headings of a template into an outline.
+
+    Headings inside fenced code blocks are ignored. Each section spans from its heading
+    to the next heading of the same or a higher level.
+
+    Args:
+        template: Markdown prompt template
+
+    Returns:
+        List of sections with level, title, path ("Parent/Child"), start/end character
+        offsets and token count
+    """
+    headings: List[Tuple[int, str, int]] = []
+    in_fence = False
+    offset = 0
+    for line in template.splitlines(keepends=True):
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = _HEADING_PATTERN.match(line.rstrip("\r\n"))
+            if match:
+                headings.append((len(match.group(1)), match.group(2).strip(), offset))
+        offset += len(line)
+
+    outline = []
+    stack: List[Tuple[int, str]] = []
+    for i, (level, title, start) in enumerate(headings):
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, title))
+        end = len(template)
+        for next_level, _, next_start in headings[i + 1 :]:
+            if next_level <= level:
+                end = next_start
+                break
+        outline.append(
+            {
+                "level": level,
+                "title": title,
+                "path": "/".join(t for _, t in stack),
+                "start": start,
+                "end": end,
+                "tokens": count_tokens(template[start:end]),
+            }
+        )
+    return outline
+
+
+def find_section(outline: List[Dict], path: str) -> Optional[Dict]:
+    """
+    Find a section by heading path.
+
+    An exact, case-insensitive path match wins; otherwise the first section whose path
+    ends with the given path (e.g. "Steps" matches "Task/Steps").
+
+    Args:
+        outline: Outline from build_outline
+        path: Heading path, segments separated by "/"
+
+    Returns:
+        The matching section, or None
+    """
+    wanted = [segment.strip().lower() for segment in path.strip("/").split("/")]
+    suffix_match = None
+    for section in outline:
+        segments = [segment.lower() for segment in section["path"].split("/")]
+        if segments == wanted:
+            return section
+        if suffix_match is None and segments[-len(wanted) :] == wanted:
+            suffix_match = section
+    return suffix_match
+
+
+def format_outline(outline: List[Dict]) -> str:
+    """
+    Render an outline as an indented markdown list.
+
+    Args:
+        outline: Outline from build_outline
+
+    Returns:
+        One line per section with its path and size
+    """
+    lines = []
+    for section in outline:
+        indent = "  " * (section["level"] - 1)
+        lines.append(
+            f"{indent}- {section['title']} (`{section['path']}`, "
+            f"chars {section['start']}-{section['end']}, ~{section['tokens']} tokens)"
+        )
+    return "\n".join(lines)
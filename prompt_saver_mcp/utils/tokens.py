@@ -0,0 +1,92 @@
+"""Local token counting and token-range slicing."""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; a regex approximation is used when it is missing
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Approximation used without tiktoken: words split into ~4-character pieces, and every
+# punctuation character is one token. Close to BPE counts for English and code.
+_TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    """Load the tiktoken encoding once."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Falling back to approximate token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text: The text
+
+    Returns:
+        Number of tokens (exact with tiktoken, approximate otherwise)
+    """
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(1 for _ in _TOKEN_PATTERN.finditer(text))
+
+
+def _token_offsets(text: str) -> List[Tuple[int, int]]:
+    """Return approximate (start, end) character offsets of each token."""
+    return [match.span() for match in _TOKEN_PATTERN.finditer(text)]
+
+
+def slice_tokens(text: str, start: int, end: Optional[int] = None) -> str:
+    """
+    Return the text covered by tokens [start, end).
+
+    Args:
+        text: The text
+        start: Index of the first token
+        end: Index after the last token (None for the end of the text)
+
+    Returns:
+        The covered text
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[start:end])
+    offsets = _token_offsets(text)
+    if start >= len(offsets):
+        return ""
+    first = offsets[start][0] if start > 0 else 0
+    if end is None or end >= len(offsets):
+        return text[first:]
+    return text[first : offsets[end][0]]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate a text to at most max_tokens tokens.
+
+    Args:
+        text: The text
+        max_tokens: Token budget
+
+    Returns:
+        The text, cut at the budget if it exceeds it
+    """
+    if max_tokens <= 0:
+        return ""
+    return slice_tokens(text, 0, max_tokens)
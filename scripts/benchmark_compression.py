@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark storage/transfer savings of text field compression against its CPU cost.
+
+Uses stored prompts by default, or generated markdown templates with --synthetic.
+"""
+
+import sys
+import random
+import argparse
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bson
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database import compression
+from prompt_saver_mcp.database.compression import TextCompressor
+
+SECTIONS = ["Overview", "Context", "Steps", "Examples", "Common Pitfalls", "Validation Checklist"]
+SNIPPETS = [
+    "```python\ndef parse_csv(path):\n    with open(path) as f:\n"
+    "        return list(csv.reader(f))\n```\n",
+    "Run `pytest -q tests/` and confirm every test passes before continuing.\n",
+    "SELECT user_id, COUNT(*) FROM events\nWHERE created_at > NOW() - INTERVAL '7 days' GROUP BY 1;\n",
+    "- [ ] Inputs validated\n- [ ] Errors logged with context\n- [ ] Edge cases covered\n",
+    "Replace `{file_path}` with the path of the module you are changing.\n",
+]
+
+
+def synthetic_documents(count: int, seed: int = 0):
+    """Generate verbose markdown templates similar to improved prompts."""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        parts = [f"# Task {i}\n\n"]
+        for section in SECTIONS:
+            parts.append(f"## {section}\n\n")
+            parts.extend(rng.choice(SNIPPETS) for _ in range(rng.randint(5, 40)))
+        history = " ".join(rng.choice(SNIPPETS) for _ in range(rng.randint(3, 15)))
+        documents.append({"prompt_template": "".join(parts), "history": history})
+    return documents
+
+
+def stored_documents(count: int):
+    """Load text fields of stored prompts, decompressing any that already are."""
+    from prompt_saver_mcp.database.mongodb_client import mongodb_client
+
+    projection = {field: 1 for field in compression.COMPRESSED_FIELDS}
+    cursor = mongodb_client.collection.find({}, projection).limit(count)
+    return [mongodb_client.compressor.decode_document(doc) for doc in cursor]
+
+
+def measure(name, compressor, codec, documents):
+    """Compress every text field with one codec and report size and timing."""
+    raw_bytes = packed_bytes = 0
+    compress_s = decompress_s = 0.0
+    raw_bson = packed_bson = 0
+    for document in documents:
+        packed_doc = {}
+        for field in compression.COMPRESSED_FIELDS:
+            data = (document.get(field) or "").encode("utf-8")
+            start = time.perf_counter()
+            payload = compressor.compress_bytes(data, codec)
+            compress_s += time.perf_counter() - start
+            start = time.perf_counter()
+            compressor.decompress_bytes(payload)
+            decompress_s += time.perf_counter() - start
+            raw_bytes += len(data)
+            packed_bytes += len(payload)
+            packed_doc[field] = bson.Binary(payload, bson.binary.USER_DEFINED_SUBTYPE)
+        raw_doc = {field: document.get(field) or "" for field in compression.COMPRESSED_FIELDS}
+        raw_bson += len(bson.encode(raw_doc))
+        packed_bson += len(bson.encode(packed_doc))
+    n = len(documents) * len(compression.COMPRESSED_FIELDS)
+    print(f"{name:<10} {raw_bytes / 1024:>10.1f} {packed_bytes / 1024:>10.1f} "
+          f"{raw_bytes / max(packed_bytes, 1):>6.2f}x {raw_bson / max(packed_bson, 1):>9.2f}x "
+          f"{compress_s / n * 1e6:>9.1f} {decompress_s / n * 1e6:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text field compression")
+    parser.add_argument("--synthetic", action="store_true", help="Use generated templates")
+    parser.add_argument("--count", type=int, default=500,
+                        help="Documents to benchmark (default: 500)")
+    args = parser.parse_args()
+
+    documents = synthetic_documents(args.count) if args.synthetic else stored_documents(args.count)
+    if not documents:
+        print("No documents to benchmark.", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{len(documents)} documents, level {config.COMPRESSION_LEVEL}\n")
+    print(f"{'codec':<10} {'raw KiB':>10} {'packed KiB':>10} {'ratio':>7} {'bson ratio':>10} "
+          f"{'comp us':>9} {'decomp us':>9}")
+    compressor = TextCompressor()
+    measure("zlib", compressor, compression.CODEC_ZLIB, documents)
+
+    if compression.zstandard is None:
+        print("\nInstall zstandard (pip install 'prompt-saver-mcp[compression]') for zstd results.")
+        return
+    measure("zstd", compressor, compression.CODEC_ZSTD, documents)
+
+    # Train on half of the documents and measure on all of them
+    samples = [
+        doc.get(field) or ""
+        for doc in documents[: len(documents) // 2]
+        for field in compression.COMPRESSED_FIELDS
+    ]
+    compressor.train_dictionary(samples)
+    measure("zstd+dict", compressor, compression.CODEC_ZSTD_DICT, documents)
+
+
+if __name__ == "__main__":
+    main()
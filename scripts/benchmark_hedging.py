@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark embedding tail latency with and without request hedging.
+
+Runs against a fake embedding service with a long latency tail by default, or against
+Voyage AI with --live.
+"""
+
+import sys
+import random
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.utils.hedging import HedgePolicy, hedged
+
+
+class FakeEmbeddingService:
+    """Stand-in for the embedding API: log-normal latency plus occasional stalls."""
+
+    def __init__(self, median_ms: float, stall_rate: float, stall_factor: float, seed: int = 0):
+        self.median_s = median_ms / 1000
+        self.stall_rate = stall_rate
+        self.stall_factor = stall_factor
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def embed(self, texts):
+        self.calls += 1
+        latency = self.median_s * self.rng.lognormvariate(0, 0.25)
+        if self.rng.random() < self.stall_rate:
+            latency *= self.stall_factor * self.rng.uniform(0.5, 1.5)
+        await asyncio.sleep(latency)
+        return [[0.0] * 8 for _ in texts]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(name, make_call, requests, concurrency, policy=None):
+    """Issue requests with bounded concurrency and report latency percentiles."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            if policy is None:
+                await make_call()
+            else:
+                await hedged(make_call, policy)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    p50, p95, p99 = (percentile(latencies, f) * 1000 for f in (0.5, 0.95, 0.99))
+    line = f"{name:<10} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {max(latencies) * 1000:>8.1f}"
+    if policy is not None:
+        stats = policy.stats()
+        line += (f" {stats['hedge_rate'] * 100:>7.1f}% {stats['hedge_wins']:>6} "
+                 f"{stats['hedge_delay_ms']:>8.1f}")
+    print(line)
+
+
+async def benchmark(args):
+    if args.live:
+        from prompt_saver_mcp.embeddings.voyage_client import get_voyage_client
+
+        client = get_voyage_client().async_client
+
+        def make_call():
+            return client.embed(["hedging benchmark query"], model=config.VOYAGE_AI_EMBEDDING_MODEL)
+
+        baseline_call = hedged_call = make_call
+    else:
+        baseline = FakeEmbeddingService(args.median_ms, args.stall_rate, args.stall_factor)
+        hedged_service = FakeEmbeddingService(args.median_ms, args.stall_rate, args.stall_factor)
+
+        def baseline_call():
+            return baseline.embed(["query"])
+
+        def hedged_call():
+            return hedged_service.embed(["query"])
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}"
+          + ("" if args.live else f", fake service: median {args.median_ms:.0f} ms, "
+             f"{args.stall_rate * 100:.0f}% stalls at ~{args.stall_factor:.0f}x") + "\n")
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'hedged':>8} {'wins':>6} {'delay ms':>8}")
+    await run("baseline", baseline_call, args.requests, args.concurrency)
+    policy = HedgePolicy(
+        percentile=args.percentile,
+        max_rate=args.max_rate,
+        min_delay=config.VOYAGE_HEDGE_MIN_DELAY,
+        initial_delay=config.VOYAGE_HEDGE_INITIAL_DELAY,
+    )
+    await run("hedged", hedged_call, args.requests, args.concurrency, policy)
+    if not args.live:
+        extra = hedged_service.calls / args.requests - 1
+        print(f"\nExtra load from hedging: {extra * 100:.1f}% of requests")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hedged embedding requests")
+    parser.add_argument("--live", action="store_true", help="Call Voyage AI instead of the fake")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Requests per mode (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Concurrent requests (default: 16)")
+    parser.add_argument("--median-ms", type=float, default=40.0,
+                        help="Fake service median latency (default: 40)")
+    parser.add_argument("--stall-rate", type=float, default=0.03,
+                        help="Fraction of fake requests that stall (default: 0.03)")
+    parser.add_argument("--stall-factor", type=float, default=10.0,
+                        help="Latency multiplier of a stalled request (default: 10)")
+    parser.add_argument("--percentile", type=float, default=config.VOYAGE_HEDGE_PERCENTILE,
+                        help="Hedge after this latency percentile")
+    parser.add_argument("--max-rate", type=float, default=config.VOYAGE_HEDGE_MAX_RATE,
+                        help="Maximum fraction of requests hedged")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(benchmark(args))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory of caching prompts as pydantic models vs compact records.
+
+Generates synthetic prompts with full-size embeddings and measures, with tracemalloc,
+what holding them in memory costs in each representation.
+"""
+
+import sys
+import random
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bson import ObjectId
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database import records
+from prompt_saver_mcp.database.compression import TextCompressor
+from prompt_saver_mcp.database.local_index import LocalVectorIndex
+from prompt_saver_mcp.database.models import Prompt
+
+USE_CASES = ["code-gen", "text-gen", "data-analysis", "creative", "general"]
+
+
+def synthetic_documents(count, dimensions, template_bytes, seed=0):
+    """Yield stored-shape prompt documents, one at a time."""
+    rng = random.Random(seed)
+    words = ["parse", "validate", "retry", "schema", "query", "index", "stream", "cache"]
+    for i in range(count):
+        template = " ".join(rng.choice(words) for _ in range(template_bytes // 7))
+        yield {
+            "_id": ObjectId(),
+            "use_case": rng.choice(USE_CASES),
+            "summary": f"Prompt {i}: " + " ".join(rng.choice(words) for _ in range(20)),
+            "prompt_template": template,
+            "history": " ".join(rng.choice(words) for _ in range(60)),
+            "embedding": [rng.gauss(0.0, 0.02) for _ in range(dimensions)],
+            "last_updated": datetime.utcnow(),
+            "created_by": None,
+        }
+
+
+def measure(name, build, count):
+    """Build a cache and report the memory it holds."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    cache = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<26} {held / 1e6:>10.1f} {held / count / 1e3:>12.1f} {elapsed:>9.2f}")
+    return cache, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory prompt representations")
+    parser.add_argument("--count", type=int, default=2000,
+                        help="Number of prompts (default: 2000)")
+    parser.add_argument("--dimensions", type=int, default=config.EMBEDDING_DIMENSIONS,
+                        help="Embedding dimensions (default: EMBEDDING_DIMENSIONS)")
+    parser.add_argument("--template-bytes", type=int, default=4000,
+                        help="Approximate template size (default: 4000)")
+    parser.add_argument("--no-numpy", action="store_true",
+                        help="Store embeddings in array('f') even if numpy is installed")
+    args = parser.parse_args()
+
+    if args.no_numpy:
+        records.np = None
+
+    def documents():
+        return synthetic_documents(args.count, args.dimensions, args.template_bytes)
+
+    def build_models():
+        return [Prompt(**{k: v for k, v in d.items() if k != "_id"}) for d in documents()]
+
+    def build_index():
+        index = LocalVectorIndex(args.dimensions, TextCompressor())
+        for document in documents():
+            index.upsert(document)
+        return index
+
+    backend = "array('f')" if records.np is None else "numpy"
+    print(f"{args.count} prompts, {args.dimensions}-dim embeddings, "
+          f"~{args.template_bytes} B templates, float32 store: {backend}\n")
+    print(f"{'representation':<26} {'held MB':>10} {'KB/prompt':>12} {'build s':>9}")
+    models, model_bytes = measure("pydantic Prompt list", build_models, args.count)
+    del models
+    index, index_bytes = measure("PromptRecord + store", build_index, args.count)
+    print(f"\nReduction: {model_bytes / index_bytes:.1f}x "
+          f"(index reports {index.memory_bytes() / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Measure recall@k of Atlas vector search against exact brute-force search on stored prompts.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate vector search numCandidates")
+    parser.add_argument("--k", type=int, default=5, help="Results compared per query (default: 5)")
+    parser.add_argument("--samples", type=int, default=20,
+                        help="Stored embeddings used as queries (default: 20)")
+    parser.add_argument("--multipliers", type=int, nargs="+",
+                        help="numCandidates multipliers to evaluate")
+    parser.add_argument("--target", type=float, default=0.95,
+                        help="Recall to recommend a multiplier for (default: 0.95)")
+    args = parser.parse_args()
+
+    try:
+        rows = mongodb_client.calibrate_vector_search(args.k, args.samples, args.multipliers)
+        print(f"{'multiplier':>10} {'candidates':>10} {'recall@' + str(args.k):>10} "
+              f"{'mean ms':>9} {'p95 ms':>9}")
+        for row in rows:
+            print(f"{row['multiplier']:>10} {row['num_candidates']:>10} {row['recall']:>10.3f} "
+                  f"{row['mean_ms']:>9.1f} {row['p95_ms']:>9.1f}")
+
+        meeting = [row for row in rows if row["recall"] >= args.target]
+        if meeting:
+            print(f"\nRecommended: VECTOR_SEARCH_CANDIDATE_MULTIPLIER={meeting[0]['multiplier']}")
+        else:
+            print(f"\nNo evaluated multiplier reached recall {args.target}")
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        mongodb_client.close()
+
+
+if __name__ == "__main__":
+    main()
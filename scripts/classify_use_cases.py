@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Audit or back-fill prompt use cases with the embedding classifier.
+
+Trains the nearest-centroid classifier on every prompt embedded by the active
+embedding model, then predicts each prompt with itself left out of its own label's
+centroid. The report shows agreement with the stored labels per use case and the
+most confident disagreements; --apply writes those predictions back.
+
+Prompts the LLM could not categorize were stored as "general", so
+--only general --apply re-labels just those.
+"""
+
+import sys
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.embeddings.classifier import train_use_case_classifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit or back-fill prompt use cases")
+    parser.add_argument("--min-margin", type=float, default=0.05,
+                        help="Minimum similarity margin of a relabeling (default: 0.05)")
+    parser.add_argument("--only", help="Only relabel prompts currently in this use case")
+    parser.add_argument("--show", type=int, default=20,
+                        help="Disagreements to list (default: 20)")
+    parser.add_argument("--apply", action="store_true",
+                        help="Write the relabelings instead of only reporting them")
+    args = parser.parse_args()
+
+    try:
+        classifier, prompt_ids, embeddings, labels = train_use_case_classifier()
+        print(f"Trained on {len(prompt_ids)} prompts: {classifier.counts}")
+        if not classifier.ready:
+            print(f"Not enough labeled prompts; each use case needs "
+                  f"{classifier.min_examples} examples and at least two use cases are required")
+            return
+
+        predictions = classifier.leave_one_out(embeddings, labels)
+        agree, total = Counter(), Counter()
+        relabel = []
+        for prompt_id, label, (predicted, margin) in zip(prompt_ids, labels, predictions):
+            total[label] += 1
+            if predicted == label:
+                agree[label] += 1
+            elif margin >= args.min_margin and args.only in (None, label):
+                relabel.append((margin, prompt_id, label, predicted))
+
+        print("\nAgreement with stored labels (leave-one-out):")
+        for label in classifier.labels:
+            if total[label]:
+                print(f"  {label:<14} {agree[label]:>6}/{total[label]:<6} "
+                      f"{agree[label] / total[label]:.1%}")
+        overall = sum(agree.values()) / max(1, sum(total.values()))
+        print(f"  {'overall':<14} {overall:.1%}")
+
+        relabel.sort(reverse=True)
+        print(f"\n{len(relabel)} prompts would be relabeled (margin >= {args.min_margin}):")
+        for margin, prompt_id, label, predicted in relabel[: args.show]:
+            print(f"  {prompt_id}  {label} -> {predicted}  (margin {margin:.3f})")
+
+        if args.apply and relabel:
+            modified = mongodb_client.set_use_cases(
+                {prompt_id: predicted for _, prompt_id, _, predicted in relabel}
+            )
+            print(f"\nRelabeled {modified} prompts")
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        mongodb_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from prompt_saver_mcp.llm.openai_client import get_openai_client
+from prompt_saver_mcp.embeddings.classifier import choose_use_case
 from prompt_saver_mcp.utils.prompt_formatter import parse_conversation_json, format_prompt_template
 from prompt_saver_mcp.tools.save_prompt import handle_save_prompt
 
@@ -25,6 +26,7 @@ async def generate_preview(conversation_json: str, task_description: str = None)
         messages = parse_conversation_json(conversation_json)
         openai_client = get_openai_client()
         analysis_result = openai_client.analyze_conversation(messages, task_description)
+        analysis_result["use_case"] = choose_use_case(None, None, analysis_result["use_case"])
         prompt_template = format_prompt_template(messages, analysis_result)
         
         preview = {
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Create the MongoDB indexes required by the prompt saver and report query plans.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ensure prompt saver indexes")
+    parser.add_argument("--explain", action="store_true", help="Print explain() plans afterwards")
+    parser.add_argument("--sample-value", default="general",
+                        help="Value used for the equality predicates in explained queries")
+    args = parser.parse_args()
+
+    try:
+        ensured = mongodb_client.ensure_indexes()
+        print(f"Compound indexes: {', '.join(ensured['compound_indexes'])}")
+        if ensured["dropped_indexes"]:
+            print(f"Dropped superseded indexes: {', '.join(ensured['dropped_indexes'])}")
+        print(f"Vector index: {ensured['vector_index']}")
+
+        if args.explain:
+            diagnostics = mongodb_client.index_diagnostics(args.sample_value)
+            for report in diagnostics["plans"]:
+                print(f"\n{report['query']} {report['filter']}")
+                for key, value in report.items():
+                    if key not in ("query", "filter"):
+                        print(f"  {key}: {value}")
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        mongodb_client.close()
+
+
+if __name__ == "__main__":
+    main()
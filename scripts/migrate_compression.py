@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Compress large text fields of prompts stored before compression was enabled.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress existing prompt documents")
+    parser.add_argument("--train-dictionary", action="store_true",
+                        help="Train a zstd dictionary on existing templates first")
+    parser.add_argument("--sample-size", type=int, default=500,
+                        help="Documents sampled for dictionary training (default: 500)")
+    parser.add_argument("--batch-size", type=int, default=100,
+                        help="Updates per bulk write (default: 100)")
+    args = parser.parse_args()
+
+    if not config.COMPRESSION_ENABLED:
+        print("Set COMPRESSION_ENABLED=true before migrating.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        counts = mongodb_client.migrate_compression(
+            batch_size=args.batch_size,
+            train_dictionary=args.train_dictionary,
+            sample_size=args.sample_size,
+        )
+        print(f"Scanned {counts['scanned']} documents, compressed {counts['rewritten']}, "
+              f"skipped {counts['skipped']} updated during the migration")
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        mongodb_client.close()
+
+
+if __name__ == "__main__":
+    main()
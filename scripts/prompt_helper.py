@@ -34,17 +34,12 @@ async def search(query: str, limit: int = 5):
 async def save(conversation_file: str = None, conversation_json: str = None, 
                task_description: str = None, context_info: str = None):
     """Save a conversation as a prompt."""
-    if conversation_file:
-        with open(conversation_file, 'r') as f:
-            conversation_json = f.read()
-    elif not conversation_json:
+    if not conversation_file and not conversation_json:
         print("Enter conversation JSON (or 'file:<path>' to read from file):")
         print("Format: [{\"role\": \"user\", \"content\": \"...\"}, ...]")
         user_input = input().strip()
         if user_input.startswith("file:"):
-            file_path = user_input[5:].strip()
-            with open(file_path, 'r') as f:
-                conversation_json = f.read()
+            conversation_file = user_input[5:].strip()
         else:
             conversation_json = user_input
     
@@ -55,7 +50,12 @@ async def save(conversation_file: str = None, conversation_json: str = None,
         context_info = input("Context info (optional): ").strip() or None
     
     print("\nSaving prompt...")
-    result = await handle_save_prompt(conversation_json, task_description, context_info)
+    if conversation_file:
+        # Stream the file so large exports are never held in memory whole
+        with open(conversation_file, 'r') as f:
+            result = await handle_save_prompt(f, task_description, context_info)
+    else:
+        result = await handle_save_prompt(conversation_json, task_description, context_info)
     print("\n" + "="*60)
     print(result[0].text)
     print("="*60)
@@ -70,10 +70,10 @@ async def get_details(prompt_id: str):
     print("="*60)
 
 
-async def search_by_use_case(use_case: str, limit: int = 10):
+async def search_by_use_case(use_case: str, limit: int = 10, cursor: str = None):
     """Search prompts by use case."""
     print(f"Searching for {use_case} prompts...")
-    result = await handle_search_prompts_by_use_case(use_case, limit)
+    result = await handle_search_prompts_by_use_case(use_case, limit, cursor)
     print("\n" + "="*60)
     print(result[0].text)
     print("="*60)
@@ -122,6 +122,7 @@ def main():
     use_case_parser.add_argument("use_case", choices=["code-gen", "text-gen", "data-analysis", "creative", "general"],
                                 help="Use case category")
     use_case_parser.add_argument("--limit", type=int, default=10, help="Maximum results (default: 10)")
+    use_case_parser.add_argument("--cursor", help="next_cursor from the previous page")
     
     # Update command
     update_parser = subparsers.add_parser("update", help="Update a prompt")
@@ -131,6 +132,9 @@ def main():
     update_parser.add_argument("--summary", help="New summary")
     update_parser.add_argument("--use-case", help="New use case")
     update_parser.add_argument("--history", help="Updated history")
+    update_parser.add_argument(
+        "--expected-version", type=int, help="Fail if the prompt is not at this version"
+    )
     
     # Improve command
     improve_parser = subparsers.add_parser("improve", help="Improve a prompt")
@@ -152,7 +156,7 @@ def main():
         elif args.command == "details":
             asyncio.run(get_details(args.prompt_id))
         elif args.command == "use-case":
-            asyncio.run(search_by_use_case(args.use_case, args.limit))
+            asyncio.run(search_by_use_case(args.use_case, args.limit, args.cursor))
         elif args.command == "update":
             kwargs = {}
             if args.template:
@@ -163,6 +167,8 @@ def main():
                 kwargs["use_case"] = args.use_case
             if args.history:
                 kwargs["history"] = args.history
+            if args.expected_version is not None:
+                kwargs["expected_version"] = args.expected_version
             asyncio.run(update(args.prompt_id, args.change, **kwargs))
         elif args.command == "improve":
             asyncio.run(improve(args.prompt_id, args.feedback, args.context))
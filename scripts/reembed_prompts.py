@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Re-embed stored prompts with the configured embedding provider.
+
+Run after changing EMBEDDING_PROVIDER (or the provider's model): embeddings of
+different models cannot be compared, so search only works once every prompt is
+embedded by the active one.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompt_saver_mcp.database.mongodb_client import mongodb_client
+from prompt_saver_mcp.embeddings.client import embedding_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed prompts with the active provider")
+    parser.add_argument("--batch-size", type=int, default=64,
+                        help="Summaries embedded per request (default: 64)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only count prompts embedded by another model")
+    args = parser.parse_args()
+
+    try:
+        model_id = embedding_client.model_id
+        if args.dry_run:
+            stale = mongodb_client.collection.count_documents(
+                {"embedding_model": {"$ne": model_id}}
+            )
+            print(f"{stale} prompts are not embedded with {model_id}")
+            return
+        counts = mongodb_client.reembed_prompts(
+            embedding_client.generate_embeddings_batch, model_id, batch_size=args.batch_size
+        )
+        print(f"Scanned {counts['scanned']} prompts, re-embedded {counts['rewritten']} "
+              f"with {model_id}")
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        mongodb_client.close()
+
+
+if __name__ == "__main__":
+    main()
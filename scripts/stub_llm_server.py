@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Minimal OpenAI-compatible chat completions server for local testing.
+
+Returns canned but well-formed replies (an analysis JSON object for JSON requests, a
+markdown template for template requests, an improved template otherwise) after an
+optional delay, so the server can be exercised end to end without an API key or GPU:
+
+    python scripts/stub_llm_server.py --port 8081
+    LLM_PROVIDER=local LOCAL_LLM_BASE_URL=http://127.0.0.1:8081/v1 python -m prompt_saver_mcp.server
+"""
+
+import sys
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def is_template_request(body):
+    """Whether a request is the template half of a split analysis."""
+    messages = body.get("messages", [])
+    return any("Generate the reusable prompt template" in m.get("content", "") for m in messages)
+
+
+def generates_template(body):
+    """Whether a request asks for a prompt template, alone or in a full analysis."""
+    messages = body.get("messages", [])
+    return is_template_request(body) or any(
+        "prompt_template" in m.get("content", "") for m in messages
+    )
+
+
+def reply_for(body):
+    """Build the assistant reply for a chat completion request."""
+    messages = body.get("messages", [])
+    user_text = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    wants_json = body.get("response_format", {}).get("type") == "json_object" or any(
+        "JSON" in m.get("content", "") for m in messages if m["role"] == "system"
+    )
+    excerpt = " ".join(user_text.split())[:120]
+    if wants_json:
+        return json.dumps(
+            {
+                "use_case": "general",
+                "summary": f"Stub summary of: {excerpt}",
+                "prompt_template": f"# Overview\n\nStub template for: {excerpt}\n",
+                "history": "Stub history.",
+            }
+        )
+    if is_template_request(body):
+        return f"# Overview\n\nStub template for: {excerpt}\n"
+    return f"# Improved Prompt\n\nStub improvement based on: {excerpt}"
+
+
+def create_app(model, latency, template_latency=None):
+    async def chat_completions(request: Request) -> JSONResponse:
+        body = await request.json()
+        delay = latency
+        if template_latency is not None and generates_template(body):
+            delay = template_latency
+        if delay:
+            await asyncio.sleep(delay)
+        content = reply_for(body)
+        prompt_tokens = sum(len(m.get("content", "")) // 4 for m in body.get("messages", []))
+        completion_tokens = len(content) // 4
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", model),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+
+    async def models(request: Request) -> JSONResponse:
+        return JSONResponse(
+            {"object": "list", "data": [{"id": model, "object": "model", "owned_by": "stub"}]}
+        )
+
+    return Starlette(
+        routes=[
+            Route("/v1/chat/completions", endpoint=chat_completions, methods=["POST"]),
+            Route("/v1/models", endpoint=models, methods=["GET"]),
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8081, help="Port (default: 8081)")
+    parser.add_argument("--model", default="local-model", help="Model name reported")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds to wait before each reply (default: 0)")
+    parser.add_argument("--template-latency", type=float,
+                        help="Seconds to wait before replies containing a template "
+                             "(default: --latency)")
+    args = parser.parse_args()
+
+    try:
+        uvicorn.run(
+            create_app(args.model, args.latency, args.template_latency),
+            host=args.host,
+            port=args.port,
+        )
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
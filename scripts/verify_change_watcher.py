@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Check that one server instance's local index follows another instance's writes.
+
+Two MongoDBClients act as two server instances sharing a scratch database: the writer
+inserts, updates and deletes prompts, and a ChangeWatcher keeps the reader's local
+vector index in step. The watcher is then stopped, a prompt is written, and a new
+watcher must pick it up from the persisted resume token (or poll watermark).
+
+Change streams need a replica set; a local single-node one is enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+    python scripts/verify_change_watcher.py --uri "mongodb://localhost:27017/?replicaSet=rs0"
+
+--mode poll checks the last_updated polling fallback, which also runs on a standalone server.
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import prompt_saver_mcp
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DIMENSIONS = 8
+OVERLAP = 1.0
+
+
+def embedding(seed):
+    """A unit vector that differs per seed."""
+    vector = [float((seed * 7 + i * 3) % 5 + 1) for i in range(DIMENSIONS)]
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector]
+
+
+async def wait_for(description, condition, timeout):
+    """Wait until condition() holds; returns the seconds it took."""
+    started = time.monotonic()
+    while not condition():
+        if time.monotonic() - started > timeout:
+            raise AssertionError(f"Timed out after {timeout}s waiting for: {description}")
+        await asyncio.sleep(0.05)
+    elapsed = time.monotonic() - started
+    print(f"  ok  {description} ({elapsed * 1000:.0f} ms)")
+    return elapsed
+
+
+def indexed_summary(client, prompt_id):
+    """Summary of a prompt as the client's local index holds it, or None."""
+    results = client.local_index.search(embedding(0), limit=len(client.local_index) or 1)
+    return next((r["summary"] for r in results if r["_id"] == prompt_id), None)
+
+
+async def run(args):
+    from bson import ObjectId
+
+    from prompt_saver_mcp.config import config
+    from prompt_saver_mcp.database.change_watcher import ChangeWatcher, LocalIndexListener
+    from prompt_saver_mcp.database.models import PromptCreate, PromptUpdate
+    from prompt_saver_mcp.database.mongodb_client import MongoDBClient
+
+    def create(client, seed):
+        return client.create_prompt(
+            PromptCreate(
+                use_case="general",
+                summary=f"prompt {seed}",
+                prompt_template=f"# Template {seed}",
+                history="Created by verify_change_watcher",
+                embedding=embedding(seed),
+            )
+        )
+
+    writer = MongoDBClient()
+    reader = MongoDBClient()
+    state = reader.db[config.MONGODB_WATCHER_COLLECTION]
+
+    def new_watcher():
+        return ChangeWatcher(
+            reader.collection,
+            state,
+            [LocalIndexListener(reader)],
+            watcher_id="verify",
+            mode=args.mode,
+            poll_interval=0.2,
+            poll_overlap=OVERLAP,
+            reconcile_interval=0.5,
+            checkpoint_interval=0.2,
+        )
+
+    try:
+        writer.client.drop_database(config.MONGODB_DATABASE)
+        seeded = create(writer, 1)
+
+        watcher = new_watcher()
+        watcher.start()
+        print(f"Watching {reader.collection.full_name} (requested mode: {args.mode})")
+        await wait_for(
+            "initial load",
+            lambda: reader.local_index is not None and seeded in reader.local_index.prompt_ids(),
+            args.timeout,
+        )
+        print(f"  mode: {watcher.mode}")
+
+        inserted = create(writer, 2)
+        await wait_for("insert", lambda: inserted in reader.local_index.prompt_ids(), args.timeout)
+
+        writer.update_prompt(inserted, PromptUpdate(summary="updated summary"))
+        await wait_for(
+            "update",
+            lambda: indexed_summary(reader, inserted) == "updated summary",
+            args.timeout,
+        )
+
+        writer.collection.delete_one({"_id": ObjectId(seeded)})
+        await wait_for("delete", lambda: len(reader.local_index) == 1, args.timeout)
+
+        await watcher.stop()
+        saved = state.find_one({"_id": watcher.state_id}) or {}
+        position = "resume_token" if watcher.mode == "stream" else "poll_watermark"
+        if saved.get(position) is None:
+            raise AssertionError(f"No {position} was persisted")
+        print(f"  ok  {position} persisted")
+
+        missed = create(writer, 3)
+        # Past the poll overlap, so only the persisted position can find the write
+        await asyncio.sleep(OVERLAP + 0.5)
+        watcher = new_watcher()
+        watcher.start()
+        await wait_for(
+            "write made while stopped, after resuming",
+            lambda: missed in reader.local_index.prompt_ids(),
+            args.timeout,
+        )
+        await watcher.stop()
+        print(f"Passed: {watcher.snapshot()}")
+    finally:
+        if not args.keep:
+            writer.client.drop_database(config.MONGODB_DATABASE)
+        writer.close()
+        reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check local index invalidation across instances")
+    parser.add_argument("--uri", help="MongoDB URI (default: MONGODB_URI)")
+    parser.add_argument("--database", default="prompt_saver_watcher_check",
+                        help="Scratch database, dropped before and after the run "
+                             "(default: prompt_saver_watcher_check)")
+    parser.add_argument("--mode", choices=["auto", "stream", "poll"], default="stream",
+                        help="Watcher mode to check (default: stream)")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Seconds to wait for each change (default: 10)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    args = parser.parse_args()
+
+    # Configure before prompt_saver_mcp reads the environment
+    if args.uri:
+        os.environ["MONGODB_URI"] = args.uri
+    os.environ["MONGODB_DATABASE"] = args.database
+    os.environ["EMBEDDING_DIMENSIONS"] = str(DIMENSIONS)
+    os.environ["COMPRESSION_ENABLED"] = "false"
+
+    try:
+        asyncio.run(run(args))
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Shared fixtures."""
+
+import inspect
+import math
+
+import pytest
+
+from prompt_saver_mcp.database.compression import TextCompressor
+
+
+def unit(*values):
+    """Normalize a vector to unit length."""
+    norm = math.sqrt(sum(v * v for v in values))
+    return [v / norm for v in values]
+
+
+@pytest.fixture
+def compressor():
+    """A compressor without a dictionary collection."""
+    return TextCompressor()
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """A MongoDBClient backed by an in-memory mongomock server."""
+    mongomock = pytest.importorskip("mongomock")
+    from prompt_saver_mcp.database import mongodb_client
+
+    builder = mongomock.collection.BulkOperationBuilder
+    add_update = builder.add_update
+    if "sort" not in inspect.signature(add_update).parameters:
+        # pymongo 4.11+ passes UpdateOne(sort=...) through to bulk builders
+        def add_update_without_sort(self, *args, sort=None, **kwargs):
+            return add_update(self, *args, **kwargs)
+
+        monkeypatch.setattr(builder, "add_update", add_update_without_sort)
+
+    server = mongomock.MongoClient()
+    monkeypatch.setattr(mongodb_client, "MongoClient", lambda *args, **kwargs: server)
+    client = mongodb_client.MongoDBClient()
+    yield client
+    client.close()
@@ -0,0 +1,125 @@
+"""Tests for priority-aware admission control."""
+
+import asyncio
+
+import pytest
+
+from prompt_saver_mcp.utils.admission import (
+    INTERACTIVE,
+    LLM,
+    AdmissionController,
+    AdmissionRejected,
+    classify,
+)
+
+
+def _controller(total=2, interactive=2, llm=1, queue=5, wait=5.0):
+    return AdmissionController(
+        total_limit=total,
+        limits={INTERACTIVE: interactive, LLM: llm},
+        max_queue={INTERACTIVE: queue, LLM: queue},
+        max_wait={INTERACTIVE: wait, LLM: wait},
+    )
+
+
+def test_classify():
+    assert classify("save_prompt", {}) == LLM
+    assert classify("save_prompt", {"async_mode": True}) == INTERACTIVE
+    assert classify("improve_prompt_from_feedback", {}) == LLM
+    assert classify("search_prompts", {"query": "x"}) == INTERACTIVE
+
+
+def test_calls_beyond_the_class_limit_wait_for_a_slot():
+    controller = _controller(total=4, llm=1)
+
+    async def scenario():
+        order = []
+
+        async def call(name):
+            async with controller.admit(LLM):
+                order.append(name)
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(call("first"), call("second"))
+        return order
+
+    assert asyncio.run(scenario()) == ["first", "second"]
+    snapshot = controller.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["classes"][LLM]["admitted"] == 2
+    assert snapshot["classes"][LLM]["max_queued"] == 1
+
+
+def test_interactive_calls_are_admitted_before_queued_llm_calls():
+    controller = _controller(total=1, interactive=1, llm=1)
+
+    async def scenario():
+        order = []
+        holder = await controller.acquire(INTERACTIVE)
+        assert holder == 0.0
+
+        async def call(admission_class):
+            async with controller.admit(admission_class):
+                order.append(admission_class)
+
+        llm = asyncio.create_task(call(LLM))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call(INTERACTIVE))
+        await asyncio.sleep(0)
+        controller._release(INTERACTIVE)
+        await asyncio.gather(llm, interactive)
+        return order
+
+    assert asyncio.run(scenario()) == [INTERACTIVE, LLM]
+
+
+def test_full_queue_rejects_with_a_retry_hint():
+    controller = _controller(llm=1, queue=1)
+
+    async def scenario():
+        await controller.acquire(LLM)
+        queued = asyncio.create_task(controller.acquire(LLM))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(LLM)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        return rejected.value
+
+    error = asyncio.run(scenario())
+    assert error.admission_class == LLM
+    assert error.retry_after >= 1.0
+    assert "saturated" in str(error)
+    assert controller.snapshot()["classes"][LLM]["rejected"] == 1
+    assert controller.snapshot()["classes"][LLM]["queued"] == 0
+
+
+def test_waiting_longer_than_the_maximum_rejects():
+    controller = _controller(llm=1, wait=0.05)
+
+    async def scenario():
+        await controller.acquire(LLM)
+        with pytest.raises(AdmissionRejected, match="waited over"):
+            await controller.acquire(LLM)
+
+    asyncio.run(scenario())
+    snapshot = controller.snapshot()["classes"][LLM]
+    assert snapshot["queued"] == 0
+    assert snapshot["in_flight"] == 1
+
+
+def test_cancelled_waiters_do_not_leak_slots():
+    controller = _controller(total=1, llm=1)
+
+    async def scenario():
+        await controller.acquire(LLM)
+        waiter = asyncio.create_task(controller.acquire(LLM))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        controller._release(LLM)
+        # The slot is free again rather than held by the cancelled waiter
+        assert await controller.acquire(LLM) == 0.0
+
+    asyncio.run(scenario())
+    assert controller.snapshot()["in_flight"] == 1
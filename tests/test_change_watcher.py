@@ -0,0 +1,332 @@
+"""Tests for the change watcher's polling fallback and change stream handling."""
+
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database.change_watcher import ChangeListener, ChangeWatcher
+from prompt_saver_mcp.database.models import PromptCreate, PromptUpdate
+
+
+class FakeChangeStreams:
+    """
+    Stand-in for MongoDB change streams over mongomock, which has none.
+
+    Tests emit events explicitly; a stream opened with resume_after continues after that
+    event, one opened without it starts at the end like a real stream.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.events = []
+        self.oldest = 0
+        self.opened = []
+        self.fail_with = None
+
+    def emit(self, operation, prompt_id=None):
+        event = {"_id": {"_data": len(self.events)}, "operationType": operation}
+        if prompt_id is not None:
+            event["documentKey"] = {"_id": ObjectId(prompt_id)}
+            if operation in ("insert", "update", "replace"):
+                event["fullDocument"] = self.collection.find_one({"_id": ObjectId(prompt_id)})
+        self.events.append(event)
+
+    def watch(self, collection, pipeline=None, resume_after=None, **kwargs):
+        self.opened.append(resume_after)
+        if self.fail_with is not None:
+            error, self.fail_with = self.fail_with, None
+            raise error
+        if resume_after is None:
+            return FakeChangeStream(self, len(self.events))
+        if resume_after["_data"] < self.oldest:
+            raise OperationFailure("resume point is no longer in the oplog", code=286)
+        return FakeChangeStream(self, resume_after["_data"] + 1)
+
+
+class FakeChangeStream:
+    def __init__(self, streams, position):
+        self.streams = streams
+        self.position = position
+        self.resume_token = None
+        self.alive = True
+
+    def try_next(self):
+        if self.position >= len(self.streams.events):
+            return None
+        event = self.streams.events[self.position]
+        self.position += 1
+        self.resume_token = event["_id"]
+        if event["operationType"] == "invalidate":
+            self.alive = False
+        return event
+
+    def close(self):
+        self.alive = False
+
+
+@pytest.fixture
+def streams(mongo, monkeypatch):
+    import mongomock
+
+    fake = FakeChangeStreams(mongo.collection)
+    monkeypatch.setattr(mongomock.collection.Collection, "watch", fake.watch, raising=False)
+    return fake
+
+
+class Recorder(ChangeListener):
+    """Listener remembering the latest state of every prompt it was given."""
+
+    def __init__(self):
+        self.documents = {}
+        self.deleted = []
+        self.resets = 0
+
+    def upsert(self, document):
+        self.documents[str(document["_id"])] = dict(document)
+
+    def delete(self, prompt_id):
+        self.documents.pop(prompt_id, None)
+        self.deleted.append(prompt_id)
+
+    def known_ids(self):
+        return set(self.documents)
+
+    def reset(self):
+        self.resets += 1
+
+
+def _create(client, summary="summary"):
+    return client.create_prompt(
+        PromptCreate(use_case="general", summary=summary, prompt_template="# T", history="h")
+    )
+
+
+def _poll_watcher(client, listener, **kwargs):
+    return _watcher(client, listener, **{"mode": "poll", **kwargs})
+
+
+def _watcher(client, listener, **kwargs):
+    options = dict(
+        watcher_id="test",
+        mode="stream",
+        poll_interval=0.02,
+        poll_overlap=0,
+        reconcile_interval=0.05,
+        checkpoint_interval=0.01,
+    )
+    options.update(kwargs)
+    return ChangeWatcher(client.collection, client.db["change_watchers"], [listener], **options)
+
+
+async def _until(condition, timeout=5.0):
+    started = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_polling_sees_bulk_maintenance_writes(mongo):
+    prompt_id = _create(mongo)
+    recorder = Recorder()
+
+    async def scenario():
+        watcher = _poll_watcher(mongo, recorder)
+        watcher.start()
+        await _until(lambda: watcher.mode == "poll" and watcher._loaded)
+        await asyncio.sleep(0.05)
+
+        mongo.set_use_cases({prompt_id: "code-gen"})
+        await _until(lambda: recorder.documents.get(prompt_id, {}).get("use_case") == "code-gen")
+
+        mongo.reembed_prompts(lambda texts: [[1.0, 0.0] for _ in texts], "local/test")
+        await _until(
+            lambda: recorder.documents[prompt_id].get("embedding_model") == "local/test"
+        )
+        await watcher.stop()
+
+    asyncio.run(scenario())
+    stored = mongo.collection.find_one({})
+    # Listing order (last_updated) is untouched by maintenance writes
+    assert stored["last_updated"] < stored["modified_at"]
+
+
+def test_polling_applies_inserts_updates_and_deletes(mongo):
+    existing = _create(mongo, "existing")
+    recorder = Recorder()
+
+    async def scenario():
+        watcher = _poll_watcher(mongo, recorder)
+        watcher.start()
+        await _until(lambda: watcher._loaded)
+        await asyncio.sleep(0.01)
+
+        inserted = _create(mongo, "inserted")
+        await _until(lambda: inserted in recorder.documents)
+
+        await asyncio.sleep(0.01)
+        mongo.update_prompt(inserted, PromptUpdate(summary="edited"))
+        await _until(lambda: recorder.documents[inserted]["summary"] == "edited")
+
+        # Held but no longer stored: found by the reconcile pass
+        recorder.documents[existing] = {"_id": existing}
+        mongo.collection.delete_one({"_id": ObjectId(existing)})
+        await _until(lambda: existing in recorder.deleted)
+        await watcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_polling_resumes_from_the_persisted_watermark(mongo):
+    first = Recorder()
+
+    async def scenario():
+        watcher = _poll_watcher(mongo, first)
+        watcher.start()
+        await _until(lambda: watcher._loaded)
+        await asyncio.sleep(0.01)
+        seen = _create(mongo, "seen")
+        await _until(lambda: seen in first.documents)
+        await watcher.stop()
+
+        missed = _create(mongo, "missed while stopped")
+        second = Recorder()
+        watcher = _poll_watcher(mongo, second)
+        watcher.start()
+        await _until(lambda: missed in second.documents)
+        await watcher.stop()
+        return watcher
+
+    watcher = asyncio.run(scenario())
+    state = mongo.db["change_watchers"].find_one({"_id": watcher.state_id})
+    assert state["poll_watermark"] is not None
+
+
+def test_stream_applies_changes_and_resumes_from_the_token(mongo, streams):
+    first = Recorder()
+
+    async def scenario():
+        watcher = _watcher(mongo, first)
+        watcher.start()
+        await _until(lambda: watcher.mode == "stream" and watcher._loaded)
+
+        prompt_id = _create(mongo, "streamed")
+        streams.emit("insert", prompt_id)
+        await _until(lambda: prompt_id in first.documents)
+
+        mongo.update_prompt(prompt_id, PromptUpdate(summary="edited"))
+        streams.emit("update", prompt_id)
+        await _until(lambda: first.documents[prompt_id]["summary"] == "edited")
+
+        streams.emit("delete", prompt_id)
+        await _until(lambda: prompt_id in first.deleted)
+        await watcher.stop()
+
+        missed = _create(mongo, "missed while stopped")
+        streams.emit("insert", missed)
+        second = Recorder()
+        watcher = _watcher(mongo, second)
+        watcher.start()
+        await _until(lambda: missed in second.documents)
+        await watcher.stop()
+        return second
+
+    second = asyncio.run(scenario())
+    # Resumed after the last event seen: nothing earlier is replayed
+    assert streams.opened == [None, {"_data": 2}]
+    assert len(second.documents) == 1 and not second.deleted
+
+
+def test_stream_resets_when_its_history_is_lost(mongo, streams):
+    mongo.db["change_watchers"].insert_one(
+        {"_id": f"test:{mongo.collection.full_name}", "resume_token": {"_data": 0}}
+    )
+    streams.emit("insert", _create(mongo))
+    streams.oldest = 1
+    recorder = Recorder()
+
+    async def scenario():
+        watcher = _watcher(mongo, recorder)
+        watcher.start()
+        await _until(lambda: watcher.mode == "stream" and watcher._loaded)
+        await watcher.stop()
+
+    asyncio.run(scenario())
+    assert recorder.resets == 1
+    assert streams.opened == [{"_data": 0}, None]
+
+
+def test_invalidated_stream_resets_and_reopens(mongo, streams):
+    recorder = Recorder()
+
+    async def scenario():
+        watcher = _watcher(mongo, recorder)
+        watcher.start()
+        await _until(lambda: watcher._loaded)
+
+        streams.emit("invalidate")
+        await _until(lambda: len(streams.opened) == 2)
+
+        prompt_id = _create(mongo)
+        streams.emit("insert", prompt_id)
+        await _until(lambda: prompt_id in recorder.documents)
+        await watcher.stop()
+
+    asyncio.run(scenario())
+    assert recorder.resets == 1
+    assert streams.opened == [None, None]
+
+
+def test_auto_mode_falls_back_to_polling_without_change_streams(mongo, streams):
+    streams.fail_with = OperationFailure("not a replica set", code=40573)
+    recorder = Recorder()
+
+    async def scenario():
+        watcher = _watcher(mongo, recorder, mode="auto")
+        watcher.start()
+        await _until(lambda: watcher.mode == "poll" and watcher._loaded)
+
+        prompt_id = _create(mongo)
+        await _until(lambda: prompt_id in recorder.documents)
+        await watcher.stop()
+        return watcher
+
+    watcher = asyncio.run(scenario())
+    assert watcher.snapshot()["errors"] == 0
+
+
+@pytest.mark.skipif(
+    not os.getenv("MONGODB_REPLICA_SET_URI"),
+    reason="set MONGODB_REPLICA_SET_URI to test against a real change stream",
+)
+def test_stream_against_a_replica_set(monkeypatch):
+    from prompt_saver_mcp.database.mongodb_client import MongoDBClient
+
+    monkeypatch.setattr(config, "MONGODB_URI", os.environ["MONGODB_REPLICA_SET_URI"])
+    monkeypatch.setattr(config, "MONGODB_DATABASE", f"prompt_saver_test_{uuid.uuid4().hex[:8]}")
+    client = MongoDBClient()
+    recorder = Recorder()
+
+    async def scenario():
+        watcher = _watcher(client, recorder)
+        watcher.start()
+        await _until(lambda: watcher.mode == "stream" and watcher._loaded)
+
+        prompt_id = _create(client)
+        await _until(lambda: prompt_id in recorder.documents)
+        client.update_prompt(prompt_id, PromptUpdate(summary="edited"))
+        await _until(lambda: recorder.documents[prompt_id]["summary"] == "edited")
+        client.collection.delete_one({"_id": ObjectId(prompt_id)})
+        await _until(lambda: prompt_id in recorder.deleted)
+        await watcher.stop()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        client.client.drop_database(config.MONGODB_DATABASE)
+        client.close()
@@ -0,0 +1,133 @@
+"""Tests for the circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from prompt_saver_mcp.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    breaker_snapshots,
+    get_breaker,
+)
+
+
+class Unavailable(Exception):
+    pass
+
+
+async def _fail():
+    raise Unavailable("connection refused")
+
+
+async def _succeed():
+    return "ok"
+
+
+def _trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(Unavailable):
+            asyncio.run(breaker.call(_fail))
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker("llm", failure_threshold=3, reset_timeout=60)
+
+    _trip(breaker)
+
+    assert breaker.state == OPEN
+    calls = []
+    with pytest.raises(CircuitOpenError) as error:
+        asyncio.run(breaker.call(lambda: calls.append(1) or _succeed()))
+    assert not calls
+    assert error.value.name == "llm"
+    assert 0 < error.value.retry_after <= 60
+    assert breaker.snapshot()["rejected"] == 1
+    assert breaker.snapshot()["trips"] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("llm", failure_threshold=2)
+
+    with pytest.raises(Unavailable):
+        asyncio.run(breaker.call(_fail))
+    assert asyncio.run(breaker.call(_succeed)) == "ok"
+    with pytest.raises(Unavailable):
+        asyncio.run(breaker.call(_fail))
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens_the_circuit():
+    breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout=0)
+    _trip(breaker)
+
+    # A failed probe opens the circuit again
+    with pytest.raises(Unavailable):
+        asyncio.run(breaker.call(_fail))
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+
+    assert asyncio.run(breaker.call(_succeed)) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_only_one_probe_runs_while_half_open():
+    breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout=0)
+    _trip(breaker)
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # A cancelled probe frees the slot without deciding the state
+    breaker.release()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_errors_that_are_not_dependency_failures_do_not_count():
+    breaker = CircuitBreaker(
+        "llm", failure_threshold=1, reset_timeout=0,
+        is_failure=lambda error: isinstance(error, Unavailable),
+    )
+
+    async def bad_request():
+        raise ValueError("invalid prompt")
+
+    with pytest.raises(ValueError):
+        asyncio.run(breaker.call(bad_request))
+    assert breaker.state == CLOSED
+
+    _trip(breaker)
+    breaker.before_call()
+    # The probe got an answer, so the dependency is up
+    breaker.record_failure(ValueError("invalid prompt"))
+    assert breaker.state == CLOSED
+
+
+def test_cancellation_releases_the_probe():
+    breaker = CircuitBreaker("llm", failure_threshold=1, reset_timeout=0)
+    _trip(breaker)
+
+    async def scenario():
+        probe = asyncio.create_task(breaker.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+
+
+def test_breakers_are_shared_by_name():
+    breaker = get_breaker("test-shared")
+
+    assert get_breaker("test-shared") is breaker
+    assert breaker_snapshots()["test-shared"]["state"] == CLOSED
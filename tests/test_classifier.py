@@ -0,0 +1,105 @@
+"""Tests for the nearest-centroid use case classifier."""
+
+import pytest
+
+from prompt_saver_mcp.embeddings.classifier import (
+    FALLBACK_USE_CASE,
+    UseCaseClassifier,
+    choose_use_case,
+)
+from tests.conftest import unit
+
+CODE = [unit(1, 0.1 * i, 0) for i in range(3)]
+TEXT = [unit(0.1 * i, 1, 0) for i in range(3)]
+
+
+def _trained(min_examples=3):
+    classifier = UseCaseClassifier(3, min_examples=min_examples)
+    classifier.fit(CODE + TEXT, ["code-gen"] * 3 + ["text-gen"] * 3)
+    return classifier
+
+
+def test_not_ready_until_two_labels_have_enough_examples():
+    classifier = UseCaseClassifier(3, min_examples=3)
+    classifier.fit(CODE, ["code-gen"] * 3)
+
+    assert not classifier.ready
+    with pytest.raises(ValueError):
+        classifier.predict([CODE[0]])
+
+
+def test_predicts_the_nearest_centroid_with_a_margin():
+    (label, margin), = _trained().predict([unit(1, 0.05, 0)])
+
+    assert label == "code-gen"
+    assert 0 < margin <= 2
+
+
+def test_add_rejects_unknown_labels_and_wrong_dimensions():
+    classifier = UseCaseClassifier(3)
+
+    assert classifier.add(unit(1, 0, 0), "not-a-label") is False
+    assert classifier.add(unit(1, 0), "code-gen") is False
+    assert classifier.counts["code-gen"] == 0
+
+
+def test_leave_one_out_matches_retraining_without_the_example():
+    classifier = _trained(min_examples=2)
+    embeddings = CODE + TEXT + [unit(0.9, 0.8, 0)]
+    labels = ["code-gen"] * 3 + ["text-gen"] * 3 + ["code-gen"]
+    classifier.add(embeddings[-1], labels[-1])
+
+    held_out = classifier.leave_one_out(embeddings, labels)
+
+    for i in range(len(embeddings)):
+        retrained = UseCaseClassifier(3, min_examples=2)
+        retrained.fit(embeddings[:i] + embeddings[i + 1 :], labels[:i] + labels[i + 1 :])
+        label, margin = retrained.predict([embeddings[i]])[0]
+        assert held_out[i][0] == label
+        assert held_out[i][1] == pytest.approx(margin)
+
+
+def _complete(min_examples=3):
+    classifier = UseCaseClassifier(3, min_examples=min_examples)
+    for i, label in enumerate(classifier.labels):
+        classifier.fit([unit(1, 0.1 * i, 0.2 * i)] * min_examples, [label] * min_examples)
+    classifier.fit(TEXT, ["text-gen"] * 3)
+    return classifier
+
+
+def test_choose_use_case_prefers_a_complete_classifier():
+    assert _complete().complete
+    assert choose_use_case(_complete(), unit(0, 1, 0), "code-gen") == "text-gen"
+
+
+def test_labels_not_yet_usable_are_still_stored_and_trained():
+    classifier = _trained()
+    assert classifier.ready and not classifier.complete
+
+    # The classifier cannot predict "creative" yet, so the LLM's label is kept
+    assert choose_use_case(classifier, unit(0, 0, 1), "creative") == "creative"
+    assert classifier.counts["creative"] == 1
+
+
+def test_ready_classifier_replaces_a_missing_llm_label():
+    classifier = _trained()
+
+    assert choose_use_case(classifier, unit(0, 1, 0), None) == "text-gen"
+    assert classifier.counts["text-gen"] == 3
+
+
+def test_choose_use_case_trains_on_valid_llm_labels_only():
+    classifier = UseCaseClassifier(3, min_examples=3)
+
+    assert choose_use_case(classifier, CODE[0], "code-gen") == "code-gen"
+    assert choose_use_case(classifier, CODE[1], None) == FALLBACK_USE_CASE
+    assert choose_use_case(classifier, CODE[2], "text-gen", train=False) == "text-gen"
+
+    assert classifier.counts["code-gen"] == 1
+    assert classifier.counts["general"] == 0
+    assert classifier.counts["text-gen"] == 0
+
+
+def test_choose_use_case_without_classifier():
+    assert choose_use_case(None, None, "creative") == "creative"
+    assert choose_use_case(None, None, None) == FALLBACK_USE_CASE
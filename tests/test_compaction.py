@@ -0,0 +1,117 @@
+"""Tests for conversation compaction."""
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.utils.compaction import (
+    compact_conversation,
+    compaction_totals,
+    prepare_conversation,
+    truncate_middle,
+)
+from prompt_saver_mcp.utils.tokens import count_tokens
+
+PARAGRAPH = "The parser must handle quoted fields, escaped quotes and embedded newlines."
+CODE = "```python\ndef parse(line):\n    return line.split(',')\n```"
+
+
+def test_truncate_middle_keeps_head_and_tail():
+    text = "START " + " ".join(f"word{i}" for i in range(2000)) + " END"
+
+    truncated, omitted = truncate_middle(text, 100)
+
+    assert omitted > 0
+    assert truncated.startswith("START")
+    assert truncated.endswith("END")
+    assert "tokens omitted" in truncated
+    assert count_tokens(truncated) < 130
+
+
+def test_truncate_middle_leaves_short_text_alone():
+    assert truncate_middle("short text", 100) == ("short text", 0)
+
+
+def test_repeated_messages_become_references():
+    messages = [
+        {"role": "user", "content": PARAGRAPH},
+        {"role": "assistant", "content": "Done."},
+        {"role": "user", "content": "  " + PARAGRAPH.replace(" ", "  ")},
+    ]
+
+    compacted, report = compact_conversation(messages, min_block_chars=20)
+
+    assert compacted[2]["content"] == "[same content as message 1]"
+    assert compacted[2]["role"] == "user"
+    assert report.duplicate_messages == 1
+    # The input is not modified
+    assert messages[2]["content"].strip().startswith("The")
+
+
+def test_repeated_blocks_and_code_become_markers():
+    messages = [
+        {"role": "assistant", "content": f"Intro.\n\n{PARAGRAPH}\n\n{CODE}"},
+        {"role": "assistant", "content": f"Revised.\n\n{PARAGRAPH}\n\n{CODE}\n\nNew ending."},
+    ]
+
+    compacted, report = compact_conversation(messages, min_block_chars=20)
+
+    content = compacted[1]["content"]
+    assert content.startswith("Revised.")
+    assert content.endswith("New ending.")
+    assert "[repeated block omitted, first seen in message 1" in content
+    assert "[repeated code block omitted, first seen in message 1" in content
+    assert PARAGRAPH not in content and "return line.split" not in content
+    assert report.duplicate_blocks == 1
+    assert report.collapsed_code_blocks == 1
+
+
+def test_short_blocks_are_never_deduplicated():
+    messages = [{"role": "user", "content": "ok"}, {"role": "user", "content": "ok"}]
+
+    compacted, report = compact_conversation(messages, min_block_chars=20)
+
+    assert [m["content"] for m in compacted] == ["ok", "ok"]
+    assert report.tokens_saved == 0
+
+
+def test_tool_output_has_its_own_budget():
+    log = "\n".join(f"line {i}: compiling module {i}" for i in range(500))
+    messages = [{"role": "tool", "content": log}, {"role": "assistant", "content": log + " "}]
+
+    compacted, report = compact_conversation(
+        messages, max_tool_tokens=50, max_message_tokens=100_000, min_block_chars=10_000_000
+    )
+
+    assert "tokens omitted" in compacted[0]["content"]
+    assert compacted[1]["content"] == log + " "
+    assert report.truncated_messages == 1
+
+
+def test_non_string_content_passes_through():
+    parts = [{"type": "text", "text": PARAGRAPH}]
+    messages = [{"role": "user", "content": parts}, {"role": "user", "content": parts}]
+
+    compacted, report = compact_conversation(messages, min_block_chars=20)
+
+    assert compacted == messages
+    assert report.tokens_before == 0
+
+
+def test_report_describes_savings():
+    messages = [{"role": "user", "content": PARAGRAPH}] * 2
+
+    _, report = compact_conversation(messages, min_block_chars=20)
+
+    assert report.as_dict()["tokens_saved"] == report.tokens_saved
+    assert "1 duplicate messages" in report.describe()
+
+
+def test_prepare_conversation_respects_the_setting(monkeypatch):
+    messages = [{"role": "user", "content": PARAGRAPH}] * 2
+
+    monkeypatch.setattr(config, "CONVERSATION_COMPACTION_ENABLED", False)
+    assert prepare_conversation(messages) == (messages, None)
+
+    monkeypatch.setattr(config, "CONVERSATION_COMPACTION_ENABLED", True)
+    before = compaction_totals()["conversations"]
+    compacted, report = prepare_conversation(messages)
+    assert report is not None and len(compacted) == 2
+    assert compaction_totals()["conversations"] == before + 1
@@ -0,0 +1,109 @@
+"""Tests for transparent compression of large text fields."""
+
+import pytest
+from bson.binary import Binary
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database import compression
+from prompt_saver_mcp.database.compression import (
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    CODEC_ZSTD_DICT,
+    TextCompressor,
+    is_compressed,
+)
+
+TEMPLATE = "# Overview\n\nSummarize the {input} in three bullet points.\n" * 40
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(config, "COMPRESSION_MIN_BYTES", 256)
+
+
+def test_large_text_round_trips(compressor):
+    stored = compressor.compress(TEMPLATE)
+
+    assert is_compressed(stored)
+    assert len(stored) < len(TEMPLATE)
+    assert compressor.decompress(stored) == TEMPLATE
+
+
+def test_small_text_and_none_are_stored_as_is(compressor):
+    assert compressor.compress("short") == "short"
+    assert compressor.compress(None) is None
+
+
+def test_text_that_does_not_shrink_is_stored_as_is(compressor, monkeypatch):
+    monkeypatch.setattr(compressor, "compress_bytes", lambda data: b"\x01" + data)
+
+    assert compressor.compress(TEMPLATE) == TEMPLATE
+
+
+def test_disabled_compression_still_reads_compressed_values(compressor, monkeypatch):
+    stored = compressor.compress(TEMPLATE)
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", False)
+
+    assert compressor.compress(TEMPLATE) == TEMPLATE
+    assert compressor.decompress(stored) == TEMPLATE
+
+
+def test_plain_values_are_not_treated_as_compressed(compressor):
+    assert not is_compressed(TEMPLATE)
+    assert not is_compressed(Binary(b"\x01data"))
+    assert compressor.decompress(TEMPLATE) == TEMPLATE
+    assert compressor.decompress(None) is None
+
+
+@pytest.mark.parametrize("codec", [CODEC_ZLIB, CODEC_ZSTD])
+def test_every_codec_round_trips(compressor, codec):
+    if codec == CODEC_ZSTD:
+        pytest.importorskip("zstandard")
+    payload = compressor.compress_bytes(TEMPLATE.encode(), codec=codec)
+
+    assert payload[0] == codec
+    assert compressor.decompress_bytes(payload) == TEMPLATE.encode()
+
+
+def test_zlib_is_used_without_zstandard(compressor, monkeypatch):
+    monkeypatch.setattr(compression, "zstandard", None)
+
+    payload = compressor.compress_bytes(TEMPLATE.encode())
+
+    assert payload[0] == CODEC_ZLIB
+    assert compressor.decompress_bytes(payload) == TEMPLATE.encode()
+
+
+def test_unknown_codec_is_rejected(compressor):
+    pytest.importorskip("zstandard")
+    with pytest.raises(ValueError, match="Unknown compression codec"):
+        compressor.decompress_bytes(b"\x09payload")
+
+
+def test_dictionary_compression_is_readable_by_another_process(mongo):
+    pytest.importorskip("zstandard")
+    dictionaries = mongo.db["compression_dictionaries"]
+    samples = [f"# Prompt {i}\n\nAnswer question {i} about {{topic}} concisely.\n" * 8
+               for i in range(300)]
+    writer = TextCompressor(dictionaries)
+    dict_id = writer.train_dictionary(samples, size=4096)
+
+    payload = writer.compress_bytes(samples[0].encode())
+
+    assert payload[0] == CODEC_ZSTD_DICT
+    # A fresh compressor loads the dictionary from the collection
+    assert TextCompressor(dictionaries).decompress_bytes(payload) == samples[0].encode()
+    assert TextCompressor(dictionaries)._active_dict() == dict_id
+
+
+def test_documents_encode_and_decode_only_their_text_fields(compressor):
+    document = {"summary": TEMPLATE, "prompt_template": TEMPLATE, "history": None}
+
+    compressor.encode_document(document)
+
+    assert document["summary"] == TEMPLATE
+    assert is_compressed(document["prompt_template"])
+    assert document["history"] is None
+    assert compressor.decode_document(document)["prompt_template"] == TEMPLATE
+    assert compressor.decode_document(None) is None
@@ -0,0 +1,71 @@
+"""Tests for deadline budgets and the breakers they feed."""
+
+import asyncio
+import time
+
+import pytest
+from pymongo.errors import NetworkTimeout, ServerSelectionTimeoutError
+
+from prompt_saver_mcp.embeddings import voyage_client
+from prompt_saver_mcp.llm import providers
+from prompt_saver_mcp.utils import circuit_breaker, deadlines
+from prompt_saver_mcp.utils.circuit_breaker import CLOSED, OPEN
+from prompt_saver_mcp.utils.deadlines import DeadlineExceeded, deadline, expired, run_blocking
+
+
+@pytest.fixture(autouse=True)
+def breakers(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+
+
+def test_expired():
+    assert not expired()
+    with deadline(60):
+        assert not expired()
+    with deadline(0.01):
+        time.sleep(0.02)
+        assert expired()
+
+
+def test_own_deadline_timeouts_do_not_open_the_mongodb_breaker(monkeypatch):
+    # pymongo's operation timeout fires before the asyncio one, as it does on a slow server
+    monkeypatch.setattr(deadlines, "within_deadline", lambda awaitable, stage: awaitable)
+
+    def slow_query():
+        time.sleep(0.03)
+        raise NetworkTimeout("timed out")
+
+    async def call():
+        with deadline(0.02):
+            await run_blocking("find", slow_query)
+
+    for _ in range(10):
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(call())
+
+    assert circuit_breaker.get_breaker("mongodb").state == CLOSED
+
+
+def test_unreachable_server_opens_the_mongodb_breaker():
+    def unreachable():
+        raise ServerSelectionTimeoutError("No servers found")
+
+    async def call():
+        with deadline(60):
+            await run_blocking("find", unreachable)
+
+    breaker = circuit_breaker.get_breaker("mongodb")
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(call())
+
+    assert breaker.state == OPEN
+
+
+@pytest.mark.parametrize("is_outage", [voyage_client._is_outage, providers._is_outage])
+def test_deadline_expiry_is_not_an_outage(is_outage):
+    assert not is_outage(DeadlineExceeded("embed"))
+    assert is_outage(ConnectionError("refused"))
+    with deadline(0.01):
+        time.sleep(0.02)
+        assert not is_outage(ConnectionError("timed out"))
@@ -0,0 +1,61 @@
+"""Tests for index management."""
+
+from unittest import mock
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database import indexes
+
+
+def _collection(definition):
+    collection = mock.Mock()
+    collection.list_search_indexes.return_value = [{"latestDefinition": definition}]
+    return collection
+
+
+def test_vector_index_matching_the_configuration_is_left_alone():
+    collection = _collection(indexes.vector_index_definition())
+
+    assert indexes.ensure_vector_index(collection) == "ok"
+    collection.update_search_index.assert_not_called()
+
+
+def test_vector_index_is_updated_when_dimensions_change(monkeypatch):
+    collection = _collection(indexes.vector_index_definition())
+    monkeypatch.setattr(config, "EMBEDDING_DIMENSIONS", config.EMBEDDING_DIMENSIONS // 2)
+
+    assert indexes.ensure_vector_index(collection) == "updated"
+    definition = collection.update_search_index.call_args.args[1]
+    assert definition["fields"][0]["numDimensions"] == config.EMBEDDING_DIMENSIONS
+
+
+def test_vector_index_is_updated_when_similarity_or_filters_differ():
+    stale = indexes.vector_index_definition()
+    stale["fields"][0]["similarity"] = "cosine"
+    assert indexes.ensure_vector_index(_collection(stale)) == "updated"
+
+    unfiltered = indexes.vector_index_definition()
+    unfiltered["fields"] = unfiltered["fields"][:1]
+    assert indexes.ensure_vector_index(_collection(unfiltered)) == "updated"
+
+
+def test_vector_index_is_created_when_missing():
+    collection = mock.Mock()
+    collection.list_search_indexes.return_value = []
+
+    assert indexes.ensure_vector_index(collection) == "created"
+    collection.create_search_index.assert_called_once()
+
+
+def test_superseded_compound_indexes_are_dropped(mongo):
+    collection = mongo.collection
+    collection.create_index([("use_case", 1), ("last_updated", -1)])
+    collection.create_index([("created_by", 1), ("last_updated", -1)])
+
+    indexes.ensure_compound_indexes(collection)
+    dropped = indexes.drop_superseded_indexes(collection)
+
+    assert sorted(dropped) == sorted(indexes.SUPERSEDED_INDEXES)
+    existing = collection.index_information()
+    assert not set(indexes.SUPERSEDED_INDEXES) & set(existing)
+    assert "use_case_1_last_updated_-1__id_-1" in existing
+    assert indexes.drop_superseded_indexes(collection) == []
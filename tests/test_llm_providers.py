@@ -0,0 +1,132 @@
+"""Tests for OpenAI-compatible providers against the stub LLM server."""
+
+import asyncio
+import contextlib
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("uvicorn")
+
+import uvicorn  # noqa: E402
+
+from prompt_saver_mcp.config import config  # noqa: E402
+from prompt_saver_mcp.llm.openai_client import OpenAIClient  # noqa: E402
+from prompt_saver_mcp.llm.providers import LLMProvider, create_llm_provider  # noqa: E402
+from scripts.stub_llm_server import create_app  # noqa: E402
+
+CONVERSATION = [
+    {"role": "user", "content": "Write a CSV parser"},
+    {"role": "assistant", "content": "Here is a parser with error handling."},
+]
+
+
+@contextlib.contextmanager
+def stub_server(latency=0.0, template_latency=None):
+    """Run the stub LLM server in a thread and yield its base URL."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app("stub-model", latency, template_latency),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, "stub server did not start"
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    with stub_server() as url:
+        yield url
+
+
+def _provider(base_url, **kwargs):
+    return LLMProvider("local", "stub-model", base_url=base_url, api_key="x", **kwargs)
+
+
+def test_complete_returns_the_reply(base_url):
+    reply = _provider(base_url).complete([{"role": "user", "content": "improve this"}], "improve")
+
+    assert reply.startswith("# Improved Prompt")
+
+
+def test_local_provider_is_configured_from_the_environment(base_url, monkeypatch):
+    monkeypatch.setattr(config, "LOCAL_LLM_BASE_URL", base_url)
+    monkeypatch.setattr(config, "LOCAL_LLM_MODEL", "stub-model")
+
+    provider = create_llm_provider("local")
+
+    assert provider.snapshot()["base_url"] == base_url
+    assert provider.complete([{"role": "user", "content": "hi"}], "improve")
+
+
+def test_analysis_through_the_stub_server(base_url):
+    provider = _provider(base_url)
+    client = OpenAIClient(provider, provider, provider)
+
+    analysis = asyncio.run(client.analyze_conversation_async(CONVERSATION, "CSV parsing"))
+
+    assert analysis["use_case"] == "general"
+    assert analysis["summary"].startswith("Stub summary")
+    assert analysis["prompt_template"].startswith("# Overview")
+
+
+def test_split_analysis_requests_summary_and_template_separately(base_url, monkeypatch):
+    monkeypatch.setattr(config, "ANALYSIS_SPLIT_ENABLED", True)
+    provider = _provider(base_url)
+    client = OpenAIClient(provider, provider, provider)
+
+    analysis = asyncio.run(client.analyze_conversation_async(CONVERSATION, categorize=False))
+
+    assert analysis["use_case"] is None
+    assert analysis["summary"].startswith("Stub summary")
+    assert analysis["prompt_template"].startswith("# Overview\n\nStub template")
+
+
+def test_split_analysis_overlaps_summary_and_template(monkeypatch):
+    monkeypatch.setattr(config, "ANALYSIS_SPLIT_ENABLED", True)
+    with stub_server(latency=0.3, template_latency=0.3) as url:
+        provider = _provider(url)
+        client = OpenAIClient(provider, provider, provider)
+
+        started = time.monotonic()
+        asyncio.run(client.analyze_conversation_async(CONVERSATION))
+        elapsed = time.monotonic() - started
+
+    # Two 0.3 s requests in parallel, not back to back
+    assert elapsed < 0.55
+
+
+def test_concurrency_limit_queues_requests():
+    with stub_server(latency=0.2) as url:
+        provider = _provider(url, max_concurrency=1)
+        messages = [{"role": "user", "content": "hi"}]
+
+        async def two_requests():
+            return await asyncio.gather(
+                provider.complete_async(messages, "improve"),
+                provider.complete_async(messages, "improve"),
+            )
+
+        started = time.monotonic()
+        replies = asyncio.run(two_requests())
+        elapsed = time.monotonic() - started
+
+    assert len(replies) == 2
+    assert elapsed >= 0.4
@@ -0,0 +1,98 @@
+"""Tests for the in-process vector index."""
+
+from datetime import datetime
+
+from bson import ObjectId
+
+from prompt_saver_mcp.database.local_index import LocalVectorIndex
+from prompt_saver_mcp.database.models import SearchFilters
+from tests.conftest import unit
+
+
+def _document(embedding, last_updated, **fields):
+    return {
+        "_id": ObjectId(),
+        "use_case": "general",
+        "summary": "summary",
+        "prompt_template": "# Template",
+        "history": "history",
+        "last_updated": last_updated,
+        "embedding": embedding,
+        **fields,
+    }
+
+
+def test_search_ranks_by_similarity(compressor):
+    index = LocalVectorIndex(2, compressor)
+    near = _document(unit(1, 0.1), datetime(2025, 1, 1), summary="near")
+    far = _document(unit(0, 1), datetime(2025, 1, 1), summary="far")
+    index.upsert(near)
+    index.upsert(far)
+
+    results = index.search(unit(1, 0), limit=2)
+
+    assert [r["summary"] for r in results] == ["near", "far"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_updated_after_accepts_timezone_aware_timestamps(compressor):
+    index = LocalVectorIndex(2, compressor)
+    index.upsert(_document(unit(1, 0), datetime(2025, 1, 1), summary="old"))
+    index.upsert(_document(unit(1, 0), datetime(2025, 2, 1), summary="new"))
+
+    filters = SearchFilters(updated_after="2025-01-31T00:00:00Z")
+    results = index.search(unit(1, 0), limit=5, filters=filters)
+
+    assert filters.updated_after == datetime(2025, 1, 31)
+    assert [r["summary"] for r in results] == ["new"]
+
+
+def test_updated_after_converts_offsets_to_utc():
+    filters = SearchFilters(updated_after="2025-01-31T02:00:00+02:00")
+
+    assert filters.updated_after == datetime(2025, 1, 31)
+    assert filters.to_query() == {"last_updated": {"$gt": datetime(2025, 1, 31)}}
+
+
+def test_embeddings_of_other_models_are_not_searchable(compressor):
+    index = LocalVectorIndex(2, compressor, model_id="local/new")
+    current = _document(unit(1, 0), datetime(2025, 1, 1), embedding_model="local/new")
+    legacy = _document(unit(1, 0), datetime(2025, 1, 1))
+    other = _document(unit(1, 0), datetime(2025, 1, 1), embedding_model="voyage/old")
+    wrong_size = _document(unit(1, 0, 0), datetime(2025, 1, 1), embedding_model="local/new")
+
+    assert index.upsert(current) is True
+    assert index.upsert(legacy) is True
+    assert index.upsert(other) is False
+    assert index.upsert(wrong_size) is False
+
+    found = {r["_id"] for r in index.search(unit(1, 0), limit=10)}
+    assert len(index) == 4
+    assert found == {str(current["_id"]), str(legacy["_id"])}
+
+
+def test_reembedding_makes_a_prompt_searchable(compressor):
+    index = LocalVectorIndex(2, compressor, model_id="local/new")
+    document = _document(unit(1, 0, 0), datetime(2025, 1, 1), embedding_model="voyage/old")
+    index.upsert(document)
+
+    index.apply_update(
+        str(document["_id"]), {"embedding": unit(0, 1), "embedding_model": "local/new"}
+    )
+
+    results = index.search(unit(0, 1), limit=1)
+    assert [r["_id"] for r in results] == [str(document["_id"])]
+    assert "embedding_model" not in results[0]
+
+
+def test_load_skips_incompatible_embeddings(mongo, compressor):
+    mongo.collection.insert_many(
+        [
+            _document(unit(1, 0), datetime(2025, 1, 1), embedding_model="local/new"),
+            _document([0.1] * 3, datetime(2025, 1, 1), embedding_model="voyage/old"),
+        ]
+    )
+    index = LocalVectorIndex(2, compressor, model_id="local/new")
+
+    assert index.load(mongo.collection) == 2
+    assert len(index.search(unit(1, 0), limit=10)) == 1
@@ -0,0 +1,144 @@
+"""Tests for MongoDBClient against mongomock."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import NetworkTimeout
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.database import indexes
+from prompt_saver_mcp.database.compression import is_compressed
+from prompt_saver_mcp.database.models import PromptCreate, PromptUpdate
+from prompt_saver_mcp.database.mongodb_client import STALE_REVISION_AGE, VersionConflict
+
+
+def _create(client, **fields):
+    data = {
+        "use_case": "general",
+        "summary": "summary",
+        "prompt_template": "template " * 400,
+        "history": "history " * 400,
+        **fields,
+    }
+    return client.create_prompt(PromptCreate(**data))
+
+
+@pytest.fixture
+def compression(monkeypatch):
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(config, "COMPRESSION_MIN_BYTES", 64)
+
+
+def test_migrate_compression_compresses_plain_documents(mongo, compression, monkeypatch):
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", False)
+    prompt_id = _create(mongo)
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", True)
+
+    counts = mongo.migrate_compression()
+
+    stored = mongo.collection.find_one({})
+    assert counts == {"scanned": 1, "rewritten": 1, "skipped": 0}
+    assert is_compressed(stored["prompt_template"])
+    assert mongo.get_prompt(prompt_id).prompt_template == "template " * 400
+
+
+def test_migrate_compression_keeps_concurrent_updates(mongo, compression, monkeypatch):
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", False)
+    _create(mongo)
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", True)
+
+    find = mongo.collection.find
+
+    def find_then_update(*args, **kwargs):
+        documents = list(find(*args, **kwargs))
+        # Another writer edits the template after the migration read it
+        mongo.collection.update_one({}, {"$set": {"prompt_template": "edited", "version": 2}})
+        return iter(documents)
+
+    monkeypatch.setattr(mongo.collection, "find", find_then_update)
+    counts = mongo.migrate_compression()
+
+    stored = mongo.collection.find_one({})
+    assert counts == {"scanned": 1, "rewritten": 0, "skipped": 1}
+    assert stored["prompt_template"] == "edited"
+
+
+def _fail_head_write_once(mongo, monkeypatch, apply_first=False):
+    # Conflicts are detected by the unique revision index, created at server startup
+    indexes.ensure_version_index(mongo.versions)
+    find_one_and_update = mongo.collection.find_one_and_update
+    calls = []
+
+    def fail_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) > 1:
+            return find_one_and_update(*args, **kwargs)
+        if apply_first:
+            # The server applied the write but the reply was lost
+            find_one_and_update(*args, **kwargs)
+        raise NetworkTimeout("timed out")
+
+    monkeypatch.setattr(mongo.collection, "find_one_and_update", fail_once)
+
+
+def test_failed_head_write_does_not_block_later_updates(mongo, monkeypatch):
+    prompt_id = _create(mongo, prompt_template="v1")
+    _fail_head_write_once(mongo, monkeypatch)
+
+    with pytest.raises(NetworkTimeout):
+        mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="lost"))
+
+    assert mongo.get_prompt_version(prompt_id, 2) is None
+    updated = mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="v2"))
+    assert updated["version"] == 2
+    assert mongo.get_prompt_version(prompt_id, 2)["prompt_template"] == "v2"
+
+
+def test_head_write_that_landed_keeps_its_revision(mongo, monkeypatch):
+    prompt_id = _create(mongo, prompt_template="v1")
+    _fail_head_write_once(mongo, monkeypatch, apply_first=True)
+
+    with pytest.raises(NetworkTimeout):
+        mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="v2"))
+
+    assert mongo.get_prompt(prompt_id).prompt_template == "v2"
+    assert mongo.get_prompt_version(prompt_id, 2)["prompt_template"] == "v2"
+
+
+def test_failed_first_update_of_an_unversioned_prompt_can_be_retried(mongo, monkeypatch):
+    prompt_id = str(
+        mongo.collection.insert_one(
+            {"use_case": "general", "summary": "s", "prompt_template": "v1", "history": "h"}
+        ).inserted_id
+    )
+    _fail_head_write_once(mongo, monkeypatch)
+
+    with pytest.raises(NetworkTimeout):
+        mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="lost"))
+
+    assert mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="v2"))["version"] == 2
+    assert mongo.get_prompt_version(prompt_id, 1)["prompt_template"] == "v1"
+
+
+@pytest.mark.parametrize("age, conflicts", [(timedelta(0), True), (STALE_REVISION_AGE * 2, False)])
+def test_revision_left_by_a_dead_writer_is_reclaimed(mongo, age, conflicts):
+    indexes.ensure_version_index(mongo.versions)
+    prompt_id = _create(mongo, prompt_template="v1")
+    # Revision 2 inserted by a writer that never wrote the head document
+    mongo.versions.insert_one(
+        {
+            "prompt_id": ObjectId(prompt_id),
+            "version": 2,
+            "template": "never the head",
+            "created_at": datetime.utcnow() - age,
+        }
+    )
+
+    if conflicts:
+        # Recent: possibly a concurrent update still in progress
+        with pytest.raises(VersionConflict):
+            mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="v2"))
+    else:
+        assert mongo.update_prompt(prompt_id, PromptUpdate(prompt_template="v2"))["version"] == 2
+        assert mongo.get_prompt_version(prompt_id, 2)["prompt_template"] == "v2"
@@ -0,0 +1,42 @@
+"""Tests for conversation analysis."""
+
+import json
+from unittest import mock
+
+import pytest
+
+from prompt_saver_mcp.llm.openai_client import OpenAIClient
+
+
+@pytest.fixture
+def client():
+    provider = mock.Mock(model="stub-model")
+    provider.name = "stub"
+    return OpenAIClient(provider, provider, provider)
+
+
+def _reply(**fields):
+    analysis = {"summary": "s", "prompt_template": "# T", "history": "h", **fields}
+    return json.dumps(analysis)
+
+
+def test_parse_analysis_keeps_valid_use_cases(client):
+    assert client._parse_analysis(_reply(use_case="code-gen"))["use_case"] == "code-gen"
+
+
+def test_parse_analysis_marks_invalid_use_cases(client):
+    assert client._parse_analysis(_reply(use_case="poetry"))["use_case"] is None
+    assert client._parse_analysis(_reply())["use_case"] is None
+
+
+def test_parse_analysis_without_categorization(client):
+    result = client._parse_analysis(_reply(use_case="code-gen"), categorize=False)
+
+    assert result["use_case"] is None
+    assert result["summary"] == "s"
+
+
+def test_parse_analysis_accepts_fenced_json(client):
+    fenced = f"```json\n{_reply(use_case='creative')}\n```"
+
+    assert client._parse_analysis(fenced)["use_case"] == "creative"
@@ -0,0 +1,75 @@
+"""Tests for keyset-pagination cursors."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from prompt_saver_mcp.database.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trips():
+    last_updated = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    document_id = ObjectId()
+
+    assert decode_cursor(encode_cursor(last_updated, document_id)) == (last_updated, document_id)
+
+
+def test_cursor_normalizes_aware_datetimes_to_naive_utc():
+    aware = datetime(2024, 5, 1, 14, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    last_updated, _ = decode_cursor(encode_cursor(aware, ObjectId()))
+
+    assert last_updated == datetime(2024, 5, 1, 12, 30)
+
+
+def test_cursor_drops_sub_millisecond_precision():
+    last_updated, _ = decode_cursor(encode_cursor(datetime(2024, 1, 1, 0, 0, 0, 999), ObjectId()))
+
+    assert last_updated == datetime(2024, 1, 1)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "eyJ0IjoxLCJpZCI6Inh5eiJ9"])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_keyset_filter_selects_documents_after_the_cursor():
+    last_updated = datetime(2024, 5, 1)
+    document_id = ObjectId()
+
+    assert keyset_filter(None) == {}
+    assert keyset_filter(encode_cursor(last_updated, document_id)) == {
+        "$or": [
+            {"last_updated": {"$lt": last_updated}},
+            {"last_updated": last_updated, "_id": {"$lt": document_id}},
+        ]
+    }
+
+
+def test_pages_cover_every_prompt_once(mongo):
+    from prompt_saver_mcp.database.models import PromptCreate
+
+    created = {
+        mongo.create_prompt(
+            PromptCreate(use_case="general", summary=str(i), prompt_template="# T", history="h")
+        )
+        for i in range(7)
+    }
+    # Ties on last_updated are broken by _id
+    mongo.collection.update_many({}, {"$set": {"last_updated": datetime(2024, 1, 1)}})
+
+    seen, cursor = [], None
+    while True:
+        page = list(
+            mongo.collection.find(keyset_filter(cursor))
+            .sort([("last_updated", -1), ("_id", -1)])
+            .limit(3)
+        )
+        if not page:
+            break
+        seen.extend(str(document["_id"]) for document in page)
+        cursor = encode_cursor(page[-1]["last_updated"], page[-1]["_id"])
+
+    assert len(seen) == len(created) and set(seen) == created
@@ -0,0 +1,78 @@
+"""Tests for incremental conversation JSON parsing."""
+
+import io
+import json
+
+import pytest
+
+from prompt_saver_mcp.utils.prompt_formatter import iter_conversation_json, parse_conversation_json
+
+MESSAGES = [
+    {"role": "user", "content": "Parse this: [1, 2, {\"nested\": \"]\"}]"},
+    {"role": "assistant", "content": "Unicode é中 and escapes \\n \" done"},
+    {"role": "tool", "content": "x" * 5000, "name": "run"},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_streams_parse_like_json_loads(chunk_size):
+    text = json.dumps(MESSAGES, indent=2)
+
+    parsed = list(iter_conversation_json(io.StringIO(text), chunk_size=chunk_size))
+
+    assert parsed == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_empty_conversations(text):
+    assert parse_conversation_json(text) == []
+    assert parse_conversation_json(io.StringIO(text)) == []
+
+
+def test_messages_are_yielded_before_the_stream_is_read_to_the_end():
+    class Source(io.StringIO):
+        consumed = 0
+
+        def read(self, size=-1):
+            chunk = super().read(size)
+            Source.consumed += len(chunk)
+            return chunk
+
+    text = json.dumps([{"role": "user", "content": "x" * 100}] * 100)
+    messages = iter_conversation_json(Source(text), chunk_size=256)
+
+    next(messages)
+
+    assert Source.consumed < len(text) // 10
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        '{"role": "user", "content": "not a list"}',
+        '[{"role": "user", "content": "a"},]',
+        '[{"role": "user", "content": "a"} {"role": "user", "content": "b"}]',
+        '[{"role": "user", "content": "a"}] trailing',
+        '[{"role": "user", "content": "a"}',
+        '[{"role": "user", "content": "unterminated',
+    ],
+)
+def test_malformed_json_is_rejected(text):
+    with pytest.raises(ValueError):
+        parse_conversation_json(text)
+    with pytest.raises(ValueError):
+        parse_conversation_json(io.StringIO(text))
+
+
+@pytest.mark.parametrize("text", ['["just a string"]', '[{"role": "user"}]'])
+def test_invalid_messages_are_rejected(text):
+    with pytest.raises(ValueError, match="Each message"):
+        parse_conversation_json(text)
+
+
+def test_stream_errors_report_the_position_in_the_whole_text():
+    text = json.dumps(MESSAGES) + " extra"
+
+    with pytest.raises(ValueError, match=rf"char {len(text) - 5}"):
+        parse_conversation_json(io.StringIO(text))
@@ -0,0 +1,95 @@
+"""Tests for delta-compressed template revisions."""
+
+import pytest
+
+from prompt_saver_mcp.database.models import PromptCreate, PromptUpdate
+from prompt_saver_mcp.database.versioning import (
+    KEYFRAME_INTERVAL,
+    apply_delta,
+    build_version_document,
+    compute_delta,
+    is_keyframe,
+    keyframe_for,
+    reconstruct,
+)
+
+
+def test_keyframes_start_every_interval():
+    assert [v for v in range(1, 25) if is_keyframe(v)] == [1, 11, 21]
+    assert keyframe_for(1) == 1
+    assert keyframe_for(KEYFRAME_INTERVAL) == 1
+    assert keyframe_for(KEYFRAME_INTERVAL + 1) == KEYFRAME_INTERVAL + 1
+    assert keyframe_for(25) == 21
+
+
+@pytest.mark.parametrize(
+    "base, target",
+    [
+        ("a\nb\nc\n", "a\nB\nc\n"),
+        ("a\nb\nc\n", ""),
+        ("", "new\ntemplate"),
+        ("no trailing newline", "no trailing newline\nmore"),
+        ("x\ny\n", "y\nx\n"),
+    ],
+)
+def test_apply_delta_reproduces_the_target(base, target):
+    assert apply_delta(base, compute_delta(base, target)) == target
+
+
+def test_delta_copies_unchanged_lines_instead_of_storing_them():
+    base = "".join(f"line {i}\n" for i in range(50))
+    target = base.replace("line 25\n", "changed\n")
+
+    delta = compute_delta(base, target)
+
+    assert ["i", "changed\n"] in delta
+    assert sum(len(op[1]) for op in delta if op[0] == "i") == len("changed\n")
+
+
+def test_version_documents_store_keyframes_deltas_and_unchanged_revisions():
+    first = build_version_document("p", 1, None, "one\n", "created")
+    changed = build_version_document("p", 2, "one\n", "one\ntwo\n", "added two")
+    unchanged = build_version_document("p", 3, "one\ntwo\n", "one\ntwo\n", "retagged")
+    keyframe = build_version_document("p", 11, "one\n", "eleven\n", None)
+
+    assert first["template"] == "one\n" and "delta" not in first
+    assert "template" not in changed and changed["delta"]
+    assert unchanged["delta"] is None
+    assert keyframe["template"] == "eleven\n"
+
+
+def test_reconstruct_replays_deltas_from_the_keyframe():
+    templates = ["# Template\n" + "step\n" * i for i in range(1, 15)]
+    documents, previous = [], None
+    for version, template in enumerate(templates, start=1):
+        documents.append(build_version_document("p", version, previous, template, None))
+        previous = template
+
+    for version in range(1, len(templates) + 1):
+        chain = documents[keyframe_for(version) - 1 : version]
+        assert reconstruct(chain) == templates[version - 1]
+
+
+def test_reconstruct_requires_a_keyframe():
+    with pytest.raises(ValueError):
+        reconstruct([])
+    with pytest.raises(ValueError):
+        reconstruct([{"version": 2, "delta": None}])
+
+
+def test_past_revisions_are_reconstructed_from_storage(mongo):
+    prompt_id = mongo.create_prompt(
+        PromptCreate(use_case="general", summary="s", prompt_template="v1\n", history="h")
+    )
+    for version in range(2, KEYFRAME_INTERVAL + 3):
+        mongo.update_prompt(
+            prompt_id,
+            PromptUpdate(prompt_template=f"v1\nv{version}\n", changelog_entry=f"v{version}"),
+        )
+
+    assert mongo.get_prompt_version(prompt_id, 1)["prompt_template"] == "v1\n"
+    assert mongo.get_prompt_version(prompt_id, 5)["prompt_template"] == "v1\nv5\n"
+    assert mongo.get_prompt_version(prompt_id, KEYFRAME_INTERVAL + 2)["prompt_template"] == (
+        f"v1\nv{KEYFRAME_INTERVAL + 2}\n"
+    )
+    assert mongo.versions.count_documents({"template": {"$exists": True}}) == 2
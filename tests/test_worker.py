@@ -0,0 +1,142 @@
+"""Tests for the job worker pool."""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest import mock
+
+from prompt_saver_mcp.config import config
+from prompt_saver_mcp.jobs.queue import STATUS_FAILED, STATUS_RUNNING, JobQueue
+from prompt_saver_mcp.jobs.worker import JobWorkerPool
+
+
+def _job():
+    return {"_id": "job-1", "kind": "test", "payload": {}, "attempts": 1, "max_attempts": 3}
+
+
+def _pool(queue, handler):
+    return JobWorkerPool(queue, {"test": handler}, concurrency=1, lease_seconds=0.03)
+
+
+def test_completed_jobs_are_recorded():
+    queue = mock.Mock()
+
+    async def handler(payload, progress):
+        progress("working")
+        return {"ok": True}
+
+    asyncio.run(_pool(queue, handler)._process("worker", _job()))
+
+    queue.complete.assert_called_once_with("job-1", "worker", {"ok": True})
+    queue.fail.assert_not_called()
+
+
+def test_failed_jobs_are_recorded():
+    queue = mock.Mock()
+
+    async def handler(payload, progress):
+        raise RuntimeError("boom")
+
+    asyncio.run(_pool(queue, handler)._process("worker", _job()))
+
+    queue.fail.assert_called_once_with("job-1", "worker", 1, 3, "boom")
+
+
+def test_handler_is_cancelled_when_the_lease_is_lost():
+    queue = mock.Mock()
+    queue.heartbeat.return_value = False
+    cancelled = []
+
+    async def handler(payload, progress):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        await asyncio.wait_for(_pool(queue, handler)._process("worker", _job()), timeout=2)
+
+    asyncio.run(scenario())
+
+    assert cancelled == [True]
+    queue.complete.assert_not_called()
+    queue.fail.assert_not_called()
+
+
+def test_heartbeats_keep_a_long_job_running():
+    queue = mock.Mock()
+    queue.heartbeat.return_value = True
+
+    async def handler(payload, progress):
+        await asyncio.sleep(0.1)
+        return {}
+
+    asyncio.run(_pool(queue, handler)._process("worker", _job()))
+
+    assert queue.heartbeat.call_count >= 2
+    queue.complete.assert_called_once()
+
+
+def test_workers_started_on_demand_stop_when_idle():
+    queue = mock.Mock()
+    queue.lease.return_value = None
+
+    async def scenario():
+        pool = JobWorkerPool(queue, {}, concurrency=2, poll_interval=0.01)
+        pool.start(idle_timeout=0.05)
+        await asyncio.sleep(0.2)
+        stopped = all(task.done() for task in pool._tasks.values())
+        polls = queue.lease.call_count
+        await asyncio.sleep(0.05)
+        assert queue.lease.call_count == polls
+
+        # The next queued job starts them again
+        pool.start(idle_timeout=0.05)
+        running = all(not task.done() for task in pool._tasks.values())
+        await pool.stop()
+        return stopped, running
+
+    assert asyncio.run(scenario()) == (True, True)
+
+
+def test_workers_started_without_idle_timeout_keep_polling():
+    queue = mock.Mock()
+    queue.lease.return_value = None
+
+    async def scenario():
+        pool = JobWorkerPool(queue, {}, concurrency=1, poll_interval=0.01)
+        pool.start()
+        # A later on-demand start does not make them stop when idle
+        pool.start(idle_timeout=0.01)
+        await asyncio.sleep(0.1)
+        running = not pool._tasks[0].done()
+        await pool.stop()
+        return running
+
+    assert asyncio.run(scenario())
+
+
+def test_exhausted_jobs_are_swept_periodically_and_never_re_leased(mongo, monkeypatch):
+    monkeypatch.setattr(config, "JOB_SWEEP_INTERVAL", 3600)
+    queue = JobQueue(mongo.db["jobs"])
+    assert queue.lease("worker") is None
+
+    job_id = queue.enqueue("test", {})
+    queue.collection.update_one(
+        {},
+        {
+            "$set": {
+                "status": STATUS_RUNNING,
+                "attempts": config.JOB_MAX_ATTEMPTS,
+                "lease_expires": datetime.utcnow() - timedelta(seconds=1),
+            }
+        },
+    )
+
+    # Not swept yet, but not re-leased beyond its attempts either
+    assert queue.lease("worker") is None
+    assert queue.get(job_id)["status"] == STATUS_RUNNING
+
+    queue._swept -= timedelta(seconds=3600)
+    assert queue.lease("worker") is None
+    assert queue.get(job_id)["status"] == STATUS_FAILED